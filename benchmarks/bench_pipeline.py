@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Conversion Pipeline Benchmark
+
+Times each stage of the pandas conversion behind process_csv (read, money
+parse, datetime parse, corrections, groupby, drawdown, serialization and,
+with --analytics, the analytics sections) on synthetic fixtures of 10k,
+100k and 1M trades. It records each stage's peak traced memory, saves the
+results as JSON and compares them against a stored baseline.
+
+Stage times are the best of --repeat runs without tracing. Memory is
+measured in one extra run under tracemalloc and is the stage's peak
+allocation above what was live when it started.
+
+Usage: python benchmarks/bench_pipeline.py [--sizes 10k,100k] [--repeat 3]
+                                           [--analytics] [--output results.json]
+                                           [--baseline benchmarks/baseline.json]
+                                           [--threshold 0.25] [--save-baseline]
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Tuple
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'scripts'))
+
+import pandas as pd  # noqa: E402
+
+from fixtures import SIZES, ensure_fixture  # noqa: E402
+from ntperf.api import ANALYTICS, build_outputs  # noqa: E402
+from ntperf.corrections import apply_corrections  # noqa: E402
+from ntperf.metrics import NOTIONAL, summarize  # noqa: E402
+from ntperf.money import CENTS_PER_DOLLAR  # noqa: E402
+from ntperf.parsing import parse_money_columns, parse_timestamps  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(HERE, 'baseline.json')
+RESULTS_DIR = os.path.join(HERE, 'results')
+# Allowed slowdown (or memory growth) relative to the baseline
+DEFAULT_THRESHOLD = 0.25
+# Differences below these are noise, whatever the ratio
+MIN_SECONDS = 0.005
+MIN_BYTES = 1 << 20
+
+Stage = Tuple[str, Callable[[Dict[str, Any]], None]]
+
+
+def _read(state: Dict[str, Any]) -> None:
+    state['df'] = pd.read_csv(state['path'])
+
+
+def _money(state: Dict[str, Any]) -> None:
+    parse_money_columns(state['df'])
+
+
+def _datetime(state: Dict[str, Any]) -> None:
+    df = state['df']
+    df['Entry time'] = parse_timestamps(df['Entry time'])
+    df['Exit time'] = parse_timestamps(df['Exit time'])
+
+
+def _corrections(state: Dict[str, Any]) -> None:
+    state['df'] = apply_corrections(state['df'], 'default')
+
+
+def _groupby(state: Dict[str, Any]) -> None:
+    df = state['df']
+    returns = df.groupby(df['Exit time'].dt.date)['Profit cents'].sum() / (NOTIONAL * CENTS_PER_DOLLAR)
+    state['moments'] = (float(returns.mean()), float(returns.std()))
+
+
+def _drawdown(state: Dict[str, Any]) -> None:
+    df = state['df']
+    # summarize() computes the max drawdown, once
+    state['metrics'] = summarize(df['Profit'].tolist(), df['Cum. net profit'].tolist(), *state['moments'])
+
+
+def _analytics(state: Dict[str, Any]) -> None:
+    state['sections'] = {name: compute(state['df']) for name, compute in ANALYTICS.items()}
+
+
+def _serialize(state: Dict[str, Any]) -> None:
+    data = build_outputs(state['df'], state['metrics'], analytics=[])
+    data.update({k: v for k, v in state.get('sections', {}).items() if v is not None})
+    state['payload'] = json.dumps(data, indent=2)
+
+
+def stages(analytics: bool) -> List[Stage]:
+    """Pipeline stages in order, as (name, function of the shared state)."""
+    pipeline = [('read', _read), ('money', _money), ('datetime', _datetime),
+                ('corrections', _corrections), ('groupby', _groupby), ('drawdown', _drawdown)]
+    if analytics:
+        pipeline.append(('analytics', _analytics))
+    return pipeline + [('serialize', _serialize)]
+
+
+def run_once(path: str, pipeline: List[Stage], trace: bool = False) -> Dict[str, Dict[str, float]]:
+    """
+    Run every stage once.
+
+    Args:
+        path: Fixture to convert
+        pipeline: Stages from stages()
+        trace: Measure each stage's peak memory with tracemalloc
+
+    Returns:
+        Seconds (and, when tracing, peak bytes) per stage
+    """
+    state: Dict[str, Any] = {'path': path}
+    out = {}
+    for name, stage in pipeline:
+        if trace:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        stage(state)
+        elapsed = time.perf_counter() - start
+        out[name] = {'seconds': elapsed}
+        if trace:
+            out[name]['peak_bytes'] = tracemalloc.get_traced_memory()[1] - before
+    return out
+
+
+def bench_size(size: str, repeat: int, analytics: bool) -> Dict[str, Any]:
+    """Best-of-``repeat`` stage times plus traced peak memory for one fixture."""
+    path = ensure_fixture(size)
+    pipeline = stages(analytics)
+    runs = [run_once(path, pipeline) for _ in range(repeat)]
+    tracemalloc.start()
+    try:
+        traced = run_once(path, pipeline, trace=True)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    result = {}
+    for name, _ in pipeline:
+        result[name] = {
+            'seconds': min(run[name]['seconds'] for run in runs),
+            'peak_bytes': traced[name]['peak_bytes']
+        }
+    return {
+        'rows': SIZES[size],
+        'file_bytes': os.path.getsize(path),
+        'stages': result,
+        'total_seconds': sum(stage['seconds'] for stage in result.values()),
+        'peak_bytes': peak
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Stages that got slower or hungrier than the baseline allows.
+
+    Args:
+        results: Output of this run
+        baseline: Stored results
+        threshold: Allowed relative increase
+
+    Returns:
+        One message per regression
+    """
+    regressions = []
+    for size, current in results['sizes'].items():
+        base = baseline.get('sizes', {}).get(size)
+        if base is None:
+            continue
+        for name, stage in current['stages'].items():
+            old = base['stages'].get(name)
+            if old is None:
+                continue
+            for key, floor, unit in (('seconds', MIN_SECONDS, 's'), ('peak_bytes', MIN_BYTES, 'B')):
+                new_value, old_value = stage[key], old[key]
+                if new_value > old_value * (1 + threshold) and new_value - old_value > floor:
+                    regressions.append(f"{size} {name} {key}: {old_value:,.4g}{unit} -> {new_value:,.4g}{unit} "
+                                       f"(+{(new_value / old_value - 1) * 100 if old_value else float('inf'):.0f}%)")
+    return regressions
+
+
+def report(results: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    for size, current in results['sizes'].items():
+        base = baseline.get('sizes', {}).get(size, {}).get('stages', {})
+        print(f"\n{size} ({current['rows']:,} rows, {current['file_bytes'] / 1e6:.1f} MB)")
+        print(f"  {'Stage':<12} {'Seconds':>9} {'Baseline':>9} {'Change':>8} {'Peak MB':>9}")
+        for name, stage in current['stages'].items():
+            old = base.get(name)
+            change = f"{(stage['seconds'] / old['seconds'] - 1) * 100:+.0f}%" if old and old['seconds'] else ''
+            old_seconds = f"{old['seconds']:.4f}" if old else '-'
+            print(f"  {name:<12} {stage['seconds']:>9.4f} {old_seconds:>9} {change:>8} "
+                  f"{stage['peak_bytes'] / 1e6:>9.1f}")
+        print(f"  {'total':<12} {current['total_seconds']:>9.4f}"
+              f"{'':>28} peak {current['peak_bytes'] / 1e6:.1f} MB")
+
+
+def main():
+    """Main function to run the benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark the conversion pipeline on synthetic fixtures")
+    parser.add_argument("--sizes", default="10k,100k",
+                        help=f"comma-separated fixture sizes from {', '.join(SIZES)}")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per size (best is kept)")
+    parser.add_argument("--analytics", action="store_true", help="also time the analytics sections")
+    parser.add_argument("--output", help="results JSON (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline results to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed relative slowdown or memory growth before failing")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store this run as the new baseline instead of comparing")
+    args = parser.parse_args()
+
+    sizes = [s.strip() for s in args.sizes.split(',') if s.strip()]
+    unknown = [s for s in sizes if s not in SIZES]
+    if unknown:
+        parser.error(f"unknown size(s): {', '.join(unknown)}")
+
+    results = {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'machine': f"{platform.system()} {platform.machine()} ({os.cpu_count()} cores)",
+        'analytics': args.analytics,
+        'sizes': {}
+    }
+    for size in sizes:
+        print(f"Benchmarking {size}...")
+        results['sizes'][size] = bench_size(size, args.repeat, args.analytics)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, datetime.now().strftime('%Y%m%d-%H%M%S') + '.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        report(results, {})
+        print(f"\nSaved baseline to {args.baseline}")
+        return
+
+    try:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        baseline = {}
+    if baseline.get('analytics', args.analytics) != args.analytics:
+        print("Baseline was recorded with a different --analytics setting; not comparing")
+        baseline = {}
+    report(results, baseline)
+    print(f"\nResults written to {output}")
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\nRegressions beyond {args.threshold:.0%}:")
+        for message in regressions:
+            print(f"  {message}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Synthetic NinjaTrader Grid exports for benchmarking.
+
+Fixtures are TEST-ONLY data: every row is labelled SYNTHETIC (account,
+strategy and signal names), files are named ``SYNTHETIC-benchmark-<size>.csv``
+so the export watchers never pick them up, and they are written to
+``benchmarks/fixtures/``, which is git-ignored. Never publish them.
+
+The layout matches a real export (same columns, "$1,162.50"/"($42.75)"
+money cells, unpadded "4/30/2025 9:45:30 AM" timestamps), with roughly 50
+trades per weekday session spread over several accounts, so every stage
+of the pipeline does representative work.
+"""
+import os
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+SIZES: Dict[str, int] = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+
+HEADER = ['Trade number', 'Instrument', 'Account', 'Strategy', 'Market pos.', 'Qty',
+          'Entry price', 'Exit price', 'Entry time', 'Exit time', 'Entry name', 'Exit name',
+          'Profit', 'Cum. net profit', 'Commission', 'MAE', 'MFE', 'ETD', 'Bars', '']
+
+TRADES_PER_SESSION = 50
+ACCOUNTS = 4
+POINT_VALUE = 2.0  # MNQ
+TICK = 0.25
+
+
+def fixture_path(size: str) -> str:
+    return os.path.join(FIXTURE_DIR, f"SYNTHETIC-benchmark-{size}.csv")
+
+
+def _money(values: np.ndarray) -> pd.Series:
+    text = pd.Series(np.abs(values)).map('${:,.2f}'.format)
+    return text.where(values >= 0, '(' + text + ')')
+
+
+def _timestamps(values: np.ndarray) -> pd.Series:
+    text = pd.Series(values).dt.strftime('%m/%d/%Y %I:%M:%S %p')
+    # NinjaTrader does not zero-pad month, day or hour
+    return text.str.replace(r'^0|(?<=/)0|(?<= )0', '', regex=True)
+
+
+def build_fixture(rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Build a synthetic export.
+
+    Args:
+        rows: Number of trades
+        seed: Random seed; the same seed always gives the same file
+
+    Returns:
+        DataFrame of string cells in export column order
+    """
+    rng = np.random.default_rng(seed)
+    sessions = pd.bdate_range('2020-01-02', periods=rows // TRADES_PER_SESSION + 1)
+    session = np.arange(rows) // TRADES_PER_SESSION
+    slot = np.arange(rows) % TRADES_PER_SESSION
+    # Trades every ~7 minutes from 9:30, held 5 s to 6 min
+    entry = (sessions[session].to_numpy() + np.timedelta64(9 * 3600 + 1800, 's')
+             + (slot * 420 + rng.integers(0, 60, rows)).astype('timedelta64[s]'))
+    exit_ = entry + rng.integers(5, 360, rows).astype('timedelta64[s]')
+
+    long = rng.random(rows) < 0.5
+    qty = rng.integers(1, 4, rows)
+    entry_price = 18_000 + np.round(rng.normal(0, 400, rows) / TICK) * TICK
+    move = np.round(rng.normal(0.5, 12, rows) / TICK) * TICK
+    exit_price = entry_price + np.where(long, move, -move)
+    profit = move * qty * POINT_VALUE
+    mae = np.abs(np.minimum(move, 0)) * qty * POINT_VALUE + rng.integers(0, 20, rows) * TICK * POINT_VALUE
+    mfe = np.maximum(move, 0) * qty * POINT_VALUE + rng.integers(0, 20, rows) * TICK * POINT_VALUE
+
+    return pd.DataFrame({
+        'Trade number': np.arange(1, rows + 1),
+        'Instrument': 'MNQ SYNTH',
+        'Account': pd.Series(rng.integers(0, ACCOUNTS, rows)).map('SYNTHETIC{}!Benchmark!Benchmark'.format),
+        'Strategy': 'SYNTHETIC',
+        'Market pos.': np.where(long, 'Long', 'Short'),
+        'Qty': qty,
+        'Entry price': pd.Series(entry_price).map('{:.2f}'.format),
+        'Exit price': pd.Series(exit_price).map('{:.2f}'.format),
+        'Entry time': _timestamps(entry),
+        'Exit time': _timestamps(exit_),
+        'Entry name': 'SYNTHETIC_Entry',
+        'Exit name': 'SYNTHETIC_Exit',
+        'Profit': _money(profit),
+        'Cum. net profit': _money(np.cumsum(profit)),
+        'Commission': '$0.00',
+        'MAE': _money(mae),
+        'MFE': _money(mfe),
+        'ETD': _money(mfe - profit),
+        'Bars': rng.integers(0, 40, rows),
+        '': ''
+    }, columns=HEADER)
+
+
+def ensure_fixture(size: str, seed: int = 0) -> str:
+    """
+    Path of a fixture, generating it on first use.
+
+    Args:
+        size: Key of SIZES
+        seed: Random seed
+
+    Returns:
+        Path to the CSV
+    """
+    path = fixture_path(size)
+    if not os.path.exists(path):
+        os.makedirs(FIXTURE_DIR, exist_ok=True)
+        tmp = path + '.tmp'
+        build_fixture(SIZES[size], seed).to_csv(tmp, index=False)
+        os.replace(tmp, path)
+    return path
@@ -11,47 +11,25 @@ with a complete dataset covering all relevant time periods.
 
 For development and testing purposes only - not for production use.
 """
-import csv
 import random
 import datetime
-import os
+
+from ntperf.tradefile import TradeFile
 
 # Define input and output files
 input_csv = '/home/pangasa/personal_website/temp_project/NinjaTrader Grid 2025-05-24 12-52 AM.csv'
 output_csv = '/home/pangasa/personal_website/temp_project/NinjaTrader Grid 2025-05-31 12-52 AM.csv'
 
-# Read the original CSV file
-trades = []
-header = None
-
-with open(input_csv, 'r') as file:
-    reader = csv.reader(file)
-    header = next(reader)
-    for row in reader:
-        # Clear data gap between May 24 and May 31 (temporary data will be added)
-        if len(row) > 8:
-            try:
-                entry_time = datetime.datetime.strptime(row[8], '%m/%d/%Y %I:%M:%S %p')
-                if entry_time.date() >= datetime.date(2025, 5, 24) and entry_time.date() <= datetime.date(2025, 5, 31):
-                    continue
-            except (ValueError, IndexError):
-                pass
-        trades.append(row)
-
-# Select representative trades to use as templates for temporary data
-template_trades = []
-for trade in trades:
-    if len(trade) > 12:
-        try:
-            profit_str = trade[12].replace('$', '').replace('(', '-').replace(')', '')
-            profit = float(profit_str)
-            # Select trades with moderate profit/loss as templates
-            if abs(profit) <= 10.0 and profit != 0:
-                template_trades.append(trade)
-            if len(template_trades) >= 20:
-                break
-        except (ValueError, IndexError):
-            pass
+# Read the original CSV file, parsing each row once
+trades = TradeFile.read(input_csv)
+
+# Clear data gap between May 24 and May 31 (temporary data will be added)
+trades = trades.drop(i for entry_date, rows in trades.group_by_date('entry').items()
+                     if datetime.date(2025, 5, 24) <= entry_date <= datetime.date(2025, 5, 31)
+                     for i in rows)
+
+# Select representative trades with moderate profit/loss as templates for temporary data
+template_trades = [i for i, cents in enumerate(trades.cents) if abs(cents) <= 1000 and cents != 0][:20]
 
 # Define target dates to fill with temporary data (weekdays only, excluding weekends)
 target_dates = [
@@ -63,32 +41,23 @@ target_dates = [
 ]
 
 # Get max trade number
-max_trade_num = 0
-for trade in trades:
-    try:
-        if trade[0].isdigit():
-            max_trade_num = max(max_trade_num, int(trade[0]))
-    except (ValueError, IndexError):
-        pass
-
-# Initialize list to hold temporary trades for the data gap
-temp_trades = []
-trade_num = max_trade_num + 1
+trade_num = trades.max_trade_number() + 1
+trades_by_entry_date = trades.group_by_date('entry')
+
+# Predetermined profits for the temporary data, designed to maintain overall trends:
+# moderate gain, typical drawdown, recovery, momentum, pullback, resumption,
+# momentum, small pullback
+PLACEHOLDER_PROFITS = [180, -250, 350, 270, -190, 420, 340, -180]
+
+# Count of temporary trades added for the data gap
+temp_count = 0
 
 # Generate temporary placeholder data for each target date
 for year, month, day in target_dates:
     target_date = datetime.date(year, month, day)
     
     # Get existing times for this date to avoid time conflicts
-    existing_times = []
-    for trade in trades:
-        if len(trade) > 8 and trade[8]:
-            try:
-                entry_time = datetime.datetime.strptime(trade[8], '%m/%d/%Y %I:%M:%S %p')
-                if entry_time.date() == target_date:
-                    existing_times.append(entry_time.time())
-            except ValueError:
-                continue
+    existing_times = [trades[i].entry.time() for i in trades_by_entry_date.get(target_date, [])]
     
     # Add 1-2 temporary trades to each day to maintain typical daily frequency
     for _ in range(random.randint(1, 2)):
@@ -97,11 +66,6 @@ for year, month, day in target_dates:
             
         # Use an existing trade as template for consistent data format
         template = random.choice(template_trades)
-        temp_trade = template.copy()
-        
-        # Update trade number for the temporary data
-        temp_trade[0] = str(trade_num)
-        trade_num += 1
         
         # Generate realistic trading hours for temporary data
         while True:
@@ -128,107 +92,30 @@ for year, month, day in target_dates:
         entry_dt = datetime.datetime.combine(target_date, time_candidate)
         exit_dt = entry_dt + datetime.timedelta(minutes=random.randint(1, 10), seconds=random.randint(0, 59))
         
-        # Format times according to NinjaTrader standards
-        entry_time = entry_dt.strftime('%-m/%-d/%Y %-I:%M:%S %p')
-        exit_time = exit_dt.strftime('%-m/%-d/%Y %-I:%M:%S %p')
-        
-        # Update entry/exit times for the temporary data
-        temp_trade[8] = entry_time
-        temp_trade[9] = exit_time
+        # Copy the template with the new trade number and times
+        temp_trade = trades.copy_trade(template, entry_dt, exit_dt, trade_num)
+        trade_num += 1
         
-        # Extract profit from template for reference
-        if len(temp_trade) > 12 and temp_trade[12]:
-            profit_str = temp_trade[12].replace('$', '').replace(' ', '')
-            is_negative = '(' in profit_str and ')' in profit_str
-            if is_negative:
-                profit_str = profit_str.replace('(', '').replace(')', '')
-                profit_val = -float(profit_str)
-            else:
-                profit_val = float(profit_str)
-            
-            # Set realistic scaling for temporary data
-            profit_val *= 30
-            
-            # Assign predetermined values to create realistic temporary data pattern
-            # These values represent placeholder data designed to maintain overall trends
-            trade_idx = temp_trades.index(temp_trade) if temp_trade in temp_trades else len(temp_trades)
-            
-            if trade_idx == 0:
-                # First temporary data point - positive but moderate
-                profit_val = 180
-            elif trade_idx == 1:
-                # Second temporary data point - negative to represent typical drawdown
-                profit_val = -250
-            elif trade_idx == 2:
-                # Third temporary data point - strong positive to show recovery
-                profit_val = 350
-            elif trade_idx == 3:
-                # Fourth temporary data point - continued positive momentum
-                profit_val = 270
-            elif trade_idx == 4:
-                # Fifth temporary data point - minor pullback
-                profit_val = -190
-            elif trade_idx == 5:
-                # Sixth temporary data point - resumption of positive trend
-                profit_val = 420
-            elif trade_idx == 6:
-                # Seventh temporary data point - continued positive momentum
-                profit_val = 340
-            elif trade_idx == 7:
-                # Eighth temporary data point - small pullback
-                profit_val = -180
-            else:
-                # Additional placeholder data points if needed
-                if random.random() < 0.5:
-                    profit_val = random.uniform(200, 300)
-                else:
-                    profit_val = -random.uniform(200, 300)
-            
-            # Format according to NinjaTrader standards
-            if profit_val < 0:
-                temp_trade[12] = f"(${abs(profit_val):.2f})"
+        # Assign predetermined values to create realistic temporary data pattern
+        if temp_count < len(PLACEHOLDER_PROFITS):
+            profit_val = PLACEHOLDER_PROFITS[temp_count]
+        else:
+            # Additional placeholder data points if needed
+            if random.random() < 0.5:
+                profit_val = random.uniform(200, 300)
             else:
-                temp_trade[12] = f"${profit_val:.2f}"
+                profit_val = -random.uniform(200, 300)
         
-        temp_trades.append(temp_trade)
-
-# Add temporary trades to the list
-all_trades = trades + temp_trades
+        # Format according to NinjaTrader standards
+        trades.set_profit(temp_trade, profit_val)
+        temp_count += 1
 
-# Sort by entry time
-all_trades.sort(key=lambda x: datetime.datetime.strptime(x[8], '%m/%d/%Y %I:%M:%S %p') if len(x) > 8 and x[8] else datetime.datetime.min)
-
-# Renumber all trades and recalculate cumulative profit
-running_profit = 0
-for i, trade in enumerate(all_trades, 1):
-    trade[0] = str(i)
-    
-    # Update cumulative profit
-    if len(trade) > 12 and trade[12]:
-        # Extract profit value
-        profit_str = trade[12].replace('$', '').replace(' ', '')
-        is_negative = '(' in profit_str and ')' in profit_str
-        if is_negative:
-            profit_str = profit_str.replace('(', '').replace(')', '')
-            profit_val = -float(profit_str)
-        else:
-            profit_val = float(profit_str)
-        
-        # Add to running profit
-        running_profit += profit_val
-        
-        # Update cumulative profit column if it exists
-        if len(trade) > 13:
-            if running_profit < 0:
-                trade[13] = f"(${abs(running_profit):.2f})"
-            else:
-                trade[13] = f"${running_profit:.2f}"
+# Sort by entry time, then renumber all trades and recalculate cumulative profit
+trades = trades.sorted_by('entry')
+trades.renumber()
 
 # Write to output file
-with open(output_csv, 'w', newline='') as file:
-    writer = csv.writer(file)
-    writer.writerow(header)
-    writer.writerows(all_trades)
+trades.write(output_csv)
 
-print(f"Added {len(temp_trades)} temporary data points")
+print(f"Added {temp_count} temporary data points")
 print(f"Output written to: {output_csv}")
\ No newline at end of file
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Trade Archive Manager
+
+Appends corrected trades from NinjaTrader exports to a memory-mapped
+columnar archive and summarizes what it holds. Only trades that exited
+after the archive's last trade are added, so overlapping exports can be
+appended in any number. An export that restates archived history is
+refused; ``rebuild`` replaces the archive's contents with it instead.
+``bars`` writes equity bars at any resolution, including the 1-minute and
+5-minute bars that conversions leave out, for a date range.
+
+Usage: python archive_trades.py data/archive append export1.csv [export2.csv ...]
+       python archive_trades.py data/archive rebuild export.csv
+       python archive_trades.py data/archive info
+       python archive_trades.py data/archive bars 1m --start 2025-05-01 --end 2025-05-31 -o bars.json
+"""
+import argparse
+import json
+import logging
+import sys
+
+from ntperf import ConversionError
+from ntperf.archive import TradeArchive, append_export
+from ntperf.bars import RESOLUTIONS
+from ntperf.corrections import CORRECTIONS
+from ntperf.lite import format_timestamp
+from ntperf.money import to_dollars
+from ntperf.output import write_output
+from ntperf.store import parse_bound
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Main function to append to, rebuild or describe an archive"""
+    parser = argparse.ArgumentParser(description="Append exports to, rebuild or describe a trade archive")
+    parser.add_argument("directory", help="archive directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+    add = commands.add_parser("append", help="append the new trades of exports, oldest first")
+    add.add_argument("exports", nargs="+", help="NinjaTrader CSV exports")
+    add.add_argument("--corrections", choices=sorted(CORRECTIONS) + ['none'], default="default",
+                     help="misreported-trade corrections to apply")
+    rebuild = commands.add_parser("rebuild", help="replace the archive's contents with one export")
+    rebuild.add_argument("export", help="NinjaTrader CSV export")
+    rebuild.add_argument("--corrections", choices=sorted(CORRECTIONS) + ['none'], default="default",
+                         help="misreported-trade corrections to apply")
+    commands.add_parser("info", help="show row count, date range and monthly P&L")
+    bars = commands.add_parser("bars", help="write equity bars for a date range")
+    bars.add_argument("resolutions", nargs="+", choices=list(RESOLUTIONS), help="bar resolutions")
+    bars.add_argument("--start", help="first date included (YYYY-MM-DD)")
+    bars.add_argument("--end", help="last date included (YYYY-MM-DD)")
+    bars.add_argument("-o", "--output", help="JSON file to write (default: stdout)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
+
+    try:
+        if args.command == "append":
+            for path in args.exports:
+                added = append_export(args.directory, path, args.corrections)
+                logger.info(f"{path}: appended {added} trades")
+        elif args.command == "rebuild":
+            added = append_export(args.directory, args.export, args.corrections, rebuild=True)
+            logger.info(f"{args.export}: rebuilt archive with {added} trades")
+        elif args.command == "bars":
+            bars = TradeArchive(args.directory).equity_bars(
+                args.resolutions, parse_bound(args.start), parse_bound(args.end, end=True))
+            if args.output:
+                write_output(bars, args.output)
+                logger.info(f"Wrote {', '.join(args.resolutions)} bars to {args.output}")
+            else:
+                json.dump(bars, sys.stdout, separators=(',', ':'))
+                sys.stdout.write('\n')
+            return
+    except (ConversionError, ValueError) as e:
+        logger.error(e)
+        sys.exit(1)
+
+    archive = TradeArchive(args.directory)
+    if not len(archive):
+        logger.info(f"{args.directory}: empty")
+        return
+    exits = archive.column('exit')
+    logger.info(f"{args.directory}: {len(archive)} trades, "
+                f"{format_timestamp(int(exits[0]))} to {format_timestamp(int(exits[-1]))}, "
+                f"P&L {to_dollars(int(archive.column('profit').sum())):.2f}, "
+                f"instruments {', '.join(archive.strings['instrument'])}")
+    monthly = archive.calendar()['monthly']
+    for start, pnl, trades, win_rate in zip(monthly['start'], monthly['pnl'],
+                                            monthly['trades'], monthly['win_rate']):
+        logger.info(f"  {start[:7]}  {pnl:>10.2f}  {trades:>5} trades  {win_rate:5.1f}% wins")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Trade Artifact Builder - pre-parses every CSV export for /api/trading-data
+
+Parses each *.csv in the data directory once into a typed, columnar,
+gzipped JSON artifact, so the browser never parses CSV. Unchanged CSVs are
+skipped on later runs.
+
+Usage: python build_artifacts.py [public/data] [src/data/trades] [--force]
+                                 [--profile [profiles/]]
+"""
+import argparse
+import logging
+import sys
+
+from ntperf import ConversionError
+from ntperf.artifacts import build_artifacts
+from ntperf.profiling import add_profile_arguments, profiled
+
+
+def main():
+    """Main function to build the artifacts"""
+    parser = argparse.ArgumentParser(description="Pre-parse CSV exports into typed artifacts")
+    parser.add_argument("data_dir", nargs="?", default="public/data",
+                        help="directory holding the CSV exports")
+    parser.add_argument("out_dir", nargs="?", default="src/data/trades",
+                        help="directory to write the artifacts to")
+    parser.add_argument("--force", action="store_true",
+                        help="rebuild artifacts even if their CSV is unchanged")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
+
+    try:
+        with profiled('build_artifacts', [args.data_dir], args.profile, args.profile_top):
+            manifest = build_artifacts(args.data_dir, args.out_dir, force=args.force)
+    except ConversionError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    except OSError as e:
+        print(f"Error reading {args.data_dir}: {e}")
+        sys.exit(1)
+    print(f"{len(manifest['artifacts'])} artifact(s) in {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
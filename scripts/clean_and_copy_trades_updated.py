@@ -5,13 +5,14 @@ Script to:
 2. Copy trades from May 5-9 to June 3-6 with a 75% skip chance
 3. Generate JSON performance data
 """
-import csv
 import random
 import datetime
 import os
 import sys
 from collections import defaultdict
 
+from ntperf.tradefile import TradeFile
+
 # Input and output files
 input_csv = '/home/pangasa/personal_website/temp_project/NinjaTrader Grid 2025-05-31 12-52 AM.csv'
 output_csv = '/home/pangasa/personal_website/temp_project/NinjaTrader Grid 2025-06-06 12-52 AM.csv'
@@ -34,144 +35,59 @@ def main():
     
     print(f"Reading trades from: {input_csv}")
     
-    # Read all trades from the input CSV
-    all_trades = []
-    with open(input_csv, 'r', newline='') as csvfile:
-        reader = csv.reader(csvfile)
-        header = next(reader)  # Save the header row
-        for row in reader:
-            all_trades.append(row)
+    # Parse the export once; timestamps and profits become array columns
+    trades = TradeFile.read(input_csv)
     
     # Step 1: Delete all trades from May 21 to June 2 (inclusive)
     print("Removing trades from May 21 to June 2...")
-    filtered_trades = []
-    removed_count = 0
-    
-    for trade in all_trades:
-        if len(trade) > 9:  # Make sure row has enough columns
-            try:
-                exit_time_str = trade[9]  # Exit time column
-                exit_time = datetime.datetime.strptime(exit_time_str, '%m/%d/%Y %I:%M:%S %p')
-                exit_date = exit_time.date()
-                
-                # Check if trade is in the date range to be removed
-                if (datetime.date(2025, 5, 21) <= exit_date <= datetime.date(2025, 6, 2)):
-                    removed_count += 1
-                    continue  # Skip this trade
-            except (ValueError, IndexError):
-                pass  # Keep the trade if date parsing fails
-        
-        filtered_trades.append(trade)
+    removed = [i for exit_date, rows in trades.group_by_date().items()
+               if datetime.date(2025, 5, 21) <= exit_date <= datetime.date(2025, 6, 2)
+               for i in rows]
+    trades = trades.drop(removed)
     
-    print(f"Removed {removed_count} trades from May 21 to June 2")
+    print(f"Removed {len(removed)} trades from May 21 to June 2")
     
     # Find the highest trade number
-    max_trade_num = 0
-    for trade in filtered_trades:
-        if trade and trade[0].isdigit():
-            max_trade_num = max(max_trade_num, int(trade[0]))
-    
+    max_trade_num = trades.max_trade_number()
     next_trade_num = max_trade_num + 1
     print(f"Max trade number after removal: {max_trade_num}")
     
     # Step 2: Extract trades from May 6-9 to copy to June 3-6
+    exit_dates = trades.dates()
     may_trades = []
-    for trade in filtered_trades:
-        if len(trade) > 9:  # Make sure row has enough columns
-            try:
-                exit_time_str = trade[9]  # Exit time column
-                exit_time = datetime.datetime.strptime(exit_time_str, '%m/%d/%Y %I:%M:%S %p')
-                exit_date = exit_time.date()
-                
-                # Check if the trade date is in our mapping
-                if exit_date in date_mapping:
-                    # Apply 75% chance of skipping (keep only 25%)
-                    if random.random() > SKIP_PROBABILITY:
-                        may_trades.append(trade)
-            except (ValueError, IndexError):
-                continue
+    for i, exit_date in enumerate(exit_dates):
+        # Check if the trade date is in our mapping
+        if exit_date in date_mapping:
+            # Apply 75% chance of skipping (keep only 25%)
+            if random.random() > SKIP_PROBABILITY:
+                may_trades.append(i)
     
     print(f"Found {len(may_trades)} trades from May 6-9 (after 75% filtering)")
     
-    # Create copies with June dates
-    june_trades = []
-    
     # Group trades by original date to preserve intraday ordering
     trades_by_date = defaultdict(list)
-    for trade in may_trades:
-        exit_time_str = trade[9]
-        exit_time = datetime.datetime.strptime(exit_time_str, '%m/%d/%Y %I:%M:%S %p')
-        exit_date = exit_time.date()
-        trades_by_date[exit_date].append(trade)
+    for i in may_trades:
+        trades_by_date[exit_dates[i]].append(i)
     
-    # Process each day's trades in order
+    # Copy each day's trades to June, keeping their times of day
+    june_count = 0
     for may_date in sorted(trades_by_date.keys()):
         june_date = date_mapping[may_date]
-        for trade in trades_by_date[may_date]:
-            new_trade = trade.copy()
-            
-            # Update trade number
-            new_trade[0] = str(next_trade_num)
+        for i in trades_by_date[may_date]:
+            trades.move_to_date(i, june_date, next_trade_num)
             next_trade_num += 1
-            
-            # Get original entry time and update only the date part
-            entry_time_str = trade[8]
-            entry_time = datetime.datetime.strptime(entry_time_str, '%m/%d/%Y %I:%M:%S %p')
-            new_entry_time = entry_time.replace(
-                year=june_date.year,
-                month=june_date.month,
-                day=june_date.day
-            )
-            new_trade[8] = new_entry_time.strftime('%-m/%-d/%Y %-I:%M:%S %p')
-            
-            # Get original exit time and update only the date part
-            exit_time_str = trade[9]
-            exit_time = datetime.datetime.strptime(exit_time_str, '%m/%d/%Y %I:%M:%S %p')
-            new_exit_time = exit_time.replace(
-                year=june_date.year,
-                month=june_date.month,
-                day=june_date.day
-            )
-            new_trade[9] = new_exit_time.strftime('%-m/%-d/%Y %-I:%M:%S %p')
-            
-            june_trades.append(new_trade)
-    
-    print(f"Generated {len(june_trades)} new trades for June 3-6")
-    
-    # Combine filtered trades and new June trades
-    combined_trades = filtered_trades + june_trades
+            june_count += 1
     
-    # Sort by exit time
-    combined_trades.sort(key=lambda x: datetime.datetime.strptime(x[9], '%m/%d/%Y %I:%M:%S %p') if len(x) > 9 else datetime.datetime.min)
+    print(f"Generated {june_count} new trades for June 3-6")
     
-    # Renumber all trades and recalculate cumulative profit
-    cumulative_profit = 0
-    for i, trade in enumerate(combined_trades, 1):
-        trade[0] = str(i)
-        
-        # Recalculate cumulative profit
-        if len(trade) > 12 and trade[12]:
-            profit_str = trade[12].replace('$', '').replace(',', '')
-            if '(' in profit_str and ')' in profit_str:
-                profit_str = profit_str.replace('(', '-').replace(')', '')
-            try:
-                profit = float(profit_str)
-                cumulative_profit += profit
-                
-                if cumulative_profit < 0:
-                    trade[13] = f"(${abs(cumulative_profit):.2f})"
-                else:
-                    trade[13] = f"${cumulative_profit:.2f}"
-            except ValueError:
-                pass
+    # Sort by exit time, then renumber all trades and recalculate cumulative profit
+    trades = trades.sorted_by('exit')
+    cumulative_profit = trades.renumber()
     
     # Write to output file
-    with open(output_csv, 'w', newline='') as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerow(header)
-        writer.writerows(combined_trades)
+    trades.write(output_csv)
     
-    print(f"Wrote {len(combined_trades)} trades to: {output_csv}")
+    print(f"Wrote {len(trades)} trades to: {output_csv}")
     print(f"Final cumulative profit: ${cumulative_profit:.2f}")
 
 if __name__ == "__main__":
@@ -4,13 +4,15 @@ Script to copy trades from May 5-9, 2025 to June 2-6, 2025.
 Each trade has a 30% chance of being skipped to introduce variation.
 Times are kept exactly the same, only the dates are changed.
 """
-import csv
 import random
 import datetime
 import os
 import sys
 from collections import defaultdict
 
+from ntperf.money import parse_cents, to_dollars
+from ntperf.tradefile import TradeFile
+
 # Input and output files
 input_csv = '/home/pangasa/personal_website/temp_project/NinjaTrader Grid 2025-05-31 12-52 AM.csv'
 output_csv = '/home/pangasa/personal_website/temp_project/NinjaTrader Grid 2025-06-06 12-52 AM.csv'
@@ -34,153 +36,58 @@ def main():
     
     print(f"Reading trades from: {input_csv}")
     
-    # Read all trades from the input CSV
-    all_trades = []
-    with open(input_csv, 'r', newline='') as csvfile:
-        reader = csv.reader(csvfile)
-        header = next(reader)  # Save the header row
-        for row in reader:
-            all_trades.append(row)
+    # Parse the export once; timestamps and profits become array columns
+    trades = TradeFile.read(input_csv)
     
     # Find the highest trade number
-    max_trade_num = 0
-    for trade in all_trades:
-        if trade and trade[0].isdigit():
-            max_trade_num = max(max_trade_num, int(trade[0]))
-    
+    max_trade_num = trades.max_trade_number()
     next_trade_num = max_trade_num + 1
     print(f"Max trade number: {max_trade_num}")
     
     # Extract trades from May 5-9
+    exit_dates = trades.dates()
     may_trades = []
-    for trade in all_trades:
-        if len(trade) > 9:  # Make sure row has enough columns
-            try:
-                exit_time_str = trade[9]  # Exit time column
-                exit_time = datetime.datetime.strptime(exit_time_str, '%m/%d/%Y %I:%M:%S %p')
-                exit_date = exit_time.date()
-                
-                # Check if the trade date is in our mapping
-                if exit_date in date_mapping:
-                    # Apply 30% chance of skipping
-                    if random.random() < KEEP_PROBABILITY:
-                        may_trades.append(trade)
-            except (ValueError, IndexError) as e:
-                print(f"Error parsing date: {e}")
-                continue
+    for i, exit_date in enumerate(exit_dates):
+        # Check if the trade date is in our mapping
+        if exit_date in date_mapping:
+            # Apply 30% chance of skipping
+            if random.random() < KEEP_PROBABILITY:
+                may_trades.append(i)
     
     print(f"Found {len(may_trades)} trades from May 5-9 (after 30% filtering)")
     
-    # Create copies with June dates
-    june_trades = []
-    cumulative_profit = 0
-    
     # Get the last cumulative profit value from the existing trades
-    if all_trades:
-        try:
-            last_cum_profit_str = all_trades[-1][13].replace('$', '').replace(',', '')
-            if '(' in last_cum_profit_str and ')' in last_cum_profit_str:
-                last_cum_profit_str = last_cum_profit_str.replace('(', '-').replace(')', '')
-            cumulative_profit = float(last_cum_profit_str)
-        except (ValueError, IndexError) as e:
-            print(f"Error getting last cumulative profit: {e}")
-            cumulative_profit = 0
-    
+    cumulative_profit = to_dollars(parse_cents(trades[-1].cell('Cum. net profit'))) if len(trades) else 0.0
     print(f"Starting cumulative profit: ${cumulative_profit:.2f}")
     
     # Group trades by original date to preserve intraday ordering
     trades_by_date = defaultdict(list)
-    for trade in may_trades:
-        exit_time_str = trade[9]
-        exit_time = datetime.datetime.strptime(exit_time_str, '%m/%d/%Y %I:%M:%S %p')
-        exit_date = exit_time.date()
-        trades_by_date[exit_date].append(trade)
+    for i in may_trades:
+        trades_by_date[exit_dates[i]].append(i)
     
     # Process each day's trades in order
+    june_count = 0
     for may_date in sorted(trades_by_date.keys()):
         june_date = date_mapping[may_date]
-        for trade in trades_by_date[may_date]:
-            new_trade = trade.copy()
-            
-            # Update trade number
-            new_trade[0] = str(next_trade_num)
+        for i in trades_by_date[may_date]:
+            # Keep the original times of day, only the date changes
+            new_index = trades.move_to_date(i, june_date, next_trade_num)
             next_trade_num += 1
+            june_count += 1
             
-            # Get original entry time and update only the date part
-            entry_time_str = trade[8]
-            entry_time = datetime.datetime.strptime(entry_time_str, '%m/%d/%Y %I:%M:%S %p')
-            new_entry_time = entry_time.replace(
-                year=june_date.year,
-                month=june_date.month,
-                day=june_date.day
-            )
-            new_trade[8] = new_entry_time.strftime('%-m/%-d/%Y %-I:%M:%S %p')
-            
-            # Get original exit time and update only the date part
-            exit_time_str = trade[9]
-            exit_time = datetime.datetime.strptime(exit_time_str, '%m/%d/%Y %I:%M:%S %p')
-            new_exit_time = exit_time.replace(
-                year=june_date.year,
-                month=june_date.month,
-                day=june_date.day
-            )
-            new_trade[9] = new_exit_time.strftime('%-m/%-d/%Y %-I:%M:%S %p')
-            
-            # Update profit
-            profit_str = trade[12].replace('$', '').replace(',', '')
-            if '(' in profit_str and ')' in profit_str:
-                profit_str = profit_str.replace('(', '-').replace(')', '')
-            profit = float(profit_str)
-            
-            # Add profit to cumulative total
-            cumulative_profit += profit
-            
-            # Format profit and cumulative profit
-            if profit < 0:
-                new_trade[12] = f"(${abs(profit):.2f})"
-            else:
-                new_trade[12] = f"${profit:.2f}"
-                
-            if cumulative_profit < 0:
-                new_trade[13] = f"(${abs(cumulative_profit):.2f})"
-            else:
-                new_trade[13] = f"${cumulative_profit:.2f}"
-            
-            june_trades.append(new_trade)
-    
-    print(f"Generated {len(june_trades)} new trades for June 2-6")
-    
-    # Combine original trades and new June trades
-    combined_trades = all_trades + june_trades
+            # Normalise the profit cell to "$x.xx" / "($x.xx)"
+            trades.set_cents(new_index, trades.cents[i])
     
-    # Sort by exit time
-    combined_trades.sort(key=lambda x: datetime.datetime.strptime(x[9], '%m/%d/%Y %I:%M:%S %p') if len(x) > 9 else datetime.datetime.min)
+    print(f"Generated {june_count} new trades for June 2-6")
     
-    # Renumber all trades and recalculate cumulative profit
-    cumulative_profit = 0
-    for i, trade in enumerate(combined_trades, 1):
-        trade[0] = str(i)
-        
-        # Recalculate cumulative profit
-        profit_str = trade[12].replace('$', '').replace(',', '')
-        if '(' in profit_str and ')' in profit_str:
-            profit_str = profit_str.replace('(', '-').replace(')', '')
-        profit = float(profit_str)
-        
-        cumulative_profit += profit
-        
-        if cumulative_profit < 0:
-            trade[13] = f"(${abs(cumulative_profit):.2f})"
-        else:
-            trade[13] = f"${cumulative_profit:.2f}"
+    # Sort by exit time, then renumber all trades and recalculate cumulative profit
+    trades = trades.sorted_by('exit')
+    cumulative_profit = trades.renumber()
     
     # Write to output file
-    with open(output_csv, 'w', newline='') as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerow(header)
-        writer.writerows(combined_trades)
+    trades.write(output_csv)
     
-    print(f"Wrote {len(combined_trades)} trades to: {output_csv}")
+    print(f"Wrote {len(trades)} trades to: {output_csv}")
     print(f"Final cumulative profit: ${cumulative_profit:.2f}")
 
 if __name__ == "__main__":
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo Drawdown Simulator
+
+Resamples the trades in a converter output (perf.json) to estimate the
+distribution of final P&L and maximum drawdown, and the probability of
+hitting one or more trailing-drawdown limits.
+
+Usage: python monte_carlo.py perf.json [--paths 100000] [--block-size 20]
+                             [--dd-limit 2000 --dd-limit 3000] [--seed 0]
+                             [--workers 4] [--output mc.json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from ntperf.montecarlo import DEFAULT_DD_LIMIT, DEFAULT_PATHS, simulate
+
+
+def main():
+    """Main function to run the simulator"""
+    parser = argparse.ArgumentParser(description="Bootstrap Monte Carlo over converter output")
+    parser.add_argument("perf_json", help="JSON file produced by nt2json.py")
+    parser.add_argument("--paths", type=int, default=DEFAULT_PATHS, help="number of resampled paths")
+    parser.add_argument("--block-size", type=int, default=1,
+                        help="block length for a block bootstrap (1 = iid)")
+    parser.add_argument("--dd-limit", type=float, action="append",
+                        help="trailing drawdown limit in dollars (repeatable)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--workers", type=int, default=1,
+                        help=f"worker processes (this machine has {os.cpu_count()} cores)")
+    parser.add_argument("--output", help="write the result JSON here instead of stdout")
+    args = parser.parse_args()
+
+    try:
+        with open(args.perf_json) as f:
+            trades = json.load(f)["trades"]
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error reading trades from {args.perf_json}: {e}")
+        sys.exit(1)
+
+    trades.sort(key=lambda t: t["Exit time"])
+    start = time.perf_counter()
+    result = simulate([t["Profit"] for t in trades], n_paths=args.paths,
+                      block_size=args.block_size, dd_limits=args.dd_limit or [DEFAULT_DD_LIMIT],
+                      seed=args.seed, workers=args.workers)
+    if result is None:
+        print("Error: need at least two trades to resample")
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"Simulated {args.paths} paths in {elapsed:.2f}s, wrote {args.output}")
+    else:
+        json.dump(result, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
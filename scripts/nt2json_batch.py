@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Batch Converter - converts many NinjaTrader exports in parallel
+
+Converts every export in the given directories or globs across a pool of
+worker processes (one per available core by default), writes one JSON per
+export and a combined summary.json, and reports how long each file took.
+The combined totals count each account once, from its latest export.
+
+Usage: python nt2json_batch.py public/data "archive/*.csv" --output-dir batch/
+                               [--workers 8] [--no-analytics] [--backend lite]
+                               [--corrections extended] [--profile [profiles/]]
+"""
+import argparse
+import logging
+import sys
+
+from ntperf import ConversionError
+from ntperf.batch import available_cores, expand_sources, run_batch
+from ntperf.corrections import CORRECTIONS
+from ntperf.pipeline import BACKENDS
+from ntperf.profiling import add_profile_arguments
+
+
+def main():
+    """Main function to run the batch converter"""
+    parser = argparse.ArgumentParser(description="Convert many NinjaTrader CSV exports in parallel")
+    parser.add_argument("sources", nargs="+", help="export files, directories or globs")
+    parser.add_argument("--output-dir", required=True,
+                        help="directory for one JSON per export and summary.json")
+    parser.add_argument("--workers", type=int,
+                        help=f"worker processes (default: {available_cores()} available cores)")
+    parser.add_argument("--no-analytics", action="store_true",
+                        help="only write equity curve, metrics and trades")
+    parser.add_argument("--backend", choices=BACKENDS, default="auto",
+                        help="'lite' avoids importing pandas and writes only equity curve, metrics and trades; "
+                             "'auto' uses it for exports under 1 MB with --no-analytics")
+    parser.add_argument("--corrections", choices=sorted(CORRECTIONS) + ['none'], default="default",
+                        help="misreported-trade corrections to apply")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
+
+    sources = expand_sources(args.sources)
+    if not sources:
+        print("Error: no exports found")
+        sys.exit(1)
+
+    try:
+        summary = run_batch(sources, args.output_dir, workers=args.workers,
+                            corrections=args.corrections,
+                            analytics=[] if args.no_analytics else None, backend=args.backend,
+                            profile_dir=args.profile, profile_top=args.profile_top)
+    except ConversionError as e:
+        print(e)
+        sys.exit(1)
+
+    print()
+    print(f"{'Export':<45} {'Trades':>7} {'P&L':>12} {'Convert':>8} {'Write':>7}")
+    for row in summary["files"]:
+        seconds = row["seconds"]
+        note = f"  (same as {row['duplicate_of']})" if row.get("duplicate_of") else ""
+        print(f"{row['source']:<45} {row['trades']:>7} {row['metrics']['pnl']:>12,.2f} "
+              f"{seconds['convert']:>7.2f}s {seconds['write']:>6.2f}s{note}")
+    combined = summary["combined"]
+    print(f"{'Combined (latest export per account)':<45} {combined['trades']:>7} {combined['pnl']:>12,.2f}")
+    for account, source in combined["accounts"].items():
+        print(f"  {account} from {source}")
+    print(f"\nConverted {combined['files']} export(s) with {summary['workers']} worker(s) in "
+          f"{summary['wall_seconds']:.2f}s ({combined['worker_seconds']:.2f}s of worker time)")
+    if summary["failed"]:
+        for failure in summary["failed"]:
+            print(f"Failed: {failure['source']}: {failure['error']}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
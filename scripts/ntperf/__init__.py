@@ -0,0 +1,52 @@
+"""
+NinjaTrader performance conversion library.
+
+Parses NinjaTrader Grid exports, computes headline metrics and trade
+analytics, and builds the JSON document served to the performance
+dashboard. ``nt2json.py`` and ``nt2json2.py`` are thin command-line
+wrappers around this package.
+
+Importing the package is cheap: the pandas backend (load_export,
+build_outputs, ANALYTICS) is only imported on first use.
+"""
+from ntperf.corrections import apply_corrections
+from ntperf.errors import (ConversionError, ExportReadError, HistoryMismatchError, MissingColumnError,
+                           OutputWriteError, ValidationError)
+from ntperf.metrics import Metrics, calculate_max_drawdown, compute_metrics
+from ntperf.output import write_output
+from ntperf.pipeline import convert
+
+# Names resolved lazily from the pandas-backed modules
+_LAZY = {
+    'ANALYTICS': 'ntperf.api',
+    'build_outputs': 'ntperf.api',
+    'load_export': 'ntperf.api',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        import importlib
+        value = getattr(importlib.import_module(_LAZY[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module 'ntperf' has no attribute {name!r}")
+
+
+__all__ = [
+    'ANALYTICS',
+    'ConversionError',
+    'ExportReadError',
+    'HistoryMismatchError',
+    'Metrics',
+    'MissingColumnError',
+    'OutputWriteError',
+    'ValidationError',
+    'apply_corrections',
+    'build_outputs',
+    'calculate_max_drawdown',
+    'compute_metrics',
+    'convert',
+    'load_export',
+    'write_output',
+]
@@ -0,0 +1,166 @@
+"""
+Importable conversion API.
+
+    from ntperf import load_export, compute_metrics, build_outputs
+
+    df = load_export("NinjaTrader Grid 2025-07-02 12-52 AM.csv")
+    data = build_outputs(df)
+
+This is the pandas/NumPy backend; see ntperf.lite for the stdlib backend
+and ntperf.pipeline for choosing between them. Functions raise
+ConversionError subclasses instead of exiting, so one warm process can run
+many conversions.
+"""
+from typing import Any, Callable, Dict, Iterable, Optional
+
+import pandas as pd
+
+from ntperf.bars import compute_equity_bars
+from ntperf.corrections import apply_corrections
+from ntperf.efficiency import compute_efficiency
+from ntperf.errors import ExportReadError, MissingColumnError
+from ntperf.exposure import compute_exposure
+from ntperf.metrics import Metrics, compute_metrics
+from ntperf.money import CENTS_PER_DOLLAR
+from ntperf.montecarlo import compute_monte_carlo
+from ntperf.parsing import parse_money_columns, parse_timestamps
+from ntperf.periods import compute_calendar
+from ntperf.portfolio import compute_portfolio
+from ntperf.proprules import simulate_rules
+from ntperf.reconcile import reconcile_arrays, unavailable
+from ntperf.schema import REQUIRED_COLUMNS, TIME_FORMAT, TRADE_COLUMNS
+from ntperf.spans import span
+from ntperf.streaks import compute_streaks
+from ntperf.timing import compute_timing
+
+# Output sections derived from the trade table, in output order. Each
+# function takes the corrected DataFrame and returns a JSON-ready dict, or
+# None when the export lacks the columns it needs.
+ANALYTICS: Dict[str, Callable[[pd.DataFrame], Optional[Dict[str, Any]]]] = {
+    "equity_bars": compute_equity_bars,
+    "calendar": compute_calendar,
+    "efficiency": compute_efficiency,
+    "timing": compute_timing,
+    "streaks": compute_streaks,
+    "exposure": compute_exposure,
+    "monte_carlo": compute_monte_carlo,
+    "prop_rules": simulate_rules,
+    "portfolio": compute_portfolio,
+}
+
+
+def load_export(source: Any, corrections: str = 'default') -> pd.DataFrame:
+    """
+    Read and parse a NinjaTrader Grid export.
+
+    Args:
+        source: Path or file-like object accepted by pandas.read_csv
+        corrections: Correction profile passed to apply_corrections()
+
+    Returns:
+        DataFrame in exit order (ties keep export order) with money
+        columns as floats (plus exact int64 cents columns for profit and
+        cumulative profit) and timestamps as datetimes.
+        ``df.attrs['reconciliation']`` holds the comparison of the export's
+        'Cum. net profit' with the corrected equity (see ntperf.reconcile).
+
+    Raises:
+        ExportReadError: The file cannot be read or parsed
+        MissingColumnError: A required column is absent
+    """
+    with span('read') as s:
+        try:
+            df = pd.read_csv(source)
+        except Exception as e:
+            raise ExportReadError(f"Error reading CSV file: {e}") from e
+        s.rows = len(df)
+
+    missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing:
+        raise MissingColumnError(f"Missing required column(s): {', '.join(missing)}")
+
+    with span('clean') as s:
+        parse_money_columns(df)
+        try:
+            df['Entry time'] = parse_timestamps(df['Entry time'])
+            df['Exit time'] = parse_timestamps(df['Exit time'])
+        except (ValueError, TypeError) as e:
+            raise ExportReadError(f"Unparseable timestamp in export: {e}") from e
+        reported = 'Cum. net profit' in df.columns
+        if not reported:
+            df['Cum. net profit cents'] = df['Profit cents'].cumsum()
+            df['Cum. net profit'] = df['Cum. net profit cents'] / CENTS_PER_DOLLAR
+        s.rows = len(df)
+
+    with span('filter') as s:
+        raw = df
+        df = apply_corrections(df, corrections)
+        if not df['Exit time'].is_monotonic_increasing:
+            # Equity runs in exit order even when no correction re-sorted it
+            df = df.sort_values('Exit time', kind='stable')
+            df['Cum. net profit cents'] = df['Profit cents'].cumsum()
+            df['Cum. net profit'] = df['Cum. net profit cents'] / CENTS_PER_DOLLAR
+        s.rows = len(df)
+
+    with span('reconcile') as s:
+        df.attrs['reconciliation'] = _reconcile(raw, df) if reported else unavailable(len(df))
+        s.rows = len(raw)
+    return df
+
+
+def _reconcile(raw: pd.DataFrame, df: pd.DataFrame) -> Dict[str, Any]:
+    """Reconcile the export's 'Cum. net profit' with the corrected equity."""
+    exits = raw['Exit time']
+    return reconcile_arrays(raw['Cum. net profit cents'].to_numpy(), raw['Profit cents'].to_numpy(),
+                            raw.index.isin(df.index),
+                            int(df['Cum. net profit cents'].iloc[-1]) if len(df) else 0,
+                            lambda i: exits.iloc[i].strftime(TIME_FORMAT))
+
+
+def build_outputs(df: pd.DataFrame, metrics: Optional[Metrics] = None,
+                  analytics: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """
+    Build the JSON-ready output document for a parsed export.
+
+    Args:
+        df: DataFrame returned by load_export()
+        metrics: Precomputed metrics; computed from df when omitted
+        analytics: Names of ANALYTICS sections to include (default: all)
+
+    Returns:
+        Dictionary containing equity curve, metrics, trade data and the
+        requested analytics sections
+    """
+    if metrics is None:
+        with span('metrics') as s:
+            metrics = compute_metrics(df)
+            s.rows = len(df)
+    names = ANALYTICS.keys() if analytics is None else analytics
+
+    # Computed while timestamps are still datetimes
+    sections = {}
+    for name in names:
+        with span(f'analytics.{name}') as s:
+            section = ANALYTICS[name](df)
+            s.rows = len(df)
+        if section is not None:
+            sections[name] = section
+
+    with span('serialize') as s:
+        trades = df[TRADE_COLUMNS].copy()
+        trades['Entry time'] = trades['Entry time'].dt.strftime(TIME_FORMAT)
+        trades['Exit time'] = trades['Exit time'].dt.strftime(TIME_FORMAT)
+
+        output = {
+            "equity_curve": {
+                "dates": trades['Exit time'].tolist(),
+                "values": [float(x) for x in df['Cum. net profit'].tolist()]
+            },
+            "metrics": metrics.to_dict(),
+            "trades": trades.to_dict('records')
+        }
+        if 'reconciliation' in df.attrs:
+            output["reconciliation"] = df.attrs['reconciliation']
+        s.rows = len(df)
+    output.update(sections)
+    return output
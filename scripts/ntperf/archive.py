@@ -0,0 +1,410 @@
+"""
+Append-only, memory-mapped columnar archive of corrected trades.
+
+Years of history kept as JSON or CSV have to be re-read and re-parsed for
+every analysis. The archive instead stores each column as a flat binary
+file of fixed-width integers, in exit order, so a reader maps it with
+``np.memmap`` and slices it without copying or parsing:
+
+    <archive>/
+        meta.json             row count, column dtypes, string dictionaries,
+                              calendar period tables
+        exit.i8               exit time, naive local epoch seconds
+        entry.i8              entry time, naive local epoch seconds
+        profit.i8             profit in cents
+        qty.i8                contracts (MISSING where blank)
+        scale.i8              price ticks per point
+        entry_price.i8        entry price in ticks
+        exit_price.i8         exit price in ticks
+        instrument.i4         index into meta["strings"]["instrument"] (-1 blank)
+        position.i4           index into meta["strings"]["position"] (-1 blank)
+
+Opening an archive reads ``meta.json`` and maps the files, so it takes the
+same time for ten trades or ten million, and the page cache shares the
+mapped pages between every process reading the archive.
+
+Appends write the new rows to the end of every column file and fsync them
+before ``meta.json`` is atomically replaced with the new row count. Readers
+only look at the first ``rows`` entries, so they never see a half-written
+append, and a crashed append is truncated away by the next one. Appending
+an export only adds the trades that exited after the archive's last trade,
+so the same export (or a later one repeating its history) can be appended
+any number of times. An export's trades before that point must match the
+archived trades over the same range: NinjaTrader exports can restate
+history (dropping or changing earlier trades), and such an export is
+refused with HistoryMismatchError rather than silently appended on top of
+the old history. rebuild_table() replaces the archive's contents with it
+instead. The daily to yearly P&L tables of ntperf.periods are
+kept in ``meta.json`` and extended with the appended trades only. Equity
+bars at any resolution of ntperf.bars, including the 1-minute and 5-minute
+bars left out of conversions, are built on demand for a date range.
+"""
+import json
+import math
+import os
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ntperf import lite
+from ntperf.bars import bars_document
+from ntperf.errors import HistoryMismatchError, OutputWriteError
+from ntperf.output import atomic_write
+from ntperf.periods import (calendar_document, empty_tables, extend_tables, period_tables,
+                            to_lists)
+from ntperf.tradefile import MISSING
+
+META_NAME = 'meta.json'
+FORMAT_VERSION = 1
+
+# Column name -> dtype; file names carry the dtype as a suffix
+COLUMNS: Dict[str, str] = {
+    'exit': 'i8',
+    'entry': 'i8',
+    'profit': 'i8',
+    'qty': 'i8',
+    'scale': 'i8',
+    'entry_price': 'i8',
+    'exit_price': 'i8',
+    'instrument': 'i4',
+    'position': 'i4',
+}
+# Columns stored as codes into meta["strings"]
+STRING_COLUMNS = ('instrument', 'position')
+# Differing trades listed in a HistoryMismatchError message
+_MAX_REPORTED = 3
+
+
+def column_file(name: str) -> str:
+    return f"{name}.{COLUMNS[name]}"
+
+
+def read_meta(directory: str) -> Dict[str, Any]:
+    """
+    Load the archive's metadata.
+
+    Args:
+        directory: Archive directory
+
+    Returns:
+        Metadata with "rows", "columns", "strings" and "periods"; an empty
+        archive if none has been written yet
+    """
+    try:
+        with open(os.path.join(directory, META_NAME)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return _empty_meta()
+
+
+def _empty_meta() -> Dict[str, Any]:
+    return {
+        "format": FORMAT_VERSION,
+        "rows": 0,
+        "columns": dict(COLUMNS),
+        "strings": {name: [] for name in STRING_COLUMNS},
+        "periods": empty_tables()
+    }
+
+
+class TradeArchive:
+    """
+    Read-only, zero-copy view of an archive.
+
+    Columns are ``np.memmap`` arrays of the first ``rows`` entries of each
+    file; the view keeps the row count it was opened with, so later
+    appends are only seen by reopening.
+
+    Args:
+        directory: Archive directory
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.meta = read_meta(directory)
+        self.rows: int = self.meta["rows"]
+        self.strings: Dict[str, List[str]] = self.meta["strings"]
+        self._columns: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Memory-mapped column.
+
+        Args:
+            name: Key of COLUMNS
+
+        Returns:
+            Read-only array of ``rows`` entries
+        """
+        if name not in COLUMNS:
+            raise ValueError(f"Unknown column: {name!r}")
+        if name not in self._columns:
+            dtype = np.dtype(COLUMNS[name])
+            if self.rows == 0:
+                self._columns[name] = np.empty(0, dtype=dtype)
+            else:
+                self._columns[name] = np.memmap(os.path.join(self.directory, column_file(name)),
+                                                dtype=dtype, mode='r', shape=(self.rows,))
+        return self._columns[name]
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.column(name)
+
+    def decode(self, name: str, codes: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Strings of a dictionary-encoded column.
+
+        Args:
+            name: One of STRING_COLUMNS
+            codes: Codes to decode (default: the whole column)
+
+        Returns:
+            Object array of strings, None where blank
+        """
+        if name not in STRING_COLUMNS:
+            raise ValueError(f"Not a string column: {name!r}")
+        codes = self.column(name) if codes is None else codes
+        table = np.array(self.strings[name] + [None], dtype=object)
+        return table[codes]
+
+    def calendar(self) -> Dict[str, Any]:
+        """Daily, weekly, monthly and yearly P&L as the ``calendar`` output section."""
+        return calendar_document(self._periods())
+
+    def _periods(self) -> Dict[str, Any]:
+        """Stored period tables, rebuilt from the columns if the archive predates them."""
+        if "periods" not in self.meta:
+            self.meta["periods"] = to_lists(period_tables(self.column('exit'), self.column('profit')))
+        return self.meta["periods"]
+
+    def equity_bars(self, resolutions: Sequence[str], start: Optional[int] = None,
+                    end: Optional[int] = None) -> Dict[str, Any]:
+        """
+        OHLC equity bars of the trades exiting in [start, end).
+
+        Equity continues from the archived trades before ``start``.
+
+        Args:
+            resolutions: Keys of ntperf.bars.RESOLUTIONS
+            start: First exit time included, in epoch seconds
+            end: Exit time at which the range stops (exclusive)
+
+        Returns:
+            Bars keyed by resolution, as in the ``equity_bars`` section
+
+        Raises:
+            ValueError: A resolution is unknown
+        """
+        lo, hi = self.span(start, end)
+        profit = self.column('profit')
+        return bars_document(self.column('exit')[lo:hi], profit[lo:hi], resolutions,
+                             opening=int(profit[:lo].sum()))
+
+    def span(self, start: Optional[int] = None, end: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Rows exiting in [start, end), found by binary search.
+
+        Args:
+            start: First exit time included, in epoch seconds
+            end: Exit time at which the range stops (exclusive)
+
+        Returns:
+            (first, stop) row positions
+        """
+        exits = self.column('exit')
+        lo = 0 if start is None else int(np.searchsorted(exits, start, side='left'))
+        hi = self.rows if end is None else int(np.searchsorted(exits, end, side='left'))
+        return lo, max(lo, hi)
+
+
+def _boundary_keys(archive: TradeArchive) -> set:
+    """Identity of the archived trades sharing the last exit time."""
+    if not archive.rows:
+        return set()
+    exits = archive.column('exit')
+    lo = int(np.searchsorted(exits, exits[-1], side='left'))
+    return {
+        (int(archive['exit'][i]), int(archive['entry'][i]), int(archive['profit'][i]),
+         int(archive['instrument'][i]), int(archive['position'][i]))
+        for i in range(lo, archive.rows)
+    }
+
+
+def _text(value: Any) -> Optional[str]:
+    return value if isinstance(value, str) else None
+
+
+def check_history(archive: TradeArchive, table: lite.TradeTable) -> None:
+    """
+    Check that a table agrees with the archive where their histories overlap.
+
+    The overlap runs from the later of the two first exits up to, but not
+    including, the archive's last exit; trades exiting at or after it are
+    the ones append_table() considers new.
+
+    Args:
+        archive: Archive to append to
+        table: Corrected TradeTable
+
+    Raises:
+        HistoryMismatchError: The table drops, adds or changes a trade in
+            the overlapping range
+    """
+    if not archive.rows or not len(table):
+        return
+    exits = archive.column('exit')
+    start = max(int(exits[0]), min(table.exit))
+    end = int(exits[-1])
+    lo, hi = archive.span(start, end)
+    instruments = archive.decode('instrument', archive['instrument'][lo:hi])
+    positions = archive.decode('position', archive['position'][lo:hi])
+    archived = Counter(zip(exits[lo:hi].tolist(), archive['entry'][lo:hi].tolist(),
+                           archive['profit'][lo:hi].tolist(), instruments, positions))
+    exported = Counter(
+        (table.exit[i], table.entry[i], table.profit[i],
+         _text(table.instrument[i]), _text(table.position[i]))
+        for i in range(len(table)) if start <= table.exit[i] < end
+    )
+    if archived == exported:
+        return
+    missing = sorted((archived - exported).elements())
+    added = sorted((exported - archived).elements())
+    first = min(missing[:1] + added[:1])
+    raise HistoryMismatchError(
+        f"Export restates archived history between {lite.format_timestamp(start)} and "
+        f"{lite.format_timestamp(end)}: {len(missing)} archived trade(s) missing or changed, "
+        f"{len(added)} not in the archive, first at exit {lite.format_timestamp(first[0])}; "
+        f"rebuild the archive from the export to replace its history")
+
+
+def _code(value: Any, codes: Dict[str, int], strings: List[str]) -> int:
+    if not isinstance(value, str):
+        return -1
+    code = codes.get(value)
+    if code is None:
+        code = codes[value] = len(strings)
+        strings.append(value)
+    return code
+
+
+def append_table(directory: str, table: lite.TradeTable) -> int:
+    """
+    Append the trades of a table that exited after the archive's last trade.
+
+    Args:
+        directory: Archive directory (created if missing)
+        table: Corrected TradeTable
+
+    Returns:
+        Number of rows appended
+
+    Raises:
+        HistoryMismatchError: The table restates archived history (see
+            check_history())
+        OutputWriteError: The archive cannot be written
+    """
+    archive = TradeArchive(directory)
+    check_history(archive, table)
+    meta = archive.meta
+    last_exit = int(archive['exit'][-1]) if archive.rows else None
+    boundary = _boundary_keys(archive)
+    strings = meta["strings"]
+    codes = {name: {s: i for i, s in enumerate(strings[name])} for name in STRING_COLUMNS}
+
+    new: Dict[str, List[int]] = {name: [] for name in COLUMNS}
+    for i in sorted(range(len(table)), key=table.exit.__getitem__):
+        exit_ = table.exit[i]
+        instrument = _code(table.instrument[i], codes['instrument'], strings['instrument'])
+        position = _code(table.position[i], codes['position'], strings['position'])
+        if last_exit is not None:
+            if exit_ < last_exit:
+                continue
+            if exit_ == last_exit and (exit_, table.entry[i], table.profit[i],
+                                       instrument, position) in boundary:
+                continue
+        qty = table.qty[i]
+        new['exit'].append(exit_)
+        new['entry'].append(table.entry[i])
+        new['profit'].append(table.profit[i])
+        new['qty'].append(MISSING if isinstance(qty, float) and math.isnan(qty) else int(qty))
+        new['scale'].append(table.scale[i])
+        new['entry_price'].append(table.entry_price[i])
+        new['exit_price'].append(table.exit_price[i])
+        new['instrument'].append(instrument)
+        new['position'].append(position)
+
+    added = len(new['exit'])
+    if not added:
+        return 0
+    try:
+        os.makedirs(directory, exist_ok=True)
+        for name, dtype in COLUMNS.items():
+            path = os.path.join(directory, column_file(name))
+            with open(path, 'ab') as f:
+                # Drop whatever a crashed append left past the committed rows
+                f.truncate(archive.rows * np.dtype(dtype).itemsize)
+                f.write(np.asarray(new[name], dtype=dtype).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+        periods = extend_tables(archive._periods(), np.asarray(new['exit'], dtype=np.int64),
+                                np.asarray(new['profit'], dtype=np.int64))
+        meta = dict(meta, rows=archive.rows + added, strings=strings, periods=periods)
+        atomic_write(os.path.join(directory, META_NAME), lambda f: json.dump(meta, f, indent=2))
+    except OSError as e:
+        raise OutputWriteError(f"Error appending to archive {directory}: {e}") from e
+    return added
+
+
+def rebuild_table(directory: str, table: lite.TradeTable) -> int:
+    """
+    Replace an archive's contents with a table.
+
+    An empty archive is committed first and the table appended to it, so a
+    crash part-way leaves an empty archive, never a mix of old and new
+    history; readers see it empty until the append commits.
+
+    Args:
+        directory: Archive directory (created if missing)
+        table: Corrected TradeTable
+
+    Returns:
+        Number of rows in the rebuilt archive
+
+    Raises:
+        OutputWriteError: The archive cannot be written
+    """
+    try:
+        os.makedirs(directory, exist_ok=True)
+        meta = _empty_meta()
+        atomic_write(os.path.join(directory, META_NAME), lambda f: json.dump(meta, f, indent=2))
+    except OSError as e:
+        raise OutputWriteError(f"Error rebuilding archive {directory}: {e}") from e
+    return append_table(directory, table)
+
+
+def append_export(directory: str, source: str, corrections: str = 'default',
+                  rebuild: bool = False) -> int:
+    """
+    Parse and correct an export and append its new trades to an archive.
+
+    Args:
+        directory: Archive directory (created if missing)
+        source: Path to the CSV export
+        corrections: Correction profile name
+        rebuild: Replace the archive's contents with the export instead
+
+    Returns:
+        Number of rows appended
+
+    Raises:
+        ExportReadError: The export cannot be read
+        MissingColumnError: A required column is absent
+        HistoryMismatchError: The export restates archived history
+        OutputWriteError: The archive cannot be written
+    """
+    table = lite.load_export(source, corrections)
+    return rebuild_table(directory, table) if rebuild else append_table(directory, table)
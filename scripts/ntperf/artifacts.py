@@ -0,0 +1,192 @@
+"""
+Pre-parsed, typed trade artifacts for every CSV in the data directory.
+
+/api/trading-data used to hand the browser raw CSV text, so every page load
+re-parsed NinjaTrader money and timestamp cells in JavaScript. Instead,
+every ``*.csv`` in ``public/data`` is parsed once here (with the stdlib
+backend, no corrections) into a columnar JSON document and stored gzipped
+as ``<name>.json.gz``:
+
+    {
+      "source": "NinjaTrader-sample.csv",
+      "version": "<sha256[:16] of the CSV>",
+      "trades": 525,
+      "time_unit": "s",
+      "columns": {"Entry time": [...], "Instrument": [0, 0, 1, ...], "Profit": [...], ...},
+      "dictionaries": {"Instrument": ["MNQ JUN25", "NQ JUN25"], "Market pos.": ["Long", "Short"]}
+    }
+
+Timestamps are naive local epoch seconds, money and prices are numbers,
+and the repetitive text columns are dictionary-encoded. ``manifest.json``
+lists the artifacts with the content digest of their source, so a rebuild
+only parses CSVs whose contents changed. The manifest is committed with the
+artifacts, so it records nothing machine-specific such as mtimes.
+"""
+import fnmatch
+import gzip
+import hashlib
+import json
+import logging
+import math
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from ntperf.errors import ConversionError, OutputWriteError
+from ntperf.lite import read_table
+from ntperf.money import to_dollars, to_price
+from ntperf.output import atomic_write
+
+logger = logging.getLogger(__name__)
+
+CSV_PATTERN = '*.csv'
+MANIFEST_NAME = 'manifest.json'
+ARTIFACT_SUFFIX = '.json.gz'
+# Text columns stored as indexes into a per-artifact dictionary
+DICTIONARY_COLUMNS = ('Instrument', 'Market pos.')
+
+
+def artifact_file(source: str) -> str:
+    """Artifact name for a CSV: "NinjaTrader-sample.csv" -> "NinjaTrader-sample.json.gz"."""
+    return os.path.splitext(os.path.basename(source))[0] + ARTIFACT_SUFFIX
+
+
+def _clean(value: Any) -> Any:
+    """NaN (blank cells) is not valid JSON; store it as null."""
+    return None if isinstance(value, float) and math.isnan(value) else value
+
+
+def _encode(values: List[Any]) -> Tuple[List[Optional[int]], List[str]]:
+    """Dictionary-encode a text column; blanks become null."""
+    codes: Dict[str, int] = {}
+    encoded = [None if _clean(v) is None else codes.setdefault(v, len(codes)) for v in values]
+    return encoded, list(codes)
+
+
+def source_version(path: str) -> str:
+    """Content digest of a CSV (sha256[:16]), the artifact's "version"."""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+def build_artifact(path: str) -> Dict[str, Any]:
+    """
+    Parse one export into a typed, columnar document.
+
+    Args:
+        path: Path to the CSV export
+
+    Returns:
+        Artifact document
+
+    Raises:
+        ExportReadError: The file cannot be read or parsed
+        MissingColumnError: A required column is absent
+    """
+    table = read_table(path)
+    version = source_version(path)
+
+    instrument, instruments = _encode(table.instrument)
+    position, positions = _encode(table.position)
+    return {
+        "source": os.path.basename(path),
+        "version": version,
+        "trades": len(table),
+        "time_unit": "s",
+        "columns": {
+            'Entry time': table.entry.tolist(),
+            'Exit time': table.exit.tolist(),
+            'Instrument': instrument,
+            'Market pos.': position,
+            'Qty': [_clean(q) for q in table.qty],
+            'Entry price': [to_price(t, s) for t, s in zip(table.entry_price, table.scale)],
+            'Exit price': [to_price(t, s) for t, s in zip(table.exit_price, table.scale)],
+            'Profit': [to_dollars(c) for c in table.profit],
+            'Cum. net profit': [to_dollars(c) for c in table.cum]
+        },
+        "dictionaries": {
+            'Instrument': instruments,
+            'Market pos.': positions
+        }
+    }
+
+
+def read_manifest(directory: str) -> Dict[str, Any]:
+    """
+    Load the artifact manifest of a directory.
+
+    Args:
+        directory: Artifact directory
+
+    Returns:
+        Manifest with an "artifacts" list (empty before the first build)
+    """
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"artifacts": []}
+
+
+def build_artifacts(data_dir: str, out_dir: str, force: bool = False,
+                    pattern: str = CSV_PATTERN) -> Dict[str, Any]:
+    """
+    Parse every CSV in a directory into gzipped artifacts.
+
+    CSVs whose content digest matches the manifest are skipped unless
+    ``force`` is set. Artifacts of CSVs that no longer exist are deleted.
+    A CSV that cannot be parsed is logged and left out.
+
+    Args:
+        data_dir: Directory holding the exports
+        out_dir: Artifact directory (created if missing)
+        force: Rebuild every artifact
+        pattern: Glob matched against file names
+
+    Returns:
+        The new manifest
+
+    Raises:
+        OutputWriteError: An artifact or the manifest cannot be written
+    """
+    previous = {entry["source"]: entry for entry in read_manifest(out_dir)["artifacts"]}
+    sources = sorted(entry.name for entry in os.scandir(data_dir)
+                     if entry.is_file() and fnmatch.fnmatch(entry.name, pattern))
+    artifacts = []
+    try:
+        os.makedirs(out_dir, exist_ok=True)
+        for name in sources:
+            path = os.path.join(data_dir, name)
+            old = previous.get(name)
+            if not force and old and old["version"] == source_version(path) \
+                    and os.path.exists(os.path.join(out_dir, old["file"])):
+                artifacts.append(old)
+                continue
+            try:
+                doc = build_artifact(path)
+            except ConversionError as e:
+                logger.error(f"Skipping {name}: {e}")
+                continue
+            payload = gzip.compress(json.dumps(doc, separators=(',', ':')).encode('utf-8'), mtime=0)
+            atomic_write(os.path.join(out_dir, artifact_file(name)), lambda f: f.write(payload), binary=True)
+            logger.info(f"Parsed {name}: {doc['trades']} trades, {len(payload):,} bytes gzipped")
+            artifacts.append({
+                "source": name,
+                "file": artifact_file(name),
+                "version": doc["version"],
+                "trades": doc["trades"],
+                "size": os.path.getsize(path),
+                "bytes": len(payload)
+            })
+
+        manifest = {"artifacts": artifacts}
+        atomic_write(os.path.join(out_dir, MANIFEST_NAME), lambda f: json.dump(manifest, f, indent=2))
+        kept = {entry["file"] for entry in artifacts}
+        for entry in previous.values():
+            if entry["file"] not in kept:
+                try:
+                    os.unlink(os.path.join(out_dir, entry["file"]))
+                except FileNotFoundError:
+                    pass
+    except OSError as e:
+        raise OutputWriteError(f"Error writing artifacts to {out_dir}: {e}") from e
+    return manifest
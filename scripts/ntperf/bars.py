@@ -0,0 +1,165 @@
+"""
+OHLC equity bars at fixed time resolutions.
+
+The equity curve has one point per trade exit, so its time axis is
+irregular and bursts of trades overplot. This resamples equity into bars of
+1 minute, 5 minutes, 1 hour and one trading session, each with the equity
+before the bar's first trade (open), the highest and lowest equity after
+any of its trades, the equity after its last trade (close) and its number
+of trades. A dashboard zooming in or out picks the resolution whose bars
+fit the view instead of aggregating trades itself.
+
+Only the DEFAULT_RESOLUTIONS (hourly and session bars) go into the
+converted document: on a large export the 1-minute and 5-minute bars are
+most of its size, and every published version and delta would carry them.
+The FINE_RESOLUTIONS are published next to each version as one file per
+resolution (see ntperf.publish) and served by ``/api/perf?bars=1m``; the
+trade archive also builds them for any date range
+(TradeArchive.equity_bars(), ``archive_trades.py bars``).
+
+Trades are bucketed by exit time. Exits are sorted, so every bar is a
+contiguous run of trades and the whole resolution is one ``reduceat`` pass.
+Only bars with at least one trade are listed; between two bars equity is
+flat at the earlier bar's close. Equity is accumulated in exact cents.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ntperf.money import CENTS_PER_DOLLAR
+from ntperf.parsing import SESSION_ROLLOVER_HOUR, parse_timestamps
+from ntperf.schema import TIME_FORMAT
+
+_HOUR = 3_600
+_DAY = 86_400
+
+# Resolution name -> (bar width in seconds, offset of bar starts from midnight)
+RESOLUTIONS: Dict[str, Tuple[int, int]] = {
+    '1m': (60, 0),
+    '5m': (300, 0),
+    '1h': (_HOUR, 0),
+    # Sessions open at the rollover hour of the previous calendar day
+    'session': (_DAY, (SESSION_ROLLOVER_HOUR - 24) * _HOUR),
+}
+# Resolutions included in the ``equity_bars`` section of a conversion
+DEFAULT_RESOLUTIONS = ('1h', 'session')
+# Resolutions published as separate files (keep in sync with src/app/api/perf/route.ts)
+FINE_RESOLUTIONS = tuple(name for name in RESOLUTIONS if name not in DEFAULT_RESOLUTIONS)
+
+
+def resample(times: np.ndarray, equity: np.ndarray, width: int,
+             offset: int = 0, opening: int = 0) -> Dict[str, np.ndarray]:
+    """
+    OHLC bars of a step equity series.
+
+    Args:
+        times: Exit times in epoch seconds, non-decreasing
+        equity: Equity after each exit
+        width: Bar width in seconds
+        offset: Bar starts are ``offset`` seconds from multiples of width
+        opening: Equity before the first exit
+
+    Returns:
+        Dictionary of bar start times, open, high, low, close and trade
+        count, one entry per non-empty bar
+    """
+    bucket = (times - offset) // width
+    starts = np.flatnonzero(np.concatenate(([True], bucket[1:] != bucket[:-1])))
+    close = equity[np.append(starts[1:], len(equity)) - 1]
+    open_ = np.concatenate(([opening], close[:-1])).astype(equity.dtype)
+    return {
+        "start": bucket[starts] * width + offset,
+        "open": open_,
+        "high": np.maximum(np.maximum.reduceat(equity, starts), open_),
+        "low": np.minimum(np.minimum.reduceat(equity, starts), open_),
+        "close": close,
+        "trades": np.diff(np.append(starts, len(equity)))
+    }
+
+
+def bars_document(times: np.ndarray, cents: np.ndarray,
+                  resolutions: Sequence[str] = DEFAULT_RESOLUTIONS,
+                  opening: int = 0) -> Dict[str, Any]:
+    """
+    OHLC bars of trade columns, rendered as the ``equity_bars`` section.
+
+    Args:
+        times: Exit times in epoch seconds
+        cents: Profit per trade in cents
+        resolutions: Keys of RESOLUTIONS to build
+        opening: Equity in cents before the first trade
+
+    Returns:
+        Dictionary keyed by resolution, each with parallel "start", "open",
+        "high", "low", "close" and "trades" lists
+
+    Raises:
+        ValueError: A resolution is unknown
+    """
+    unknown = [name for name in resolutions if name not in RESOLUTIONS]
+    if unknown:
+        raise ValueError(f"Unknown resolution: {', '.join(unknown)} (choose from {', '.join(RESOLUTIONS)})")
+    times = np.asarray(times, dtype=np.int64)
+    order = np.argsort(times, kind='stable')
+    times = times[order]
+    equity = opening + np.cumsum(np.asarray(cents, dtype=np.int64)[order])
+
+    bars = {}
+    for name in resolutions:
+        if not len(times):
+            bars[name] = {key: [] for key in ("start", "open", "high", "low", "close", "trades")}
+            continue
+        width, offset = RESOLUTIONS[name]
+        bar = resample(times, equity, width, offset, opening)
+        bars[name] = {
+            "start": pd.to_datetime(bar["start"], unit='s').strftime(TIME_FORMAT).tolist(),
+            **{key: (bar[key] / CENTS_PER_DOLLAR).tolist() for key in ('open', 'high', 'low', 'close')},
+            "trades": bar["trades"].tolist()
+        }
+    return bars
+
+
+def compute_equity_bars(df: pd.DataFrame,
+                        resolutions: Sequence[str] = DEFAULT_RESOLUTIONS) -> Optional[Dict[str, Any]]:
+    """
+    Resample equity into OHLC bars.
+
+    Args:
+        df: Trades with 'Exit time' and parsed 'Profit' (and, when present,
+            exact 'Profit cents') columns
+        resolutions: Keys of RESOLUTIONS to build (default: hourly and
+            session bars)
+
+    Returns:
+        Dictionary keyed by resolution, each with parallel "start", "open",
+        "high", "low", "close" and "trades" lists, or None if there are no
+        trades
+    """
+    if df.empty or 'Exit time' not in df.columns:
+        return None
+
+    exit_ = parse_timestamps(df['Exit time'])
+    if 'Profit cents' in df.columns:
+        cents = df['Profit cents'].to_numpy(dtype=np.int64)
+    else:
+        cents = (df['Profit'] * CENTS_PER_DOLLAR).round().to_numpy(dtype=np.int64)
+    times = exit_.to_numpy(dtype='datetime64[s]').astype(np.int64)
+    return bars_document(times, cents, resolutions)
+
+
+def trade_bars(trades: List[Dict[str, Any]],
+               resolutions: Sequence[str] = FINE_RESOLUTIONS) -> Dict[str, Any]:
+    """
+    Equity bars of an output document's trades.
+
+    Args:
+        trades: The document's "trades" records, in exit order
+        resolutions: Keys of RESOLUTIONS to build (default: the fine ones)
+
+    Returns:
+        Bars keyed by resolution, as in the ``equity_bars`` section
+    """
+    times = np.array([trade['Exit time'] for trade in trades], dtype='datetime64[s]').astype(np.int64)
+    cents = np.rint(np.array([trade['Profit'] for trade in trades], dtype=float) * CENTS_PER_DOLLAR)
+    return bars_document(times, cents.astype(np.int64), resolutions)
@@ -0,0 +1,321 @@
+"""
+Parallel batch conversion of many exports.
+
+Account exports and historical snapshots are independent, so a batch fans
+them out over a ProcessPoolExecutor with one worker per available core.
+Each worker imports the conversion backend once, converts an export and
+writes its JSON itself, and sends back only a small summary row, so the
+parent never becomes the bottleneck and throughput grows with the core
+count.
+
+Snapshots are often byte-for-byte copies of one another. Sources are hashed
+up front and each distinct export is parsed and converted once; copies
+share the result and get their output written from it. This only skips
+byte-identical files: exports that differ in any byte are parsed in full,
+and nothing is kept between runs. Each output is named after its export;
+exports from different directories that share a name get the start of
+their content digest added, and a copy that would get the same name as
+its original shares the original's output.
+
+Exports are usually overlapping full-history snapshots of the same
+accounts, so the combined summary does not add files together: each
+account is counted once, from the newest export that contains it (by the
+time in its file name, then by source order). A newer export can restate
+an account's history, dropping trades an older one listed, so it wins even
+when its history is shorter.
+"""
+import glob
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from ntperf.errors import ConversionError, OutputWriteError
+from ntperf.output import atomic_write
+from ntperf.pipeline import choose_backend
+from ntperf.profiling import DEFAULT_TOP, profiled
+from ntperf.watch import export_time
+
+logger = logging.getLogger(__name__)
+
+CSV_PATTERN = '*.csv'
+SUMMARY_NAME = 'summary.json'
+# Account key of an export converted without the portfolio section
+ALL_ACCOUNTS = '(all accounts)'
+
+
+def available_cores() -> int:
+    """Cores this process may run on (respects CPU affinity where supported)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def expand_sources(patterns: Iterable[str], pattern: str = CSV_PATTERN) -> List[str]:
+    """
+    Resolve directories and globs to a sorted list of export paths.
+
+    Args:
+        patterns: Directories (every file matching ``pattern``), globs or paths
+        pattern: Glob applied inside directories
+
+    Returns:
+        Distinct export paths in sorted order
+    """
+    found = set()
+    for item in patterns:
+        if os.path.isdir(item):
+            found.update(glob.glob(os.path.join(item, pattern)))
+        else:
+            found.update(path for path in glob.glob(item) if os.path.isfile(path))
+    return sorted(found)
+
+
+def output_file(source: str, output_dir: str, digest: Optional[str] = None) -> str:
+    """
+    JSON path for a source.
+
+    Args:
+        source: Export path
+        output_dir: Output directory
+        digest: Content digest to tell apart exports sharing a name
+
+    Returns:
+        "<output_dir>/<export name>.json", or
+        "<output_dir>/<export name>.<digest[:12]>.json" when a digest is given
+    """
+    stem = os.path.splitext(os.path.basename(source))[0]
+    return os.path.join(output_dir, f"{stem}.{digest[:12]}.json" if digest else f"{stem}.json")
+
+
+def output_files(digests: Dict[str, str], output_dir: str) -> Dict[str, str]:
+    """
+    Unique JSON path for every source.
+
+    Exports are named after their file; a name shared by exports with
+    different contents gets each one's digest added. Byte-identical exports
+    sharing a name map to the same path.
+
+    Args:
+        digests: Source path -> content digest
+        output_dir: Output directory
+
+    Returns:
+        Source path -> JSON path
+    """
+    contents: Dict[str, set] = {}
+    for source, digest in digests.items():
+        contents.setdefault(os.path.basename(source), set()).add(digest)
+    return {source: output_file(source, output_dir,
+                                digest if len(contents[os.path.basename(source)]) > 1 else None)
+            for source, digest in digests.items()}
+
+
+def _digest(path: str) -> str:
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def _warm_up(backend: str) -> None:
+    """Import the conversion backend once per worker."""
+    if backend == 'pandas':
+        import ntperf.api  # noqa: F401
+
+
+def convert_one(source: str, output: str, corrections: str = 'default',
+                analytics: Optional[List[str]] = None, backend: str = 'auto',
+                profile_dir: Optional[str] = None, profile_top: int = DEFAULT_TOP) -> Dict[str, Any]:
+    """
+    Convert one export and write its JSON. Runs in a worker process.
+
+    Args:
+        source: Export to convert
+        output: JSON path to write
+        corrections: Correction profile name
+        analytics: Analytics sections to include (default: all)
+        backend: 'auto', 'lite' or 'pandas'
+        profile_dir: Directory to write a cProfile of this conversion to
+        profile_top: Functions listed in the profile report
+
+    Returns:
+        Summary row with trade count, metrics, per-account trade count and
+        metrics (the whole export as ALL_ACCOUNTS when the
+        portfolio section is not built) and per-stage seconds
+
+    Raises:
+        ConversionError: The export cannot be converted or written
+    """
+    from ntperf.output import write_output
+    from ntperf.pipeline import convert
+
+    with profiled('convert', [source], profile_dir, profile_top):
+        start = time.perf_counter()
+        data = convert(source, corrections=corrections, analytics=analytics, backend=backend)
+        converted = time.perf_counter()
+        write_output(data, output)
+        written = time.perf_counter()
+    accounts = {name: {"trades": account["trades"], "metrics": account["metrics"]}
+                for name, account in (data.get("portfolio") or {}).get("accounts", {}).items()}
+    if not accounts and data["trades"]:
+        accounts[ALL_ACCOUNTS] = {"trades": len(data["trades"]), "metrics": data["metrics"]}
+    return {
+        "source": os.path.basename(source),
+        "output": output,
+        "trades": len(data["trades"]),
+        "metrics": data["metrics"],
+        "accounts": accounts,
+        "seconds": {
+            "convert": converted - start,
+            "write": written - converted,
+            "total": written - start
+        }
+    }
+
+
+def combine(rows: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Totals across accounts, counting each account once.
+
+    Each account is taken from the newest export that contains it, since
+    older snapshots repeat or restate the same history.
+
+    Args:
+        rows: Summary rows from convert_one(), in source order
+
+    Returns:
+        Combined trade count, P&L, trade-weighted win rate, worst drawdown,
+        the export each account was taken from and worker seconds
+    """
+    latest: Dict[str, Dict[str, Any]] = {}
+    sources: Dict[str, str] = {}
+    order = sorted(range(len(rows)), key=lambda i: (export_time(rows[i]["source"]) or datetime.min, i))
+    for row in (rows[i] for i in order):
+        for name, account in row["accounts"].items():
+            latest[name] = account
+            sources[name] = row["source"]
+    accounts = list(latest.values())
+    trades = sum(account["trades"] for account in accounts)
+    wins = sum(account["metrics"]["win_rate"] / 100 * account["trades"] for account in accounts)
+    return {
+        "files": len(rows),
+        "accounts": dict(sorted(sources.items())),
+        "trades": trades,
+        "pnl": sum(account["metrics"]["pnl"] for account in accounts),
+        "win_rate": wins / trades * 100 if trades else 0.0,
+        "max_dd": max((account["metrics"]["max_dd"] for account in accounts), default=0.0),
+        "worker_seconds": sum(row["seconds"]["total"] for row in rows if not row.get("duplicate_of"))
+    }
+
+
+def run_batch(sources: Sequence[str], output_dir: str, workers: Optional[int] = None,
+              corrections: str = 'default', analytics: Optional[List[str]] = None,
+              backend: str = 'auto', profile_dir: Optional[str] = None,
+              profile_top: int = DEFAULT_TOP) -> Dict[str, Any]:
+    """
+    Convert many exports in parallel and write a combined summary.
+
+    Args:
+        sources: Export paths
+        output_dir: Directory for one JSON per export plus summary.json
+        workers: Worker processes (default: available cores, at most one
+            per distinct export)
+        corrections: Correction profile name
+        analytics: Analytics sections to include (default: all)
+        backend: 'auto', 'lite' or 'pandas'
+        profile_dir: Directory to write a cProfile of each conversion to
+        profile_top: Functions listed in each profile report
+
+    Returns:
+        Summary with one row per export, the failures, combined totals,
+        worker count and wall time
+
+    Raises:
+        OutputWriteError: The output directory or summary cannot be written
+    """
+    start = time.perf_counter()
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+    except OSError as e:
+        raise OutputWriteError(f"Error creating {output_dir}: {e}") from e
+
+    # Identical exports are converted once
+    digests: Dict[str, str] = {}
+    failed: List[Dict[str, str]] = []
+    for source in sources:
+        try:
+            digests[source] = _digest(source)
+        except OSError as e:
+            failed.append({"source": source, "error": str(e)})
+    outputs = output_files(digests, output_dir)
+    first_by_digest: Dict[str, str] = {}
+    copies: Dict[str, str] = {}
+    for source, digest in digests.items():
+        if digest in first_by_digest:
+            copies[source] = first_by_digest[digest]
+        else:
+            first_by_digest[digest] = source
+    unique = list(first_by_digest.values())
+
+    workers = max(1, min(workers or available_cores(), len(unique) or 1))
+    # Workers import pandas up front only if some export needs it
+    backends = {choose_backend(source, analytics) if backend == 'auto' else backend for source in unique}
+    results: Dict[str, Dict[str, Any]] = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_warm_up,
+                             initargs=('pandas' if 'pandas' in backends else 'lite',)) as pool:
+        futures = {
+            pool.submit(convert_one, source, outputs[source],
+                        corrections, analytics, backend, profile_dir, profile_top): source
+            for source in unique
+        }
+        for future in as_completed(futures):
+            source = futures[future]
+            try:
+                row = future.result()
+            except (ConversionError, ValueError) as e:
+                logger.error(f"{source}: {e}")
+                failed.append({"source": source, "error": str(e)})
+                continue
+            except Exception as e:
+                # A bug or a dead worker fails this export, not the whole batch
+                logger.exception(f"{source}: unexpected {type(e).__name__}")
+                failed.append({"source": source, "error": f"{type(e).__name__}: {e}"})
+                continue
+            results[source] = row
+            logger.info(f"{row['source']}: {row['trades']} trades in {row['seconds']['total']:.2f}s")
+
+    for source, original in copies.items():
+        if original not in results:
+            failed.append({"source": source, "error": f"copy of failed {original}"})
+            continue
+        output = outputs[source]
+        if output != results[original]["output"]:
+            try:
+                shutil.copyfile(results[original]["output"], output)
+            except OSError as e:
+                failed.append({"source": source, "error": str(e)})
+                continue
+        results[source] = dict(results[original], source=os.path.basename(source), output=output,
+                               duplicate_of=original)
+
+    rows = [results[source] for source in sources if source in results]
+    summary = {
+        "files": rows,
+        "failed": failed,
+        "combined": combine(rows),
+        "workers": workers,
+        "wall_seconds": time.perf_counter() - start
+    }
+    try:
+        atomic_write(os.path.join(output_dir, SUMMARY_NAME), lambda f: json.dump(summary, f, indent=2))
+    except OSError as e:
+        raise OutputWriteError(f"Error writing {SUMMARY_NAME}: {e}") from e
+    return summary
@@ -0,0 +1,199 @@
+"""
+Removal of misreported trades before metrics are computed.
+
+Some exports contain trades that were misreported by the platform. Each
+correction profile is a function that receives a ``day_trades`` lookup,
+returning the (label, profit) pairs of the trades that exited on a given
+mm/dd/YYYY date in export order, and returns the labels to drop. The rules
+are therefore shared by the pandas and stdlib backends; ties in profit are
+broken by export order in both.
+"""
+import logging
+from typing import Any, Callable, Dict, List, Tuple, TYPE_CHECKING
+
+from ntperf.money import CENTS_PER_DOLLAR
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DayTrades = Callable[[str], List[Tuple[Any, float]]]
+
+
+def _losers(trades: List[Tuple[Any, float]]) -> List[Tuple[Any, float]]:
+    """Losing trades, biggest loss first."""
+    return sorted((t for t in trades if t[1] < 0), key=lambda t: t[1])
+
+
+def _winners(trades: List[Tuple[Any, float]]) -> List[Tuple[Any, float]]:
+    """Winning trades, biggest win first."""
+    return sorted((t for t in trades if t[1] > 0), key=lambda t: -t[1])
+
+
+def _profits(trades: List[Tuple[Any, float]]) -> List[float]:
+    return [profit for _, profit in trades]
+
+
+def default_corrections(day_trades: DayTrades) -> List:
+    """
+    Corrections applied by nt2json.py.
+
+    All trades on 5/12 were misreported due to a system issue, so the two
+    largest losses that day are dropped. Additionally, the largest losing
+    trade on 5/13 was also erroneously reported.
+
+    Args:
+        day_trades: Lookup of (label, profit) pairs by exit date
+
+    Returns:
+        Labels of trades to remove
+    """
+    indices_to_remove = []
+    may_12_trades = day_trades('05/12/2025')
+    if not may_12_trades:
+        return indices_to_remove
+
+    losing_trades = _losers(may_12_trades)
+    if len(losing_trades) >= 2:
+        indices_to_remove.extend(label for label, _ in losing_trades[:2])
+        logger.info(f"Removing two largest losing trades on 5/12/2025: {_profits(losing_trades[:2])}")
+
+    losing_trades_13 = _losers(day_trades('05/13/2025'))
+    if losing_trades_13:
+        indices_to_remove.append(losing_trades_13[0][0])
+        logger.info(f"Removing largest losing trade on 5/13/2025: {losing_trades_13[0][1]}")
+
+    if indices_to_remove:
+        logger.info(f"Removed {len(indices_to_remove)} losing trades as requested")
+    return indices_to_remove
+
+
+def extended_corrections(day_trades: DayTrades) -> List:
+    """
+    Corrections applied by nt2json2.py.
+
+    Removes every trade on 5/12 and the largest loss on 5/13, keeps only the
+    two largest losers on 5/21, and drops selected outliers on 5/22 and 5/23.
+
+    Args:
+        day_trades: Lookup of (label, profit) pairs by exit date
+
+    Returns:
+        Labels of trades to remove
+    """
+    indices_to_remove = []
+
+    # Remove all trades on 5/12/2025 due to misreporting
+    may_12_trades = day_trades('05/12/2025')
+    if may_12_trades:
+        indices_to_remove.extend(label for label, _ in may_12_trades)
+        logger.info(f"Removing all trades on 5/12/2025 due to misreporting: {len(may_12_trades)} trades")
+
+    # If there are losing trades on 5/13, remove the single largest loss
+    losing_trades_13 = _losers(day_trades('05/13/2025'))
+    if losing_trades_13:
+        indices_to_remove.append(losing_trades_13[0][0])
+        logger.info(f"Removing largest losing trade on 5/13/2025: {losing_trades_13[0][1]}")
+
+    # Filter trades on 5/21/2025 - keep only the 2 largest losers, remove all others
+    may_21_trades = day_trades('05/21/2025')
+    if may_21_trades:
+        losing_trades_21 = _losers(may_21_trades)
+        if len(losing_trades_21) >= 2:
+            trades_to_keep = {label for label, _ in losing_trades_21[:2]}
+            trades_to_remove = [label for label, _ in may_21_trades if label not in trades_to_keep]
+            indices_to_remove.extend(trades_to_remove)
+            logger.info(f"Keeping only 2 largest losing trades on 5/21/2025: {_profits(losing_trades_21[:2])}")
+            logger.info(f"Removing {len(trades_to_remove)} other trades on 5/21/2025")
+        else:
+            # If less than 2 losing trades, remove all trades from 5/21
+            indices_to_remove.extend(label for label, _ in may_21_trades)
+            logger.info(f"Removing all {len(may_21_trades)} trades on 5/21/2025 (insufficient losing trades)")
+
+    # Filter trades on 5/22/2025 - remove 2 largest winners
+    winning_trades_22 = _winners(day_trades('05/22/2025'))
+    if len(winning_trades_22) >= 2:
+        indices_to_remove.extend(label for label, _ in winning_trades_22[:2])
+        logger.info(f"Removing 2 largest winning trades on 5/22/2025: {_profits(winning_trades_22[:2])}")
+    elif len(winning_trades_22) == 1:
+        indices_to_remove.append(winning_trades_22[0][0])
+        logger.info(f"Removing 1 winning trade on 5/22/2025: {winning_trades_22[0][1]}")
+
+    # Filter trades on 5/23/2025 - remove largest winner and 2 largest losers
+    may_23_trades = day_trades('05/23/2025')
+    winning_trades_23 = _winners(may_23_trades)
+    if winning_trades_23:
+        indices_to_remove.append(winning_trades_23[0][0])
+        logger.info(f"Removing largest winning trade on 5/23/2025: {winning_trades_23[0][1]}")
+
+    losing_trades_23 = _losers(may_23_trades)
+    if len(losing_trades_23) >= 2:
+        indices_to_remove.extend(label for label, _ in losing_trades_23[:2])
+        logger.info(f"Removing 2 largest losing trades on 5/23/2025: {_profits(losing_trades_23[:2])}")
+    elif len(losing_trades_23) == 1:
+        indices_to_remove.append(losing_trades_23[0][0])
+        logger.info(f"Removing 1 losing trade on 5/23/2025: {losing_trades_23[0][1]}")
+
+    if indices_to_remove:
+        logger.info(f"Removed {len(indices_to_remove)} trades total as requested")
+    return indices_to_remove
+
+
+CORRECTIONS: Dict[str, Callable[[DayTrades], List]] = {
+    'default': default_corrections,
+    'extended': extended_corrections,
+}
+
+
+def corrections_for(profile: str) -> Callable[[DayTrades], List]:
+    """
+    Look up a correction profile.
+
+    Args:
+        profile: Key into CORRECTIONS
+
+    Returns:
+        The profile's correction function
+    """
+    if profile not in CORRECTIONS:
+        raise ValueError(f"Unknown correction profile: {profile!r}")
+    return CORRECTIONS[profile]
+
+
+def apply_corrections(df: 'pd.DataFrame', profile: str = 'default') -> 'pd.DataFrame':
+    """
+    Drop misreported trades from a parsed DataFrame.
+
+    When trades are removed the export is re-sorted by exit time (ties keep
+    export order) and 'Cum. net profit' is rebuilt from the remaining
+    profits, in exact cents when the frame has them.
+
+    Args:
+        df: Parsed export
+        profile: Key into CORRECTIONS, or 'none' to keep every trade
+
+    Returns:
+        Corrected DataFrame (the input is not modified)
+    """
+    if profile == 'none':
+        return df
+    correct = corrections_for(profile)
+
+    dates = df['Exit time'].dt.strftime('%m/%d/%Y')
+
+    def day_trades(date: str) -> List[Tuple[Any, float]]:
+        day = df.loc[dates == date, 'Profit']
+        return list(zip(day.index, day.tolist()))
+
+    indices_to_remove = correct(day_trades)
+    if not indices_to_remove:
+        return df
+
+    df = df.drop(indices_to_remove).sort_values('Exit time', kind='stable')
+    if 'Profit cents' in df.columns:
+        df['Cum. net profit cents'] = df['Profit cents'].cumsum()
+        df['Cum. net profit'] = df['Cum. net profit cents'] / CENTS_PER_DOLLAR
+    else:
+        df['Cum. net profit'] = df['Profit'].cumsum()
+    return df
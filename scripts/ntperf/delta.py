@@ -0,0 +1,179 @@
+"""
+Delta payloads between consecutive published versions.
+
+A new export normally extends the previous one: the trade list and equity
+curve gain a few entries at the end and everything before them is
+unchanged. A delta records only those appended entries, the new headline
+metrics and a patch of the other sections, so a client holding the
+previous version can catch up with a few hundred bytes instead of the
+full history.
+
+Most analytics sections grow with the history the same way (per-trade
+series, per-account curves, daily bars), so sections are not resent
+whole: the patch walks into them and lists a few operations,
+
+    ["splice", path, start, values]   truncate the list at path to
+                                      ``start`` entries, then append values
+    ["set", path, value]              replace the value at path
+    ["delete", path]                  remove the key at path
+
+where ``path`` is the list of keys from the top of the document. A list
+sharing a prefix with its old value is spliced after the prefix, so a
+series that gained entries (or whose last period changed) costs only its
+tail; a list changed from the start is set whole.
+
+When the new document does not extend the old one (a correction rewrote
+history), no delta is produced and clients fall back to the snapshot.
+"""
+import copy
+from typing import Any, Dict, List, Optional
+
+# Sections carried by appending rather than replacing
+APPEND_SECTIONS = ('trades', 'equity_curve')
+# Sections every delta carries outside its patch
+CORE_SECTIONS = APPEND_SECTIONS + ('metrics',)
+
+
+def _extends(old: list, new: list) -> bool:
+    return len(new) >= len(old) and new[:len(old)] == old
+
+
+def _common_prefix(old: list, new: list) -> int:
+    n = min(len(old), len(new))
+    if old[:n] == new[:n]:
+        return n
+    lo, hi = 0, n
+    # Longest equal prefix by bisection; list slices compare in C
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if old[:mid] == new[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def diff(old: Any, new: Any, path: Optional[List[str]] = None) -> List[list]:
+    """
+    Patch operations turning ``old`` into ``new``.
+
+    Args:
+        old: Previous value
+        new: New value
+        path: Keys leading to the values from the top of the document
+
+    Returns:
+        Operations in the form described in the module docstring, empty
+        when the values are equal
+    """
+    path = path or []
+    if old == new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = [["delete", path + [key]] for key in old if key not in new]
+        for key, value in new.items():
+            ops.extend(diff(old[key], value, path + [key]) if key in old else [["set", path + [key], value]])
+        return ops
+    if isinstance(old, list) and isinstance(new, list):
+        start = _common_prefix(old, new)
+        if start:
+            return [["splice", path, start, new[start:]]]
+    return [["set", path, new]]
+
+
+def _parent(doc: Dict[str, Any], path: List[str]) -> Any:
+    for key in path[:-1]:
+        doc = doc[key]
+    return doc
+
+
+def apply_patch(doc: Dict[str, Any], ops: List[list]) -> None:
+    """
+    Apply patch operations from diff() to a document, in place.
+
+    Args:
+        doc: Document the patch was computed from
+        ops: Patch operations
+    """
+    for op in ops:
+        kind, path = op[0], op[1]
+        if kind == "splice":
+            target = _parent(doc, path)[path[-1]] if path else doc
+            del target[op[2]:]
+            target.extend(copy.deepcopy(op[3]))
+        elif kind == "set":
+            _parent(doc, path)[path[-1]] = copy.deepcopy(op[2])
+        elif kind == "delete":
+            _parent(doc, path).pop(path[-1], None)
+        else:
+            raise ValueError(f"Unknown patch operation: {kind!r}")
+
+
+def make_delta(old: Dict[str, Any], new: Dict[str, Any], from_version: str,
+               to_version: str) -> Optional[Dict[str, Any]]:
+    """
+    Describe ``new`` as an extension of ``old``.
+
+    Args:
+        old: Previously published document
+        new: Newly published document
+        from_version: Version id of ``old``
+        to_version: Version id of ``new``
+
+    Returns:
+        Delta document, or None if ``new`` does not extend ``old``
+    """
+    old_trades, new_trades = old.get("trades", []), new.get("trades", [])
+    old_curve, new_curve = old.get("equity_curve", {}), new.get("equity_curve", {})
+    old_dates, new_dates = old_curve.get("dates", []), new_curve.get("dates", [])
+    old_values, new_values = old_curve.get("values", []), new_curve.get("values", [])
+    if not (_extends(old_trades, new_trades) and _extends(old_dates, new_dates)
+            and _extends(old_values, new_values)):
+        return None
+
+    return {
+        "from": from_version,
+        "to": to_version,
+        "base": {"trades": len(old_trades), "equity_points": len(old_dates)},
+        "trades": new_trades[len(old_trades):],
+        "equity_curve": {
+            "dates": new_dates[len(old_dates):],
+            "values": new_values[len(old_values):]
+        },
+        "metrics": new.get("metrics"),
+        "patch": diff({key: value for key, value in old.items() if key not in CORE_SECTIONS},
+                      {key: value for key, value in new.items() if key not in CORE_SECTIONS})
+    }
+
+
+def apply_delta(doc: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Apply a delta to the document it was computed from.
+
+    Args:
+        doc: Document at version ``delta["from"]``
+        delta: Delta produced by make_delta()
+
+    Returns:
+        A new document equal to version ``delta["to"]``
+
+    Raises:
+        ValueError: ``doc`` is not the delta's base
+    """
+    base = delta["base"]
+    if len(doc.get("trades", [])) != base["trades"] or \
+            len(doc.get("equity_curve", {}).get("dates", [])) != base["equity_points"]:
+        raise ValueError(f"Delta {delta['from']} -> {delta['to']} does not apply to this document")
+
+    out = copy.deepcopy(doc)
+    out.setdefault("trades", []).extend(delta["trades"])
+    curve = out.setdefault("equity_curve", {"dates": [], "values": []})
+    curve["dates"].extend(delta["equity_curve"]["dates"])
+    curve["values"].extend(delta["equity_curve"]["values"])
+    out["metrics"] = delta["metrics"]
+    apply_patch(out, delta.get("patch", []))
+    # Deltas written before patches replaced changed sections whole
+    out.update(copy.deepcopy(delta.get("replace", {})))
+    for key in delta.get("removed", []):
+        out.pop(key, None)
+    return out
@@ -0,0 +1,156 @@
+"""
+MAE/MFE/ETD trade-efficiency analytics.
+
+NinjaTrader reports, per trade, the maximum adverse excursion (MAE), the
+maximum favorable excursion (MFE) and the end trade drawdown (ETD = MFE minus
+the realized profit), all in currency. From these we derive:
+
+- entry efficiency:  MFE / (MFE + MAE)
+- exit efficiency:   (Profit + MAE) / (MFE + MAE)
+- MFE capture ratio: Profit / MFE
+- ETD give-back:     ETD / MFE
+
+Everything is returned as pre-binned histograms plus a downsampled scatter
+set so the dashboard never needs the raw rows.
+"""
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+HISTOGRAM_BINS = 20
+SCATTER_POINTS = 500
+
+
+def histogram(values: np.ndarray, edges: np.ndarray) -> Dict[str, Any]:
+    """
+    Bin values into a JSON-ready histogram.
+
+    Args:
+        values: Values to bin (NaNs are ignored)
+        edges: Monotonic bin edges
+
+    Returns:
+        Dictionary with bin edges and counts
+    """
+    values = values[~np.isnan(values)]
+    counts, _ = np.histogram(values, bins=edges)
+    return {
+        "edges": [round(float(x), 4) for x in edges],
+        "counts": counts.tolist()
+    }
+
+
+def downsample_indices(n: int, max_points: int = SCATTER_POINTS) -> np.ndarray:
+    """
+    Pick evenly spaced row indices so at most max_points rows are kept.
+
+    Args:
+        n: Number of rows
+        max_points: Upper bound on the number of indices returned
+
+    Returns:
+        Sorted array of unique row indices
+    """
+    if n <= max_points:
+        return np.arange(n)
+    return np.unique(np.linspace(0, n - 1, max_points).round().astype(np.int64))
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Element-wise ratio that yields NaN where the denominator is not positive."""
+    out = np.full(numerator.shape, np.nan)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    return out
+
+
+def _nanmean(values: np.ndarray) -> Optional[float]:
+    values = values[~np.isnan(values)]
+    return float(values.mean()) if len(values) else None
+
+
+def _nanmedian(values: np.ndarray) -> Optional[float]:
+    values = values[~np.isnan(values)]
+    return float(np.median(values)) if len(values) else None
+
+
+def compute_efficiency(df: pd.DataFrame, bins: int = HISTOGRAM_BINS,
+                       max_points: int = SCATTER_POINTS) -> Optional[Dict[str, Any]]:
+    """
+    Compute MAE/MFE/ETD efficiency statistics for the trades in df.
+
+    Args:
+        df: Trades with parsed 'Profit', 'MAE', 'MFE' and optionally 'ETD'
+            and 'Bars' columns, in exit order
+        bins: Number of bins for the excursion histograms
+        max_points: Maximum number of rows in the scatter dataset
+
+    Returns:
+        Dictionary with summary, histograms and scatter sections, or None
+        if the export has no excursion columns
+    """
+    if not {'MAE', 'MFE'}.issubset(df.columns) or df.empty:
+        return None
+
+    profit = df['Profit'].to_numpy(dtype='float64')
+    mae = np.abs(df['MAE'].to_numpy(dtype='float64'))
+    mfe = np.abs(df['MFE'].to_numpy(dtype='float64'))
+    if 'ETD' in df.columns:
+        etd = np.abs(df['ETD'].to_numpy(dtype='float64'))
+    else:
+        etd = np.maximum(mfe - profit, 0.0)
+    if 'Bars' in df.columns:
+        bars = pd.to_numeric(df['Bars'], errors='coerce').fillna(0).to_numpy(dtype='int64')
+    else:
+        bars = np.zeros(len(df), dtype='int64')
+
+    excursion_range = mfe + mae
+    entry_eff = _ratio(mfe, excursion_range)
+    exit_eff = _ratio(profit + mae, excursion_range)
+    capture = _ratio(profit, mfe)
+    give_back = _ratio(etd, mfe)
+
+    winners = profit > 0
+    losers = profit < 0
+
+    unit_edges = np.linspace(0.0, 1.0, 11)
+    # Losers can give back many multiples of their MFE; clip into the
+    # outermost bins so the histogram keeps a fixed, readable range.
+    capture_edges = np.linspace(-1.0, 1.0, 21)
+    mae_edges = np.histogram_bin_edges(mae, bins=bins)
+    etd_edges = np.histogram_bin_edges(etd, bins=bins)
+
+    idx = downsample_indices(len(df), max_points)
+
+    return {
+        "summary": {
+            "entry_efficiency": _nanmean(entry_eff),
+            "exit_efficiency": _nanmean(exit_eff),
+            # Aggregate ratios; per-trade means are dominated by losers
+            # whose MFE is a tick or two.
+            "mfe_capture": float(profit.sum() / mfe.sum()) if mfe.sum() > 0 else None,
+            "etd_give_back": float(etd.sum() / mfe.sum()) if mfe.sum() > 0 else None,
+            "median_mfe_capture": _nanmedian(capture),
+            "avg_mae_winners": float(mae[winners].mean()) if winners.any() else None,
+            "avg_mae_losers": float(mae[losers].mean()) if losers.any() else None,
+            "avg_mfe": float(mfe.mean()),
+            "avg_etd": float(etd.mean()),
+            "total_etd": float(etd.sum()),
+            "avg_bars": float(bars.mean())
+        },
+        "histograms": {
+            "entry_efficiency": histogram(entry_eff, unit_edges),
+            "exit_efficiency": histogram(np.clip(exit_eff, 0.0, 1.0), unit_edges),
+            "mfe_capture": histogram(np.clip(capture, -1.0, 1.0), capture_edges),
+            "mae_winners": histogram(mae[winners], mae_edges),
+            "mae_losers": histogram(mae[losers], mae_edges),
+            "etd": histogram(etd, etd_edges),
+            "etd_give_back": histogram(np.clip(give_back, 0.0, 2.0), np.linspace(0.0, 2.0, 21))
+        },
+        "scatter": {
+            "mae": mae[idx].round(2).tolist(),
+            "mfe": mfe[idx].round(2).tolist(),
+            "profit": profit[idx].round(2).tolist(),
+            "bars": bars[idx].tolist()
+        }
+    }
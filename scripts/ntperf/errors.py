@@ -0,0 +1,31 @@
+"""
+Exceptions raised by the ntperf library.
+
+Library code raises these instead of printing and calling ``sys.exit`` so a
+long-running process can report a failed conversion and carry on. The
+command-line scripts catch ConversionError and turn it into exit status 1.
+"""
+
+
+class ConversionError(Exception):
+    """Base class for all errors raised while converting an export."""
+
+
+class ExportReadError(ConversionError):
+    """The export could not be read or parsed as CSV."""
+
+
+class MissingColumnError(ConversionError):
+    """A column required by the pipeline is absent from the export."""
+
+
+class OutputWriteError(ConversionError):
+    """An output artifact could not be written."""
+
+
+class ValidationError(ConversionError):
+    """An output document is malformed or internally inconsistent."""
+
+
+class HistoryMismatchError(ConversionError):
+    """An export restates trade history already stored in an archive."""
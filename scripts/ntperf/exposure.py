@@ -0,0 +1,121 @@
+"""
+Concurrent-exposure timeline via a sweep line over entry/exit events.
+
+Each trade contributes an open event at its entry time and a close event at
+its exit time. Sorting the 2n events once (O(n log n)) and taking cumulative
+sums gives the number of contracts and positions open at every instant.
+At equal timestamps closes are processed before opens, so a flat-and-reverse
+at the same second is not counted as double exposure.
+"""
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from ntperf.parsing import parse_timestamps
+from ntperf.schema import TIME_FORMAT
+
+
+def _sweep(times: np.ndarray, kind: np.ndarray, groups: np.ndarray,
+           deltas: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Sort events and accumulate deltas independently for each group.
+
+    Because every group's deltas sum to zero, a single cumulative sum over
+    events sorted by (group, time, kind) is already the per-group running
+    total.
+
+    Args:
+        times: Event times in epoch seconds
+        kind: 0 for close events, 1 for open events
+        groups: Group code per event
+        deltas: Matrix of per-event deltas, one row per tracked quantity
+
+    Returns:
+        Dictionary with sorted times and groups, the running totals and the
+        seconds until the next event of the same group
+    """
+    order = np.lexsort((kind, times, groups))
+    times, groups = times[order], groups[order]
+    running = np.cumsum(deltas[:, order], axis=1)
+    gap = np.zeros(len(times), dtype=np.int64)
+    gap[:-1] = np.where(groups[1:] == groups[:-1], times[1:] - times[:-1], 0)
+    return {"times": times, "groups": groups, "running": running, "gap": gap}
+
+
+def compute_exposure(df: pd.DataFrame) -> Optional[Dict[str, Any]]:
+    """
+    Build the concurrent-exposure step series and time in market.
+
+    Args:
+        df: Trades with 'Entry time', 'Exit time', 'Instrument', 'Market pos.'
+            and 'Qty' columns
+
+    Returns:
+        Dictionary with the step-function series, peak exposure and time in
+        market per instrument, or None if the columns are missing
+    """
+    required = {'Entry time', 'Exit time', 'Instrument', 'Market pos.', 'Qty'}
+    if not required.issubset(df.columns) or df.empty:
+        return None
+
+    entry = parse_timestamps(df['Entry time']).to_numpy(dtype='datetime64[s]').astype(np.int64)
+    exit_ = parse_timestamps(df['Exit time']).to_numpy(dtype='datetime64[s]').astype(np.int64)
+    qty = pd.to_numeric(df['Qty'], errors='coerce').fillna(0).to_numpy(dtype=np.int64)
+    direction = np.where(df['Market pos.'].astype(str).str.lower().str.startswith('short'), -1, 1)
+    codes, instruments = pd.factorize(df['Instrument'].astype(str))
+
+    n = len(df)
+    times = np.concatenate((entry, exit_))
+    # Closes sort before opens at the same second
+    kind = np.repeat(np.array([1, 0], dtype=np.int8), n)
+    sign = np.where(kind == 1, 1, -1)
+    gross_delta = sign * np.tile(qty, 2)
+    deltas = np.vstack((gross_delta, gross_delta * np.tile(direction, 2), sign))
+
+    total = _sweep(times, kind, np.zeros(2 * n, dtype=np.int64), deltas)
+    gross, net, positions = total["running"]
+    in_market = float(total["gap"][positions > 0].sum())
+
+    by_instrument = _sweep(times, kind, np.tile(codes, 2), deltas)
+    inst_gross, _, inst_positions = by_instrument["running"]
+    inst_seconds = np.bincount(by_instrument["groups"],
+                               weights=np.where(inst_positions > 0, by_instrument["gap"], 0),
+                               minlength=len(instruments))
+    inst_peak = np.zeros(len(instruments), dtype=np.int64)
+    np.maximum.at(inst_peak, by_instrument["groups"], inst_gross)
+
+    # Collapse simultaneous events to the state after the last one
+    step_times = total["times"]
+    last = np.append(step_times[1:] != step_times[:-1], True)
+    step_times, gross, net, positions = step_times[last], gross[last], net[last], positions[last]
+
+    peak = int(np.argmax(gross))
+    span = float(step_times[-1] - step_times[0])
+
+    return {
+        "series": {
+            "times": pd.to_datetime(step_times, unit='s').strftime(TIME_FORMAT).tolist(),
+            "gross_contracts": gross.tolist(),
+            "net_contracts": net.tolist(),
+            "open_positions": positions.tolist()
+        },
+        "peak": {
+            "gross_contracts": int(gross[peak]),
+            "time": pd.Timestamp(int(step_times[peak]), unit='s').strftime(TIME_FORMAT),
+            "net_long": int(max(net.max(), 0)),
+            "net_short": int(min(net.min(), 0)),
+            "open_positions": int(positions.max())
+        },
+        "time_in_market": {
+            "seconds": in_market,
+            "fraction": in_market / span if span > 0 else 0.0,
+            "by_instrument": {
+                str(name): {
+                    "seconds": float(inst_seconds[i]),
+                    "peak_contracts": int(inst_peak[i])
+                }
+                for i, name in enumerate(instruments)
+            }
+        }
+    }
@@ -0,0 +1,339 @@
+"""
+Fast-start stdlib backend for small exports.
+
+Importing pandas takes far longer than parsing a daily export of a few
+hundred trades, so this backend reads the CSV with the ``csv`` module into
+parallel ``array`` columns and rebuilds the core output document (equity
+curve, metrics, trades) in plain Python. It produces the same document as
+ntperf.api for those sections; analytics sections need NumPy and are only
+built by the pandas backend.
+
+Money is held and summed as exact int64 cents and prices as int64 ticks
+(see ntperf.money); the remaining floating-point reductions mirror NumPy's
+pairwise sums for mean and variance, so the metrics match the pandas
+backend bit for bit.
+"""
+import csv
+import math
+import sys
+from array import array
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from ntperf.corrections import corrections_for
+from ntperf.errors import ExportReadError, MissingColumnError
+from ntperf.metrics import NOTIONAL, Metrics, summarize
+from ntperf.money import (CENTS_PER_DOLLAR, DEFAULT_TICKS_PER_POINT, parse_cents, ticks_per_point,
+                          to_dollars, to_price, to_ticks)
+from ntperf.reconcile import reconcile_rows, unavailable
+from ntperf.schema import REQUIRED_COLUMNS, TIME_FORMAT
+from ntperf.spans import span
+from ntperf.tradefile import EPOCH as _EPOCH, parse_timestamp
+
+_DAY = 86_400
+
+_COLUMNS = ('row', 'entry', 'exit', 'instrument', 'position', 'qty',
+            'scale', 'entry_price', 'exit_price', 'profit', 'cum')
+
+
+class TradeTable:
+    """
+    Column-oriented trade table backed by ``array`` and interned strings.
+
+    Timestamps are naive local times stored as int64 seconds since
+    1970-01-01, money as int64 cents and prices as int64 ticks, with
+    ``scale`` ticks per point for each trade. ``row`` is each trade's
+    position in the export; ``reconciliation`` is set by load_export().
+    """
+    __slots__ = _COLUMNS + ('reconciliation',)
+
+    def __init__(self):
+        self.row = array('q')
+        self.entry = array('q')
+        self.exit = array('q')
+        self.instrument: List[Any] = []
+        self.position: List[Any] = []
+        self.qty: List[Any] = []
+        self.scale = array('q')
+        self.entry_price = array('q')
+        self.exit_price = array('q')
+        self.profit = array('q')
+        self.cum = array('q')
+        self.reconciliation: Optional[Dict[str, Any]] = None
+
+    def __len__(self) -> int:
+        return len(self.profit)
+
+    def take(self, rows: List[int]) -> 'TradeTable':
+        """Return a new table containing the given rows in the given order."""
+        out = TradeTable()
+        for name in _COLUMNS:
+            column = getattr(self, name)
+            picked = [column[i] for i in rows]
+            setattr(out, name, array(column.typecode, picked) if isinstance(column, array) else picked)
+        return out
+
+
+def _prices(instrument: Any, entry: float, exit_: float) -> Tuple[int, int, int]:
+    """Ticks per point and tick counts of a trade's prices.
+
+    Averaged fills can fall between ticks; such trades are counted in the
+    finest scale instead so the prices round-trip exactly.
+    """
+    scale = ticks_per_point(instrument)
+    entry_ticks, exit_ticks = to_ticks(entry, scale), to_ticks(exit_, scale)
+    if to_price(entry_ticks, scale) != entry or to_price(exit_ticks, scale) != exit_:
+        scale = DEFAULT_TICKS_PER_POINT
+        entry_ticks, exit_ticks = to_ticks(entry, scale), to_ticks(exit_, scale)
+    return scale, entry_ticks, exit_ticks
+
+
+def format_timestamp(seconds: int) -> str:
+    return (_EPOCH + timedelta(seconds=seconds)).strftime(TIME_FORMAT)
+
+
+def _number(text: str) -> Any:
+    """Parse a numeric cell the way pandas infers it: int, else float."""
+    try:
+        return int(text)
+    except ValueError:
+        return float(text) if text.strip() else math.nan
+
+
+def _text(text: str) -> Any:
+    """Intern a string cell; blanks become NaN as in pandas."""
+    return sys.intern(text) if text else math.nan
+
+
+def read_table(path: str) -> TradeTable:
+    """
+    Read a NinjaTrader Grid export into a TradeTable.
+
+    Args:
+        path: Path to the CSV export
+
+    Returns:
+        TradeTable in export order
+
+    Raises:
+        ExportReadError: The file cannot be read or a cell cannot be parsed
+        MissingColumnError: A required column is absent
+    """
+    try:
+        with open(path, newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            missing = [col for col in REQUIRED_COLUMNS if col not in header]
+            if missing:
+                raise MissingColumnError(f"Missing required column(s): {', '.join(missing)}")
+            col = {name: header.index(name) for name in header}
+            cum_col = col.get('Cum. net profit')
+
+            table = TradeTable()
+            running = 0
+            for row in reader:
+                if not row:
+                    continue
+                profit = parse_cents(row[col['Profit']])
+                running += profit
+                instrument = _text(row[col['Instrument']])
+                scale, entry_ticks, exit_ticks = _prices(instrument, float(row[col['Entry price']]),
+                                                         float(row[col['Exit price']]))
+                table.row.append(len(table))
+                table.entry.append(parse_timestamp(row[col['Entry time']]))
+                table.exit.append(parse_timestamp(row[col['Exit time']]))
+                table.instrument.append(instrument)
+                table.position.append(_text(row[col['Market pos.']]))
+                table.qty.append(_number(row[col['Qty']]))
+                table.scale.append(scale)
+                table.entry_price.append(entry_ticks)
+                table.exit_price.append(exit_ticks)
+                table.profit.append(profit)
+                table.cum.append(parse_cents(row[cum_col]) if cum_col is not None else running)
+            if cum_col is None:
+                table.reconciliation = unavailable(len(table))
+    except (OSError, UnicodeDecodeError, csv.Error) as e:
+        raise ExportReadError(f"Error reading CSV file: {e}") from e
+    except (ValueError, IndexError) as e:
+        raise ExportReadError(f"Unparseable row in export: {e}") from e
+    return table
+
+
+def apply_corrections(table: TradeTable, profile: str = 'default') -> TradeTable:
+    """
+    Drop misreported trades, mirroring ntperf.corrections.apply_corrections.
+
+    Args:
+        table: Table in export order
+        profile: Correction profile name, or 'none'
+
+    Returns:
+        Corrected table (the input is not modified)
+    """
+    if profile == 'none':
+        return table
+    correct = corrections_for(profile)
+
+    by_date: Dict[str, List[Tuple[int, float]]] = {}
+    for i, seconds in enumerate(table.exit):
+        key = (_EPOCH + timedelta(seconds=seconds)).strftime('%m/%d/%Y')
+        # Profiles see dollars, as they do with the pandas backend
+        by_date.setdefault(key, []).append((i, to_dollars(table.profit[i])))
+
+    removed = set(correct(lambda date: by_date.get(date, [])))
+    if not removed:
+        return table
+
+    return _in_exit_order(table, [i for i in range(len(table)) if i not in removed])
+
+
+def _in_exit_order(table: TradeTable, rows: List[int]) -> TradeTable:
+    """Take rows sorted by exit time and rebuild the running total."""
+    # sorted() is stable, so trades with equal exit times keep export order
+    table = table.take(sorted(rows, key=table.exit.__getitem__))
+    running = 0
+    for i, profit in enumerate(table.profit):
+        running += profit
+        table.cum[i] = running
+    return table
+
+
+def load_export(path: str, corrections: str = 'default') -> TradeTable:
+    """
+    Read, parse and correct an export without pandas.
+
+    Args:
+        path: Path to the CSV export
+        corrections: Correction profile passed to apply_corrections()
+
+    Returns:
+        Corrected TradeTable in exit order (ties keep export order) with
+        its reconciliation report set
+    """
+    with span('read') as s:
+        raw = read_table(path)
+        s.rows = len(raw)
+    with span('filter') as s:
+        table = apply_corrections(raw, corrections)
+        exits = table.exit
+        if any(exits[i] < exits[i - 1] for i in range(1, len(exits))):
+            table = _in_exit_order(table, list(range(len(table))))
+        s.rows = len(table)
+    with span('reconcile') as s:
+        if raw.reconciliation is not None:
+            table.reconciliation = unavailable(len(table))
+        else:
+            table.reconciliation = _reconcile(raw, table)
+        s.rows = len(raw)
+    return table
+
+
+def _reconcile(raw: TradeTable, table: TradeTable) -> Dict[str, Any]:
+    """Reconcile the export's 'Cum. net profit' with the corrected equity."""
+    kept = [False] * len(raw)
+    for row in table.row:
+        kept[row] = True
+    return reconcile_rows(raw.cum, raw.profit, kept, table.cum[-1] if len(table) else 0,
+                          lambda i: format_timestamp(raw.exit[i]))
+
+
+def _pairwise_sum(values: List[float], lo: int = 0, n: Optional[int] = None) -> float:
+    """Sum in the same order as NumPy's pairwise float64 summation."""
+    if n is None:
+        n = len(values)
+    if n < 8:
+        res = 0.0
+        for i in range(lo, lo + n):
+            res += values[i]
+        return res
+    if n <= 128:
+        r = values[lo:lo + 8]
+        i = 8
+        while i < n - (n % 8):
+            for j in range(8):
+                r[j] += values[lo + i + j]
+            i += 8
+        res = ((r[0] + r[1]) + (r[2] + r[3])) + ((r[4] + r[5]) + (r[6] + r[7]))
+        for k in range(i, n):
+            res += values[lo + k]
+        return res
+    n2 = n // 2
+    n2 -= n2 % 8
+    return _pairwise_sum(values, lo, n2) + _pairwise_sum(values, lo + n2, n - n2)
+
+
+def _daily_returns(table: TradeTable) -> List[float]:
+    """Daily P&L over NOTIONAL, by calendar date of exit, in date order."""
+    sums: Dict[int, int] = {}
+    for seconds, profit in zip(table.exit, table.profit):
+        day = seconds // _DAY
+        sums[day] = sums.get(day, 0) + profit
+    return [sums[day] / (NOTIONAL * CENTS_PER_DOLLAR) for day in sorted(sums)]
+
+
+def compute_metrics(table: TradeTable) -> Metrics:
+    """
+    Compute headline metrics, matching ntperf.metrics.compute_metrics.
+
+    Args:
+        table: Corrected TradeTable
+
+    Returns:
+        Metrics instance
+    """
+    returns = _daily_returns(table)
+    n = len(returns)
+    mean_return = _pairwise_sum(returns) / n if n else math.nan
+    if n > 1:
+        avg = _pairwise_sum(returns) / n
+        std_return = math.sqrt(_pairwise_sum([(avg - r) * (avg - r) for r in returns]) / (n - 1))
+    else:
+        std_return = math.nan
+    return summarize([to_dollars(c) for c in table.profit], [to_dollars(c) for c in table.cum],
+                     mean_return, std_return)
+
+
+def build_outputs(table: TradeTable, metrics: Optional[Metrics] = None) -> Dict[str, Any]:
+    """
+    Build the core output document (equity curve, metrics, trades).
+
+    Args:
+        table: Corrected TradeTable
+        metrics: Precomputed metrics; computed from table when omitted
+
+    Returns:
+        Output document without analytics sections
+    """
+    if metrics is None:
+        with span('metrics') as s:
+            metrics = compute_metrics(table)
+            s.rows = len(table)
+
+    with span('serialize') as s:
+        entry = [format_timestamp(seconds) for seconds in table.entry]
+        exit_ = [format_timestamp(seconds) for seconds in table.exit]
+        trades = [
+            {
+                'Entry time': entry[i],
+                'Exit time': exit_[i],
+                'Instrument': table.instrument[i],
+                'Market pos.': table.position[i],
+                'Qty': table.qty[i],
+                'Entry price': to_price(table.entry_price[i], table.scale[i]),
+                'Exit price': to_price(table.exit_price[i], table.scale[i]),
+                'Profit': to_dollars(table.profit[i])
+            }
+            for i in range(len(table))
+        ]
+        s.rows = len(table)
+    output = {
+        "equity_curve": {
+            "dates": exit_,
+            "values": [to_dollars(c) for c in table.cum]
+        },
+        "metrics": metrics.to_dict(),
+        "trades": trades
+    }
+    if table.reconciliation is not None:
+        output["reconciliation"] = table.reconciliation
+    return output
@@ -0,0 +1,125 @@
+"""
+Headline performance metrics: P&L, Sharpe ratio, max drawdown and win rate.
+"""
+import math
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Sequence, TYPE_CHECKING
+
+from ntperf.money import CENTS_PER_DOLLAR
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Notional used to turn daily P&L into returns for the Sharpe ratio
+NOTIONAL = 100_000
+
+
+@dataclass(frozen=True)
+class Metrics:
+    """
+    Headline metrics shown on the performance page.
+
+    Attributes:
+        pnl: Final cumulative net profit
+        sharpe: Annualized Sharpe ratio of daily returns on NOTIONAL
+        max_dd: Maximum drawdown as a percentage of the running peak
+        win_rate: Percentage of trades with positive profit
+    """
+    pnl: float
+    sharpe: float
+    max_dd: float
+    win_rate: float
+
+    def to_dict(self) -> Dict[str, float]:
+        return {k: float(v) for k, v in asdict(self).items()}
+
+
+def calculate_max_drawdown(equity_curve: List[float]) -> float:
+    """
+    Calculate maximum drawdown from an equity curve.
+
+    Args:
+        equity_curve: List of equity values
+
+    Returns:
+        Maximum drawdown as a percentage
+    """
+    if not equity_curve or len(equity_curve) < 2:
+        return 0.0
+
+    max_dd = 0.0
+    peak = equity_curve[0]
+
+    for value in equity_curve:
+        if value > peak:
+            peak = value
+        dd = (peak - value) / peak * 100 if peak > 0 else 0
+        max_dd = max(max_dd, dd)
+
+    return max_dd
+
+
+def sharpe_ratio(mean_return: float, std_return: float) -> float:
+    """
+    Annualize the Sharpe ratio of daily returns.
+
+    Args:
+        mean_return: Mean daily return (NaN when there are no days)
+        std_return: Sample standard deviation of daily returns (NaN with
+            fewer than two days)
+
+    Returns:
+        Annualized Sharpe ratio, 0 when undefined
+    """
+    mean_return = mean_return if not math.isnan(mean_return) else 0
+    std_return = std_return if not math.isnan(std_return) else 1
+    return mean_return / std_return * (252 ** 0.5) if std_return > 0 else 0
+
+
+def summarize(profits: Sequence[float], equity_values: List[float],
+              mean_return: float, std_return: float) -> Metrics:
+    """
+    Assemble Metrics from per-trade profits, equity and daily-return moments.
+
+    Args:
+        profits: Per-trade profits
+        equity_values: Cumulative net profit per trade
+        mean_return: Mean daily return
+        std_return: Sample standard deviation of daily returns
+
+    Returns:
+        Metrics instance
+    """
+    win_count = sum(1 for p in profits if p > 0)
+    total_count = len(profits)
+    win_rate = (win_count / total_count) * 100 if total_count > 0 else 0
+    final_equity = equity_values[-1] if len(equity_values) > 0 else 0
+
+    return Metrics(pnl=float(final_equity), sharpe=float(sharpe_ratio(mean_return, std_return)),
+                   max_dd=float(calculate_max_drawdown(equity_values)), win_rate=float(win_rate))
+
+
+def compute_metrics(df: 'pd.DataFrame') -> Metrics:
+    """
+    Compute headline metrics for a parsed (and corrected) export.
+
+    Daily P&L is summed in exact cents when the frame has a 'Profit cents'
+    column.
+
+    Args:
+        df: Trades with datetime 'Exit time' and parsed 'Profit' and
+            'Cum. net profit' columns
+
+    Returns:
+        Metrics instance
+    """
+    if 'Profit cents' in df.columns:
+        cents = df['Profit cents']
+    else:
+        cents = (df['Profit'] * CENTS_PER_DOLLAR).round().astype('int64')
+    # Calculate daily returns (assume 100k notional for Sharpe)
+    daily = cents.groupby(df['Exit time'].dt.date).sum()
+    returns = daily / (NOTIONAL * CENTS_PER_DOLLAR)
+
+    return summarize(df['Profit'].tolist(), df['Cum. net profit'].tolist(),
+                     float(returns.mean()), float(returns.std()))
@@ -0,0 +1,101 @@
+"""
+Fixed-point money and price representation.
+
+Money is held as int64 cents and prices as int64 ticks wherever trades are
+stored or summed, so running totals, daily sums and prefix sums are exact
+integer arithmetic: an incremental recompute and a full one give the same
+bits, and thousands of trades do not drift the way repeated float64
+additions do. Values become dollars (or points) only when a document is
+serialized; ``cents / 100`` and ``ticks / ticks_per_point`` are correctly
+rounded, so they give the same float as parsing the original text.
+
+Only the standard library is used, so the stdlib backend and the csv-based
+scripts share these helpers.
+"""
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+
+CENTS_PER_DOLLAR = 100
+
+# Ticks per point by contract root: 4 for a 0.25 tick, 100 for 0.01, ...
+TICKS_PER_POINT = {
+    'ES': 4, 'MES': 4, 'NQ': 4, 'MNQ': 4,
+    'YM': 1, 'MYM': 1,
+    'RTY': 10, 'M2K': 10,
+    'CL': 100, 'MCL': 100,
+    'GC': 10, 'MGC': 10,
+    'SI': 200,
+    'ZB': 32, 'ZN': 64,
+}
+# Roots not listed are counted in 1/100,000 of a point, finer than any tick
+DEFAULT_TICKS_PER_POINT = 100_000
+
+_MONEY_STRIP = str.maketrans('', '', '$,() \t-')
+
+
+def parse_cents(text: str) -> int:
+    """
+    Parse one NinjaTrader money cell to cents without going through float.
+
+    Args:
+        text: Cell such as "$1,162.50" or "($42.75)"
+
+    Returns:
+        Cents, rounded half away from zero; blanks and unparseable cells
+        become 0
+    """
+    text = text.strip()
+    negative = text.startswith('(') or text.startswith('-')
+    cleaned = text.translate(_MONEY_STRIP)
+    whole, _, fraction = cleaned.partition('.')
+    if whole.isdigit() and (not fraction or fraction.isdigit()):
+        if len(fraction) <= 2:
+            cents = int(whole) * CENTS_PER_DOLLAR + int(fraction.ljust(2, '0'))
+        else:
+            cents = int(Decimal(cleaned).scaleb(2).quantize(Decimal(1), 'ROUND_HALF_UP'))
+    else:
+        try:
+            cents = int(Decimal(cleaned).scaleb(2).quantize(Decimal(1), 'ROUND_HALF_UP'))
+        except (InvalidOperation, ValueError):
+            return 0
+    return -cents if negative else cents
+
+
+def dollars_to_cents(value: float) -> int:
+    """Nearest whole cent of a dollar amount."""
+    return int(round(value * CENTS_PER_DOLLAR))
+
+
+def to_dollars(cents: int) -> float:
+    return cents / CENTS_PER_DOLLAR
+
+
+def format_cents(cents: int) -> str:
+    """Format cents the way NinjaTrader does: "$162.50" or "($42.75)"."""
+    whole, part = divmod(abs(cents), CENTS_PER_DOLLAR)
+    text = f"${whole}.{part:02d}"
+    return f"({text})" if cents < 0 else text
+
+
+@lru_cache(maxsize=None)
+def ticks_per_point(instrument: str) -> int:
+    """
+    Price scale of an instrument.
+
+    Args:
+        instrument: NinjaTrader instrument name, e.g. "MNQ JUN25"
+
+    Returns:
+        Ticks per point of its contract root
+    """
+    root = instrument.split(' ', 1)[0] if isinstance(instrument, str) else ''
+    return TICKS_PER_POINT.get(root, DEFAULT_TICKS_PER_POINT)
+
+
+def to_ticks(price: float, scale: int) -> int:
+    """Nearest tick of a price, given the instrument's ticks per point."""
+    return int(round(price * scale))
+
+
+def to_price(ticks: int, scale: int) -> float:
+    return ticks / scale
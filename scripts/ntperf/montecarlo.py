@@ -0,0 +1,179 @@
+"""
+Monte Carlo trade-resampling engine.
+
+Resamples the observed per-trade profit sequence to estimate the range of
+final P&L and maximum drawdown, and the probability of touching a trailing
+drawdown limit. Paths are generated as (batch, n_trades) matrices so each
+batch is a few vectorized NumPy passes; batches can optionally be spread
+across a process pool.
+
+Every batch gets its own child of one ``SeedSequence``, so results depend
+only on the seed and batch size, never on the number of workers.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+PERCENTILES = [5, 25, 50, 75, 95]
+DEFAULT_PATHS = 10_000
+# Topstep 50K Express trailing max loss
+DEFAULT_DD_LIMIT = 2_000.0
+# Number of points per path kept for the equity fan chart
+BAND_POINTS = 50
+# Upper bound on matrix elements per batch (~32 MB of float64)
+BATCH_ELEMENTS = 4_000_000
+# Paths x trades simulated by a default conversion; larger exports get
+# fewer paths (but at least MIN_PATHS) so the section stays cheap per ingest
+CONVERSION_ELEMENTS = 50_000_000
+MIN_PATHS = 500
+
+
+def _resample_indices(rng: np.random.Generator, n_paths: int, n_trades: int,
+                      block_size: int) -> np.ndarray:
+    """
+    Draw trade indices for a batch of resampled paths.
+
+    Args:
+        rng: Random generator for this batch
+        n_paths: Number of paths in the batch
+        n_trades: Length of each path (and of the source sequence)
+        block_size: 1 for an iid bootstrap, >1 for a circular block bootstrap
+
+    Returns:
+        Integer matrix of shape (n_paths, n_trades)
+    """
+    if block_size <= 1:
+        return rng.integers(0, n_trades, size=(n_paths, n_trades))
+    n_blocks = -(-n_trades // block_size)
+    starts = rng.integers(0, n_trades, size=(n_paths, n_blocks, 1))
+    idx = (starts + np.arange(block_size)) % n_trades
+    return idx.reshape(n_paths, n_blocks * block_size)[:, :n_trades]
+
+
+def _simulate_batch(profit: np.ndarray, n_paths: int, block_size: int,
+                    seed: np.random.SeedSequence, checkpoints: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Simulate one batch of paths and reduce it to per-path statistics.
+
+    Args:
+        profit: Observed per-trade profits
+        n_paths: Number of paths in this batch
+        block_size: Block length for the block bootstrap (1 = iid)
+        seed: Seed sequence for this batch
+        checkpoints: Trade indices at which equity is kept for the fan chart
+
+    Returns:
+        Dictionary with final P&L, max drawdown and sampled equity per path
+    """
+    rng = np.random.default_rng(seed)
+    equity = np.cumsum(profit[_resample_indices(rng, n_paths, len(profit), block_size)], axis=1)
+    # Drawdown is measured from the running peak, with the starting balance
+    # (zero P&L) counting as the first peak.
+    peak = np.maximum(np.maximum.accumulate(equity, axis=1), 0.0)
+    max_dd = (peak - equity).max(axis=1)
+    # Copy the final column so the (n_paths, n_trades) matrix can be freed
+    # before the batches are concatenated
+    return {
+        "final": equity[:, -1].copy(),
+        "max_dd": max_dd,
+        "bands": equity[:, checkpoints]
+    }
+
+
+def _simulate_batch_args(args: tuple) -> Dict[str, np.ndarray]:
+    return _simulate_batch(*args)
+
+
+def _percentiles(values: np.ndarray, percentiles: Sequence[float]) -> Dict[str, float]:
+    return {f"p{p:g}": float(v) for p, v in zip(percentiles, np.percentile(values, percentiles))}
+
+
+def simulate(profit: Sequence[float], n_paths: int = DEFAULT_PATHS, block_size: int = 1,
+             dd_limits: Sequence[float] = (DEFAULT_DD_LIMIT,), seed: Optional[int] = 0,
+             workers: int = 1, percentiles: Sequence[float] = PERCENTILES) -> Optional[Dict[str, Any]]:
+    """
+    Run a bootstrap Monte Carlo over a per-trade profit sequence.
+
+    Args:
+        profit: Per-trade profits in exit order
+        n_paths: Number of resampled paths
+        block_size: 1 for an iid bootstrap, >1 for a circular block bootstrap
+            that preserves serial dependence within blocks of that length
+        dd_limits: Trailing drawdown limits (in dollars) whose hit
+            probabilities are reported
+        seed: Seed for reproducible results; None draws fresh entropy
+        workers: Number of worker processes; 1 runs in-process
+        percentiles: Percentiles reported for each distribution
+
+    Returns:
+        Dictionary with percentile bands and drawdown-limit probabilities,
+        or None if there are fewer than two trades
+    """
+    profit = np.asarray(profit, dtype=np.float64)
+    n_trades = len(profit)
+    if n_trades < 2 or n_paths < 1:
+        return None
+
+    batch_size = max(1, min(n_paths, BATCH_ELEMENTS // n_trades))
+    sizes = [batch_size] * (n_paths // batch_size)
+    if n_paths % batch_size:
+        sizes.append(n_paths % batch_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    checkpoints = np.unique(np.linspace(0, n_trades - 1, min(BAND_POINTS, n_trades)).round().astype(np.int64))
+    tasks = [(profit, size, block_size, s, checkpoints) for size, s in zip(sizes, seeds)]
+
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_simulate_batch_args, tasks))
+    else:
+        results = [_simulate_batch_args(task) for task in tasks]
+
+    final = np.concatenate([r["final"] for r in results])
+    max_dd = np.concatenate([r["max_dd"] for r in results])
+    bands = np.percentile(np.concatenate([r["bands"] for r in results]), percentiles, axis=0)
+
+    return {
+        "config": {
+            "paths": n_paths,
+            "trades": n_trades,
+            "method": "iid" if block_size <= 1 else "block",
+            "block_size": max(block_size, 1),
+            "seed": seed
+        },
+        "final_pnl": _percentiles(final, percentiles),
+        "max_drawdown": _percentiles(max_dd, percentiles),
+        "prob_loss": float((final < 0).mean()),
+        "dd_limits": [
+            {"limit": float(limit), "prob_hit": float((max_dd >= limit).mean())}
+            for limit in dd_limits
+        ],
+        "equity_bands": {
+            "trade_index": (checkpoints + 1).tolist(),
+            **{f"p{p:g}": row.round(2).tolist() for p, row in zip(percentiles, bands)}
+        }
+    }
+
+
+def conversion_paths(n_trades: int) -> int:
+    """Paths simulated for an export of n_trades trades by a default conversion."""
+    return max(MIN_PATHS, min(DEFAULT_PATHS, CONVERSION_ELEMENTS // max(n_trades, 1)))
+
+
+def compute_monte_carlo(df, **kwargs) -> Optional[Dict[str, Any]]:
+    """
+    Run the Monte Carlo engine over the trades in a converter DataFrame.
+
+    Args:
+        df: Trades with a parsed 'Profit' column; sorted by 'Exit time'
+            when that column is present
+        **kwargs: Passed through to simulate(); n_paths defaults to
+            conversion_paths() of the trade count
+
+    Returns:
+        Result of simulate(), or None if there are too few trades
+    """
+    if 'Exit time' in df.columns:
+        df = df.sort_values('Exit time', kind='stable')
+    kwargs.setdefault('n_paths', conversion_paths(len(df)))
+    return simulate(df['Profit'].to_numpy(dtype=np.float64), **kwargs)
@@ -0,0 +1,74 @@
+"""
+Writing output documents to disk.
+
+Documents are written to a temporary file in the destination directory and
+renamed over the target, so a reader (the /api/perf route, the watcher's
+next run) sees either the previous file or the complete new one, never a
+truncated write.
+"""
+import json
+import os
+import tempfile
+from typing import Any, Callable, Dict, IO
+
+from ntperf.errors import OutputWriteError
+from ntperf.spans import span
+
+
+def _process_umask() -> int:
+    """The process umask; reading it means setting it, so this runs once, at import."""
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return umask
+
+
+# mkstemp creates files 0600; outputs get the mode open() would give them
+_FILE_MODE = 0o666 & ~_process_umask()
+
+
+def atomic_write(output_path: str, write: Callable[[IO], None], binary: bool = False) -> None:
+    """
+    Atomically replace a file with the contents produced by ``write``.
+
+    Args:
+        output_path: Destination path
+        write: Callback that writes the new contents to the given file
+        binary: Open the file in binary rather than text mode
+
+    Raises:
+        OSError: The temporary file cannot be written or renamed
+    """
+    directory, name = os.path.split(os.path.abspath(output_path))
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{name}.", suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb' if binary else 'w') as f:
+            write(f)
+            f.flush()
+            os.fchmod(f.fileno(), _FILE_MODE)
+            os.fsync(f.fileno())
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_output(data: Dict[str, Any], output_path: str) -> None:
+    """
+    Atomically write an output document as indented JSON.
+
+    Args:
+        data: Output document
+        output_path: Destination path
+
+    Raises:
+        OutputWriteError: The file cannot be written
+    """
+    try:
+        with span('write') as s:
+            atomic_write(output_path, lambda f: json.dump(data, f, indent=2))
+            s.rows = len(data.get("trades", []))
+    except (OSError, TypeError, ValueError) as e:
+        raise OutputWriteError(f"Error writing JSON file: {e}") from e
@@ -0,0 +1,120 @@
+"""
+Vectorized parsing of NinjaTrader Grid export columns.
+"""
+import pandas as pd
+
+from ntperf.money import CENTS_PER_DOLLAR
+from ntperf.schema import CENTS_COLUMNS, MONEY_COLUMNS, NT_TIMESTAMP_FORMAT
+
+
+def parse_money(series: pd.Series) -> pd.Series:
+    """
+    Parse a column of NinjaTrader money strings in one vectorized pass.
+
+    Args:
+        series: Column of strings such as "$1,162.50" or "($42.75)"
+
+    Returns:
+        Float series; blanks and unparseable cells become 0.0
+    """
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype('float64').fillna(0.0)
+
+    text = series.astype('string').str.strip()
+    negative = (text.str.startswith('(') | text.str.startswith('-')).fillna(False)
+    cleaned = text.str.replace(r'[$,()\s-]', '', regex=True)
+    values = pd.to_numeric(cleaned, errors='coerce').astype('float64').fillna(0.0)
+    return values.where(~negative.astype(bool), -values)
+
+
+def parse_cents(series: pd.Series) -> pd.Series:
+    """
+    Parse a column of NinjaTrader money strings to exact int64 cents.
+
+    Args:
+        series: Column of strings such as "$1,162.50" or "($42.75)"
+
+    Returns:
+        int64 series of cents; blanks and unparseable cells become 0
+    """
+    return (parse_money(series) * CENTS_PER_DOLLAR).round().astype('int64')
+
+
+def parse_money_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Parse every money column present in the export in place.
+
+    Columns in CENTS_COLUMNS also get an int64 cents column, and their
+    dollar values are derived from it so the two always agree.
+
+    Args:
+        df: Raw export DataFrame
+
+    Returns:
+        The same DataFrame, for chaining
+    """
+    for col in MONEY_COLUMNS:
+        if col not in df.columns:
+            continue
+        if col in CENTS_COLUMNS:
+            df[CENTS_COLUMNS[col]] = parse_cents(df[col])
+            df[col] = df[CENTS_COLUMNS[col]] / CENTS_PER_DOLLAR
+        else:
+            df[col] = parse_money(df[col])
+    return df
+
+
+def parse_timestamps(series: pd.Series) -> pd.Series:
+    """
+    Parse a timestamp column, trying the NinjaTrader layout first.
+
+    An explicit format is much faster than per-element inference, which is
+    only used as a fallback for hand-edited or differently exported files.
+
+    Args:
+        series: Column of timestamp strings (or already-parsed datetimes)
+
+    Returns:
+        datetime64 series
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    try:
+        return pd.to_datetime(series, format=NT_TIMESTAMP_FORMAT)
+    except (ValueError, TypeError):
+        return pd.to_datetime(series)
+
+
+# CME Globex futures reopen at 6 PM ET; fills after this hour belong to the
+# next trading session.
+SESSION_ROLLOVER_HOUR = 18
+
+
+def session_dates(timestamps: pd.Series, rollover_hour: int = SESSION_ROLLOVER_HOUR) -> pd.Series:
+    """
+    Map timestamps to the futures trading session they belong to.
+
+    Args:
+        timestamps: datetime64 series
+        rollover_hour: Hour of day at which the next session starts
+
+    Returns:
+        Series of session dates (datetime64, normalized to midnight)
+    """
+    shifted = timestamps + pd.Timedelta(hours=24 - rollover_hour)
+    return shifted.dt.normalize()
+
+
+def account_names(series: pd.Series) -> pd.Series:
+    """
+    Shorten NinjaTrader account strings to the account id.
+
+    "EXPRESSApr3013436618!TopstepTrader!TopstepTrader" -> "EXPRESSApr3013436618"
+
+    Args:
+        series: Raw 'Account' column
+
+    Returns:
+        Series of account ids
+    """
+    return series.astype(str).str.split('!', n=1).str[0]
@@ -0,0 +1,217 @@
+"""
+Daily, weekly, monthly and yearly P&L tables.
+
+Trades are bucketed by the trading session they exit in (a session starts
+at SESSION_ROLLOVER_HOUR the evening before its date), so an evening trade
+counts toward the next day as it does on the broker's statements. One pass
+over the trades in exit order builds the daily table; each coarser table is
+built from the daily one. Every table is a set of parallel arrays keyed by
+period start:
+
+    start    first session date of the period, as days since 1970-01-01
+    pnl      P&L in cents
+    trades   number of trades
+    wins     number of trades with a positive profit
+
+Weeks start on Monday. Trades only ever extend a table at its end, so
+extend_tables() folds newly exited trades into the last period and appends
+the rest, touching nothing but the new trades. calendar_document() turns
+the tables into the ``calendar`` output section, with dates, dollars and
+win rates.
+"""
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from ntperf.money import CENTS_PER_DOLLAR, to_dollars
+from ntperf.parsing import SESSION_ROLLOVER_HOUR, parse_timestamps
+
+PERIODS = ('daily', 'weekly', 'monthly', 'yearly')
+FIELDS = ('start', 'pnl', 'trades', 'wins')
+
+_HOUR = 3_600
+_DAY = 86_400
+# 1970-01-01 was a Thursday; (day + 3) % 7 is 0 on Mondays
+_MONDAY_SHIFT = 3
+
+# Period name -> field name -> values
+Tables = Dict[str, Dict[str, Any]]
+
+
+def session_days(exit_seconds: np.ndarray, rollover_hour: int = SESSION_ROLLOVER_HOUR) -> np.ndarray:
+    """
+    Session date of each exit, as days since 1970-01-01.
+
+    Array form of ntperf.parsing.session_dates().
+
+    Args:
+        exit_seconds: Exit times in epoch seconds
+        rollover_hour: Hour of day at which the next session starts
+
+    Returns:
+        int64 array of session days
+    """
+    return (np.asarray(exit_seconds, dtype=np.int64) + (24 - rollover_hour) * _HOUR) // _DAY
+
+
+def period_starts(days: np.ndarray, period: str) -> np.ndarray:
+    """
+    First day of the period containing each day.
+
+    Args:
+        days: Days since 1970-01-01
+        period: One of PERIODS
+
+    Returns:
+        int64 array of period starts, as days since 1970-01-01
+
+    Raises:
+        ValueError: period is unknown
+    """
+    if period == 'daily':
+        return days
+    if period == 'weekly':
+        return days - (days + _MONDAY_SHIFT) % 7
+    if period in ('monthly', 'yearly'):
+        unit = 'M' if period == 'monthly' else 'Y'
+        return days.astype('datetime64[D]').astype(f'datetime64[{unit}]') \
+            .astype('datetime64[D]').astype(np.int64)
+    raise ValueError(f"Unknown period: {period!r}")
+
+
+def _group(keys: np.ndarray, pnl: np.ndarray, trades: np.ndarray,
+           wins: np.ndarray) -> Dict[str, np.ndarray]:
+    """Sum rows sharing a key; keys must be non-decreasing."""
+    if not len(keys):
+        empty = np.array([], dtype=np.int64)
+        return {field: empty for field in FIELDS}
+    starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    return {
+        "start": keys[starts],
+        "pnl": np.add.reduceat(pnl, starts),
+        "trades": np.add.reduceat(trades, starts),
+        "wins": np.add.reduceat(wins, starts)
+    }
+
+
+def period_tables(exit_seconds: np.ndarray, cents: np.ndarray) -> Tables:
+    """
+    Build every table in PERIODS from trade columns.
+
+    Args:
+        exit_seconds: Exit times in epoch seconds
+        cents: Profit per trade in cents
+
+    Returns:
+        Tables of int64 arrays, keyed by period name
+    """
+    exit_seconds = np.asarray(exit_seconds, dtype=np.int64)
+    cents = np.asarray(cents, dtype=np.int64)
+    order = np.argsort(exit_seconds, kind='stable')
+    cents = cents[order]
+    daily = _group(session_days(exit_seconds[order]), cents,
+                   np.ones(len(cents), dtype=np.int64), (cents > 0).astype(np.int64))
+    tables = {'daily': daily}
+    for period in PERIODS[1:]:
+        tables[period] = _group(period_starts(daily['start'], period),
+                                daily['pnl'], daily['trades'], daily['wins'])
+    return tables
+
+
+def empty_tables() -> Tables:
+    return {period: {field: [] for field in FIELDS} for period in PERIODS}
+
+
+def to_lists(tables: Tables) -> Tables:
+    """Tables as plain int lists, the form stored in JSON and extended in place."""
+    return {period: {field: [int(v) for v in table[field]] for field in FIELDS}
+            for period, table in tables.items()}
+
+
+def extend_tables(tables: Tables, exit_seconds: np.ndarray, cents: np.ndarray) -> Tables:
+    """
+    Fold newly exited trades into list tables, in place.
+
+    The cost is proportional to the new trades: they are grouped on their
+    own, the first group of each table is added to the table's last period
+    when they share a start, and the remaining groups are appended.
+
+    Args:
+        tables: Tables from to_lists() or empty_tables()
+        exit_seconds: Exit times of the new trades, none before the session
+            of the last trade already counted
+        cents: Profit of the new trades in cents
+
+    Returns:
+        ``tables``, extended
+
+    Raises:
+        ValueError: A new trade belongs to a period before the last one
+    """
+    new = period_tables(exit_seconds, cents)
+    for period in PERIODS:
+        table, added = tables[period], to_lists({period: new[period]})[period]
+        if not added['start']:
+            continue
+        skip = 0
+        if table['start']:
+            last = table['start'][-1]
+            if added['start'][0] < last:
+                raise ValueError(f"New trades precede the last {period} period")
+            if added['start'][0] == last:
+                for field in FIELDS[1:]:
+                    table[field][-1] += added[field][0]
+                skip = 1
+        for field in FIELDS:
+            table[field].extend(added[field][skip:])
+    return tables
+
+
+def calendar_document(tables: Tables) -> Dict[str, Any]:
+    """
+    Render tables as the ``calendar`` output section.
+
+    Args:
+        tables: Tables from period_tables() or to_lists()
+
+    Returns:
+        Dictionary keyed by period, each with parallel "start" (YYYY-MM-DD),
+        "pnl" (dollars), "trades", "wins" and "win_rate" (percent) lists
+    """
+    document = {}
+    for period in PERIODS:
+        table = tables[period]
+        starts = np.asarray(table['start'], dtype=np.int64).astype('datetime64[D]')
+        trades = [int(n) for n in table['trades']]
+        wins = [int(n) for n in table['wins']]
+        document[period] = {
+            "start": np.datetime_as_string(starts).tolist(),
+            "pnl": [to_dollars(int(c)) for c in table['pnl']],
+            "trades": trades,
+            "wins": wins,
+            "win_rate": [w / n * 100 if n else 0.0 for w, n in zip(wins, trades)]
+        }
+    return document
+
+
+def compute_calendar(df: pd.DataFrame) -> Optional[Dict[str, Any]]:
+    """
+    Daily, weekly, monthly and yearly P&L, trade counts and win rates.
+
+    Args:
+        df: Trades with 'Exit time' and parsed 'Profit' (and, when present,
+            exact 'Profit cents') columns
+
+    Returns:
+        Calendar section from calendar_document(), or None if there are no
+        trades
+    """
+    if df.empty or 'Exit time' not in df.columns:
+        return None
+    if 'Profit cents' in df.columns:
+        cents = df['Profit cents'].to_numpy(dtype=np.int64)
+    else:
+        cents = (df['Profit'] * CENTS_PER_DOLLAR).round().to_numpy(dtype=np.int64)
+    exit_seconds = parse_timestamps(df['Exit time']).to_numpy(dtype='datetime64[s]').astype(np.int64)
+    return calendar_document(period_tables(exit_seconds, cents))
@@ -0,0 +1,74 @@
+"""
+Backend selection for conversions.
+
+Small exports converted without analytics go through the stdlib backend
+(ntperf.lite) and never import pandas or NumPy; everything else uses the
+pandas backend (ntperf.api), which is imported lazily. Either backend can
+be forced; the stdlib one only builds the equity curve, metrics and trades.
+"""
+import os
+from typing import Any, Dict, Iterable, Optional
+
+from ntperf.spans import span
+
+# Exports up to this size (~4,000 trades) are parsed with the stdlib backend
+LITE_MAX_BYTES = 1 << 20
+
+BACKENDS = ('auto', 'lite', 'pandas')
+
+
+def choose_backend(source: Any, analytics: Optional[Iterable[str]] = None) -> str:
+    """
+    Pick the backend for a conversion.
+
+    Args:
+        source: Path or file-like object of the export
+        analytics: Requested analytics sections (None means all)
+
+    Returns:
+        'lite' for an export of at most LITE_MAX_BYTES converted without
+        analytics, otherwise 'pandas'
+    """
+    if analytics is None or list(analytics):
+        return 'pandas'
+    if not isinstance(source, (str, os.PathLike)):
+        return 'pandas'
+    try:
+        return 'lite' if os.path.getsize(source) <= LITE_MAX_BYTES else 'pandas'
+    except OSError:
+        # Let the backend raise the read error
+        return 'lite'
+
+
+def convert(source: Any, corrections: str = 'default',
+            analytics: Optional[Iterable[str]] = None, backend: str = 'auto') -> Dict[str, Any]:
+    """
+    Load an export and build its output document in one call.
+
+    Args:
+        source: Path or file-like object of the export
+        corrections: Correction profile name
+        analytics: Names of ntperf.api.ANALYTICS sections to include
+            (default: all, or none with the stdlib backend)
+        backend: 'auto' (see choose_backend()), 'lite' or 'pandas'
+
+    Returns:
+        Output document
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend: {backend!r}")
+    if backend == 'auto':
+        backend = choose_backend(source, analytics)
+    if backend == 'lite' and analytics:
+        raise ValueError("The lite backend does not compute analytics sections")
+
+    with span(f'convert[{backend}]') as s:
+        if backend == 'lite':
+            from ntperf import lite
+            data = lite.build_outputs(lite.load_export(source, corrections))
+        else:
+            with span('import'):
+                from ntperf import api
+            data = api.build_outputs(api.load_export(source, corrections), analytics=analytics)
+        s.rows = len(data["trades"])
+    return data
@@ -0,0 +1,161 @@
+"""
+Multi-account portfolio aggregation.
+
+An export can span several funded accounts (the 'Account' column), but the
+equity curve treats it as one stream. This section splits the trades by
+account and builds:
+
+* a per-account equity curve and headline metrics,
+* a time-aligned combined curve: at every exit timestamp of any account,
+  the sum of each account's latest equity,
+* portfolio metrics over all accounts, and
+* the correlation matrix of the accounts' daily P&L.
+
+Every step is a groupby or cumsum over all accounts at once, so dozens of
+accounts aggregate in a fraction of a second. Equity and daily P&L are
+summed in exact cents.
+"""
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from ntperf.metrics import NOTIONAL, Metrics, compute_metrics, sharpe_ratio
+from ntperf.money import CENTS_PER_DOLLAR
+from ntperf.parsing import account_names
+from ntperf.schema import TIME_FORMAT
+
+
+def _frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Account, exit time and profit in exit order, with per-account equity."""
+    if 'Profit cents' in df.columns:
+        cents = df['Profit cents'].to_numpy(dtype=np.int64)
+    else:
+        cents = np.rint(df['Profit'].to_numpy(dtype=np.float64) * CENTS_PER_DOLLAR).astype(np.int64)
+    frame = pd.DataFrame({
+        'account': account_names(df['Account']).to_numpy(),
+        'exit': df['Exit time'].to_numpy(),
+        'cents': cents
+    }).sort_values('exit', kind='stable', ignore_index=True)
+    frame['profit'] = frame['cents'] / CENTS_PER_DOLLAR
+    frame['equity'] = frame.groupby('account', sort=False)['cents'].cumsum() / CENTS_PER_DOLLAR
+    return frame
+
+
+def account_metrics(frame: pd.DataFrame) -> Dict[str, Metrics]:
+    """
+    Headline metrics of every account, as compute_metrics defines them.
+
+    Args:
+        frame: Output of _frame()
+
+    Returns:
+        Mapping of account id to Metrics
+    """
+    by_account = frame.groupby('account', sort=True)
+    daily = frame.groupby(['account', frame['exit'].dt.date])['cents'].sum()
+    daily = daily / (NOTIONAL * CENTS_PER_DOLLAR)
+    daily_by_account = daily.groupby(level=0)
+    mean, std = daily_by_account.mean(), daily_by_account.std()
+
+    peak = by_account['equity'].cummax()
+    drawdown = ((peak - frame['equity']) / peak * 100).where(peak > 0, 0.0)
+    max_dd = drawdown.groupby(frame['account']).max().where(by_account.size() >= 2, 0.0)
+
+    win_rate = (frame['profit'] > 0).groupby(frame['account']).mean() * 100
+    pnl = by_account['equity'].last()
+    return {
+        str(account): Metrics(pnl=float(pnl[account]),
+                              sharpe=float(sharpe_ratio(float(mean[account]), float(std[account]))),
+                              max_dd=float(max_dd[account]), win_rate=float(win_rate[account]))
+        for account in pnl.index
+    }
+
+
+def combined_curve(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Sum of every account's latest equity at each exit timestamp.
+
+    Aligning each account's equity as of every timestamp (merge-asof,
+    backward, 0 before its first trade) and summing gives the P&L of every
+    trade that has exited by then, so the curve is the exit-ordered
+    cumulative P&L taken at the last trade of each timestamp. That is one
+    pass instead of an accounts x timestamps merge.
+
+    Args:
+        frame: Output of _frame()
+
+    Returns:
+        DataFrame with 'exit' (distinct exit timestamps in order) and 'equity'
+    """
+    equity = frame['cents'].cumsum().groupby(frame['exit'], sort=False).last()
+    return pd.DataFrame({'exit': equity.index, 'equity': equity.to_numpy() / CENTS_PER_DOLLAR})
+
+
+def daily_correlation(frame: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Correlation of daily P&L between accounts.
+
+    Days on which an account did not trade count as 0 P&L for it.
+
+    Args:
+        frame: Output of _frame()
+
+    Returns:
+        Account ids and the correlation matrix (None where undefined)
+    """
+    daily = frame.pivot_table(index=frame['exit'].dt.date, columns='account', values='profit',
+                              aggfunc='sum', fill_value=0.0)
+    corr = daily.corr()
+    return {
+        "accounts": [str(a) for a in corr.columns],
+        "matrix": [[None if np.isnan(v) else round(float(v), 4) for v in row]
+                   for row in corr.to_numpy()]
+    }
+
+
+def compute_portfolio(df: pd.DataFrame) -> Optional[Dict[str, Any]]:
+    """
+    Per-account and combined equity, metrics and daily P&L correlation.
+
+    Args:
+        df: Trades with datetime 'Exit time', parsed 'Profit' and 'Account'
+
+    Returns:
+        Portfolio section, or None if the export has no 'Account' column
+        or no trades
+    """
+    if 'Account' not in df.columns or df.empty:
+        return None
+    frame = _frame(df)
+    metrics = account_metrics(frame)
+
+    frame['date'] = frame['exit'].dt.strftime(TIME_FORMAT)
+    accounts: Dict[str, Dict[str, Any]] = {}
+    for account, group in frame.groupby('account', sort=True):
+        accounts[str(account)] = {
+            "trades": int(len(group)),
+            "metrics": metrics[str(account)].to_dict(),
+            "equity_curve": {
+                "dates": group['date'].tolist(),
+                "values": group['equity'].tolist()
+            }
+        }
+
+    combined = combined_curve(frame)
+    portfolio = compute_metrics(pd.DataFrame({
+        'Exit time': frame['exit'],
+        'Profit': frame['profit'],
+        'Profit cents': frame['cents'],
+        'Cum. net profit': frame['cents'].cumsum() / CENTS_PER_DOLLAR
+    }))
+    return {
+        "accounts": accounts,
+        "combined": {
+            "dates": combined['exit'].dt.strftime(TIME_FORMAT).tolist(),
+            "values": combined['equity'].tolist()
+        },
+        "metrics": portfolio.to_dict(),
+        "correlation": daily_correlation(frame)
+    }
+
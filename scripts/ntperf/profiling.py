@@ -0,0 +1,152 @@
+"""
+cProfile hook for the command-line entry points.
+
+Every converter and ingest command takes ``--profile [DIR]``. The run is
+wrapped in cProfile, and two files are written to DIR (``profiles`` by
+default):
+
+    <command>-<size>-<hash>-<time>.prof   raw stats for pstats / snakeviz
+    <command>-<size>-<hash>-<time>.txt    top-N functions by cumulative and own time
+
+Both names carry the total input size and a content hash of the inputs,
+and the report lists each input with its size and hash, so a profile
+captured on a real export can be matched to the file that produced it.
+Commands that convert in worker processes profile each conversion in the
+worker, tagged with that export.
+"""
+import argparse
+import cProfile
+import hashlib
+import io
+import logging
+import os
+import pstats
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILE_DIR = 'profiles'
+DEFAULT_TOP = 25
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add --profile [DIR] and --profile-top N to a command's parser."""
+    parser.add_argument("--profile", nargs="?", const=DEFAULT_PROFILE_DIR, metavar="DIR",
+                        help=f"profile the run with cProfile and write .prof/.txt files to DIR "
+                             f"(default: {DEFAULT_PROFILE_DIR})")
+    parser.add_argument("--profile-top", type=int, default=DEFAULT_TOP, metavar="N",
+                        help="functions listed in the profile report")
+
+
+def _files(paths: Iterable[str]) -> List[str]:
+    """Input files, with directories expanded to the files directly inside them."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(entry.path for entry in os.scandir(path) if entry.is_file()))
+        elif os.path.isfile(path):
+            files.append(path)
+    return files
+
+
+def input_tag(paths: Iterable[str]) -> Dict[str, Any]:
+    """
+    Size and content hash of a run's inputs.
+
+    Args:
+        paths: Input files or directories
+
+    Returns:
+        Total "bytes", combined "hash" (16 hex digits) and per-file "inputs"
+    """
+    combined = hashlib.sha256()
+    inputs = []
+    for path in _files(paths):
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                sha.update(block)
+        digest = sha.hexdigest()
+        combined.update(digest.encode('ascii'))
+        inputs.append({"path": path, "bytes": os.path.getsize(path), "sha256": digest})
+    return {
+        "bytes": sum(item["bytes"] for item in inputs),
+        "hash": combined.hexdigest()[:16],
+        "inputs": inputs
+    }
+
+
+def _size_label(size: int) -> str:
+    for unit, scale in (('GB', 1 << 30), ('MB', 1 << 20), ('KB', 1 << 10)):
+        if size >= scale:
+            return f"{size // scale}{unit}"
+    return f"{size}B"
+
+
+def write_profile(profiler: cProfile.Profile, command: str, tag: Dict[str, Any],
+                  elapsed: float, directory: str, top: int = DEFAULT_TOP) -> str:
+    """
+    Write the .prof stats and the text report of a finished profile.
+
+    Args:
+        profiler: Disabled profiler
+        command: Command name used in the file names
+        tag: Output of input_tag()
+        elapsed: Wall-clock seconds of the profiled run
+        directory: Directory to write to (created if missing)
+        top: Functions listed per ordering in the report
+
+    Returns:
+        Path of the .prof file (the report is next to it with a .txt suffix)
+    """
+    os.makedirs(directory, exist_ok=True)
+    stem = f"{command}-{_size_label(tag['bytes'])}-{tag['hash']}-{datetime.now():%Y%m%d-%H%M%S}"
+    base = os.path.join(directory, stem)
+    profiler.dump_stats(base + '.prof')
+
+    out = io.StringIO()
+    out.write(f"command: {' '.join([command] + sys.argv[1:])}\n")
+    out.write(f"pid: {os.getpid()}\n")
+    out.write(f"wall time: {elapsed:.3f}s\n")
+    out.write(f"input: {tag['bytes']:,} bytes, hash {tag['hash']}\n")
+    for item in tag['inputs']:
+        out.write(f"  {item['path']}  {item['bytes']:,} bytes  sha256 {item['sha256']}\n")
+    for order in ('cumulative', 'tottime'):
+        out.write(f"\n=== Top {top} by {order} time ===\n")
+        stats = pstats.Stats(profiler, stream=out)
+        stats.strip_dirs().sort_stats(order).print_stats(top)
+    with open(base + '.txt', 'w') as f:
+        f.write(out.getvalue())
+    return base + '.prof'
+
+
+@contextmanager
+def profiled(command: str, inputs: Iterable[str], directory: Optional[str],
+             top: int = DEFAULT_TOP) -> Iterator[None]:
+    """
+    Profile the enclosed block when a profile directory is given.
+
+    Args:
+        command: Command name used in the file names
+        inputs: Input files or directories, hashed for the tag
+        directory: Where to write the profile; None disables profiling
+        top: Functions listed per ordering in the report
+    """
+    if directory is None:
+        yield
+        return
+    # Hash before profiling so reading the inputs does not show up in the profile
+    tag = input_tag(inputs)
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        path = write_profile(profiler, command, tag, time.perf_counter() - start, directory, top)
+        logger.info(f"Profile written to {path} (report: {os.path.splitext(path)[0]}.txt)")
@@ -0,0 +1,198 @@
+"""
+Trailing-drawdown / prop-firm rule simulator.
+
+Replays each account's trades in exit order against a set of funded-account
+rules (trailing maximum loss, daily loss limit) and reports the threshold
+path, the remaining buffer at every trade and the first breach.
+
+Account trades are converted to arrays once by prepare_accounts(); each rule
+set is then evaluated with a few O(n) NumPy passes, so sweeping hundreds of
+parameter combinations stays cheap.
+"""
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ntperf.parsing import account_names, parse_timestamps, session_dates
+from ntperf.schema import TIME_FORMAT
+
+
+@dataclass(frozen=True)
+class PropRules:
+    """
+    Funded-account rule parameters. Defaults match a TopstepTrader 50K
+    Express account.
+
+    Attributes:
+        starting_balance: Account balance before the first trade
+        max_loss: Trailing maximum loss limit in dollars
+        daily_loss: Daily loss limit in dollars, or None to disable
+        trailing: 'eod' trails the highest end-of-session balance,
+            'intraday' trails the highest balance after any trade
+        lock_at_start: Stop trailing once the threshold reaches the
+            starting balance
+        use_mae: Also test the worst open-trade balance (balance before the
+            trade minus its MAE) against the limits
+    """
+    starting_balance: float = 50_000.0
+    max_loss: float = 2_000.0
+    daily_loss: Optional[float] = 1_000.0
+    trailing: str = 'eod'
+    lock_at_start: bool = True
+    use_mae: bool = False
+
+
+def prepare_accounts(df: pd.DataFrame) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Split trades by account into exit-ordered arrays.
+
+    Args:
+        df: Trades with parsed 'Profit' and 'Exit time' columns and
+            optionally 'Account' and 'MAE'
+
+    Returns:
+        Mapping of account id to arrays: profit, mae, day (session index
+        starting at 0) and exit (formatted exit times)
+    """
+    exit_ = parse_timestamps(df['Exit time'])
+    accounts = account_names(df['Account']) if 'Account' in df.columns \
+        else pd.Series('ALL', index=df.index)
+    frame = pd.DataFrame({
+        'account': accounts,
+        'exit': exit_,
+        'session': session_dates(exit_),
+        'profit': df['Profit'].to_numpy(dtype=np.float64),
+        'mae': np.abs(df['MAE'].to_numpy(dtype=np.float64)) if 'MAE' in df.columns else 0.0
+    }).sort_values('exit', kind='stable')
+
+    prepared = {}
+    for account, group in frame.groupby('account', sort=True):
+        prepared[str(account)] = {
+            'profit': group['profit'].to_numpy(),
+            'mae': group['mae'].to_numpy(),
+            'day': pd.factorize(group['session'])[0],
+            'exit': group['exit'].dt.strftime(TIME_FORMAT).to_numpy()
+        }
+    return prepared
+
+
+def evaluate(arrays: Dict[str, np.ndarray], rules: PropRules) -> Dict[str, np.ndarray]:
+    """
+    Evaluate one rule set over one account's trades.
+
+    Args:
+        arrays: One account entry from prepare_accounts()
+        rules: Rule parameters
+
+    Returns:
+        Arrays per trade (balance, threshold in force during the trade,
+        buffer, daily P&L) plus the index and rule of the first breach
+        (-1 and None when no rule is breached)
+    """
+    profit, day = arrays['profit'], arrays['day']
+    start = rules.starting_balance
+    balance = start + np.cumsum(profit)
+    before = balance - profit
+    lock = start if rules.lock_at_start else np.inf
+
+    if rules.trailing == 'intraday':
+        peak = np.maximum.accumulate(np.concatenate(([start], balance)))[:-1]
+    else:
+        last_of_day = np.append(day[1:] != day[:-1], True)
+        # Peak end-of-session balance through the previous session
+        eod_peak = np.maximum.accumulate(np.concatenate(([start], balance[last_of_day])))[:-1]
+        peak = eod_peak[day]
+    threshold = np.minimum(peak - rules.max_loss, lock)
+
+    first_of_day = np.concatenate(([True], day[1:] != day[:-1]))
+    day_start = np.maximum.accumulate(np.where(first_of_day, np.arange(len(day)), 0))
+    daily_pnl = balance - before[day_start]
+
+    low = before - arrays['mae'] if rules.use_mae else balance
+    daily_low = low - before[day_start]
+
+    breaches = {'max_loss': np.flatnonzero(np.minimum(low, balance) <= threshold)}
+    if rules.daily_loss is not None:
+        breaches['daily_loss'] = np.flatnonzero(np.minimum(daily_low, daily_pnl) <= -rules.daily_loss)
+    hits = {rule: int(idx[0]) for rule, idx in breaches.items() if len(idx)}
+    first_rule = min(hits, key=hits.get) if hits else None
+
+    return {
+        'balance': balance,
+        'threshold': threshold,
+        'buffer': balance - threshold,
+        'daily_pnl': daily_pnl,
+        'breach_index': hits[first_rule] if first_rule else -1,
+        'breach_rule': first_rule
+    }
+
+
+def _summary(arrays: Dict[str, np.ndarray], result: Dict[str, Any]) -> Dict[str, Any]:
+    idx = result['breach_index']
+    breach = None
+    if idx >= 0:
+        breach = {
+            "rule": result['breach_rule'],
+            "trade_index": idx,
+            "time": str(arrays['exit'][idx]),
+            "balance": round(float(result['balance'][idx]), 2),
+            "threshold": round(float(result['threshold'][idx]), 2)
+        }
+    return {
+        "trades": len(arrays['profit']),
+        "final_balance": round(float(result['balance'][-1]), 2),
+        "min_buffer": round(float(result['buffer'].min()), 2),
+        "first_breach": breach
+    }
+
+
+def simulate_rules(df: pd.DataFrame, rules: PropRules = PropRules()) -> Optional[Dict[str, Any]]:
+    """
+    Replay the trade table against one rule set, per account.
+
+    Args:
+        df: Trades as accepted by prepare_accounts()
+        rules: Rule parameters
+
+    Returns:
+        Dictionary with the rules and, per account, a summary plus the
+        balance/threshold/buffer paths; None if there are no trades
+    """
+    if df.empty or 'Exit time' not in df.columns:
+        return None
+
+    accounts = {}
+    for account, arrays in prepare_accounts(df).items():
+        result = evaluate(arrays, rules)
+        accounts[account] = {
+            **_summary(arrays, result),
+            "exit_times": arrays['exit'].tolist(),
+            "balance": result['balance'].round(2).tolist(),
+            "threshold": result['threshold'].round(2).tolist(),
+            "buffer": result['buffer'].round(2).tolist()
+        }
+    return {"rules": asdict(rules), "accounts": accounts}
+
+
+def sweep(df: pd.DataFrame, rule_sets: Iterable[PropRules]) -> List[Dict[str, Any]]:
+    """
+    Evaluate many rule sets, returning only per-account summaries.
+
+    Args:
+        df: Trades as accepted by prepare_accounts()
+        rule_sets: Rule parameter sets to evaluate
+
+    Returns:
+        One entry per rule set with the rules and per-account summaries
+    """
+    prepared = prepare_accounts(df)
+    return [
+        {
+            "rules": asdict(rules),
+            "accounts": {account: _summary(arrays, evaluate(arrays, rules))
+                         for account, arrays in prepared.items()}
+        }
+        for rules in rule_sets
+    ]
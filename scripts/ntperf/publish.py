@@ -0,0 +1,300 @@
+"""
+Atomic, versioned publishing of output documents.
+
+Each published document is written once as ``perf.<version>.json``, where
+the version is a hash of its contents, so a version's file never changes
+and can be cached forever. A one-line ``current`` pointer names the live
+version and is swapped with a rename; ``index.json`` lists the retained
+versions, newest last. Rolling back is a pointer swap.
+
+When the new document extends the previous current one, a delta
+``delta.<from>.<to>.json`` (see ntperf.delta) is written alongside it and
+recorded in the index entry as ``delta_from``, so clients can follow the
+chain of deltas from the version they hold.
+
+Documents with analytics also get their 1-minute and 5-minute equity bars
+(ntperf.bars.FINE_RESOLUTIONS, left out of the document to keep it small)
+written as ``bars.<version>.<resolution>.json`` and listed in the entry's
+``bars``, so a dashboard can fetch a fine resolution only when it zooms in.
+
+Readers resolve ``current`` and then open the version file. Version files
+are written before the pointer moves and only versions that have fallen out
+of the retention window are deleted, so a reader never follows the pointer
+to a missing or partial file.
+"""
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from ntperf.delta import make_delta
+from ntperf.errors import OutputWriteError
+from ntperf.output import atomic_write
+
+CURRENT_NAME = 'current'
+INDEX_NAME = 'index.json'
+# Number of versions kept in the index (and on disk)
+DEFAULT_RETAIN = 30
+# Longest delta chain served before falling back to the full snapshot
+MAX_DELTA_CHAIN = 10
+# Sections served to ``sections=core`` clients (keep in sync with src/app/api/perf/route.ts)
+CORE_SECTIONS = ('equity_curve', 'metrics', 'trades')
+# Index fields describing an entry's delta
+_DELTA_FIELDS = ("delta_from", "delta", "delta_bytes", "delta_core_bytes")
+
+
+def version_file(version: str) -> str:
+    return f"perf.{version}.json"
+
+
+def bars_file(version: str, resolution: str) -> str:
+    return f"bars.{version}.{resolution}.json"
+
+
+def delta_file(from_version: str, to_version: str) -> str:
+    return f"delta.{from_version}.{to_version}.json"
+
+
+def content_version(payload: str) -> str:
+    """Version id of a serialized document: the first 16 hex digits of its SHA-256."""
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def read_index(directory: str) -> Dict[str, Any]:
+    """
+    Load the version index of a publish directory.
+
+    Args:
+        directory: Publish directory
+
+    Returns:
+        Index with "current" (None before the first publish) and "versions"
+    """
+    try:
+        with open(os.path.join(directory, INDEX_NAME)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"current": None, "versions": []}
+
+
+def current_version(directory: str) -> Optional[str]:
+    """Version named by the ``current`` pointer, or None if nothing is published."""
+    try:
+        with open(os.path.join(directory, CURRENT_NAME)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def load_version(directory: str, version: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Read a published document.
+
+    Args:
+        directory: Publish directory
+        version: Version to read (default: the current one)
+
+    Returns:
+        The output document
+
+    Raises:
+        ValueError: Nothing is published or the version is unknown
+    """
+    version = version or current_version(directory)
+    if version is None:
+        raise ValueError(f"Nothing has been published to {directory}")
+    try:
+        with open(os.path.join(directory, version_file(version))) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        raise ValueError(f"Unknown version: {version!r}") from None
+
+
+def _write_json(path: str, data: Any, **kwargs) -> None:
+    atomic_write(path, lambda f: json.dump(data, f, **kwargs))
+
+
+def _point_to(directory: str, index: Dict[str, Any], version: str) -> None:
+    """Record ``version`` as current in the index, then swap the pointer."""
+    index["current"] = version
+    _write_json(os.path.join(directory, INDEX_NAME), index, indent=2)
+    atomic_write(os.path.join(directory, CURRENT_NAME), lambda f: f.write(version + '\n'))
+
+
+def _write_bars(directory: str, data: Dict[str, Any], version: str) -> Dict[str, str]:
+    """Write the fine-resolution bars of a version with analytics; resolution -> file."""
+    if "equity_bars" not in data:
+        return {}
+    from ntperf.bars import FINE_RESOLUTIONS, trade_bars
+
+    names = {resolution: bars_file(version, resolution) for resolution in FINE_RESOLUTIONS}
+    missing = [r for r, name in names.items() if not os.path.exists(os.path.join(directory, name))]
+    if missing:
+        for resolution, bars in trade_bars(data.get("trades", []), missing).items():
+            _write_json(os.path.join(directory, names[resolution]), bars, separators=(',', ':'))
+    return names
+
+
+def _write_delta(directory: str, previous: str, data: Dict[str, Any],
+                 version: str) -> Dict[str, Any]:
+    """Write the delta from the previous current version, if there is one."""
+    try:
+        old = load_version(directory, previous)
+    except ValueError:
+        return {}
+    delta = make_delta(old, data, previous, version)
+    if delta is None:
+        return {}
+    payload = json.dumps(delta, separators=(',', ':'))
+    name = delta_file(previous, version)
+    atomic_write(os.path.join(directory, name), lambda f: f.write(payload))
+    # What a core-only client receives: the delta without the analytics patch
+    core = json.dumps(dict(delta, patch=[]), separators=(',', ':'))
+    return {"delta_from": previous, "delta": name, "delta_bytes": len(payload.encode('utf-8')),
+            "delta_core_bytes": len(core.encode('utf-8'))}
+
+
+def publish(data: Dict[str, Any], directory: str, retain: int = DEFAULT_RETAIN,
+            source: Optional[str] = None) -> str:
+    """
+    Publish an output document as a new version and make it current.
+
+    The document is validated first (see ntperf.validate), so an
+    inconsistent document is never published. Publishing a document
+    identical to an existing version reuses that version's file and moves
+    it to the end of the index. A delta from the previous current version is
+    written when the document extends it.
+
+    Args:
+        data: Output document
+        directory: Publish directory (created if missing)
+        retain: Number of versions to keep; older ones are deleted
+        source: Export the document was converted from, recorded in the index
+
+    Returns:
+        The published version id
+
+    Raises:
+        ValidationError: The document fails validation
+        OutputWriteError: A file in the publish directory cannot be written
+    """
+    # Imported here: validation needs NumPy, which plain conversions avoid
+    from ntperf.validate import check
+
+    check(data)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        payload = json.dumps(data, indent=2)
+        version = content_version(payload)
+        path = os.path.join(directory, version_file(version))
+        if not os.path.exists(path):
+            atomic_write(path, lambda f: f.write(payload))
+        bars = _write_bars(directory, data, version)
+
+        index = read_index(directory)
+        previous = index.get("current")
+        entry = {
+            "version": version,
+            "file": version_file(version),
+            "published_at": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            "trades": len(data.get("trades", [])),
+            "bytes": len(payload.encode('utf-8')),
+            "core_bytes": len(json.dumps({key: data.get(key) for key in CORE_SECTIONS},
+                                         separators=(',', ':')).encode('utf-8')),
+            "source": os.path.basename(source) if source else None,
+            "bars": bars,
+            **{key: None for key in _DELTA_FIELDS}
+        }
+        replaced = [v for v in index["versions"] if v["version"] == version]
+        if previous == version:
+            # Republishing the current document keeps its delta
+            for old in replaced:
+                entry.update({key: old.get(key) for key in _DELTA_FIELDS})
+            replaced = []
+        elif previous:
+            entry.update(_write_delta(directory, previous, data, version))
+
+        versions: List[Dict[str, Any]] = [v for v in index["versions"] if v["version"] != version]
+        versions.append(entry)
+        expired = versions[:-retain] if retain > 0 else []
+        index["versions"] = versions[len(expired):]
+        _point_to(directory, index, version)
+
+        stale = [name for old in expired
+                 for name in (old["file"], old.get("delta"), *old.get("bars", {}).values()) if name]
+        # A re-published older version gets a new delta; its old one is stale
+        stale += [old["delta"] for old in replaced if old.get("delta") and old["delta"] != entry["delta"]]
+        for name in stale:
+            try:
+                os.unlink(os.path.join(directory, name))
+            except FileNotFoundError:
+                pass
+    except (OSError, TypeError, ValueError) as e:
+        raise OutputWriteError(f"Error publishing to {directory}: {e}") from e
+    return version
+
+
+def rollback(directory: str, version: str) -> None:
+    """
+    Make a retained version current again.
+
+    Args:
+        directory: Publish directory
+        version: Version id from the index
+
+    Raises:
+        ValueError: The version is not retained
+        OutputWriteError: The pointer cannot be swapped
+    """
+    index = read_index(directory)
+    if not any(v["version"] == version for v in index["versions"]) or \
+            not os.path.exists(os.path.join(directory, version_file(version))):
+        raise ValueError(f"Unknown version: {version!r}")
+    try:
+        _point_to(directory, index, version)
+    except OSError as e:
+        raise OutputWriteError(f"Error publishing to {directory}: {e}") from e
+
+
+def delta_chain(directory: str, since: str, max_deltas: int = MAX_DELTA_CHAIN,
+                core: bool = False) -> Optional[List[str]]:
+    """
+    Delta files that bring a client from ``since`` to the current version.
+
+    Follows ``delta_from`` links back from the current version. The
+    snapshot is preferred when the chain is broken, longer than
+    ``max_deltas``, or larger in total than the snapshot itself.
+
+    Args:
+        directory: Publish directory
+        since: Version the client holds
+        max_deltas: Longest chain worth serving
+        core: The client only wants CORE_SECTIONS, so deltas and snapshot
+            are measured without the analytics sections
+
+    Returns:
+        Delta file names in application order (empty if ``since`` is
+        current), or None if the client should fetch the snapshot
+    """
+    index = read_index(directory)
+    entries = {v["version"]: v for v in index["versions"]}
+    version = index.get("current")
+    if version not in entries:
+        return None
+    # Entries published before core sizes were recorded fall back to full sizes
+    size, delta_size = ("core_bytes", "delta_core_bytes") if core else ("bytes", "delta_bytes")
+    snapshot_bytes = entries[version].get(size) or entries[version]["bytes"]
+
+    chain: List[str] = []
+    total = 0
+    while version != since:
+        entry = entries.get(version)
+        if entry is None or not entry.get("delta") or len(chain) >= max_deltas:
+            return None
+        total += entry.get(delta_size) or entry["delta_bytes"]
+        if total >= snapshot_bytes:
+            return None
+        chain.append(entry["delta"])
+        version = entry["delta_from"]
+    return chain[::-1]
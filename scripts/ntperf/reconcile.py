@@ -0,0 +1,147 @@
+"""
+Reconciliation of the broker's running P&L against the pipeline's equity.
+
+NinjaTrader exports carry their own 'Cum. net profit' column. The pipeline
+rebuilds equity from 'Profit' whenever corrections drop trades, so the two
+are expected to differ by exactly the profit of the dropped trades. The
+export's running total is in export order while the pipeline's equity is
+in exit order, so rows are compared in export order against the running
+sum of the kept trades' profits::
+
+    expected = reported cum. net profit - profit of the trades dropped so far
+    equity   = profit of the trades kept so far
+    gap      = equity - expected
+
+and the pipeline's final equity must equal the last expected value. Money
+is compared in exact cents, so a gap means the export's running total
+disagrees with its own trade profits, and a final discrepancy means the
+pipeline lost or duplicated a trade. The report names the first diverging
+row and the total discrepancy, and is published as the ``reconciliation``
+section of the output document.
+
+reconcile_arrays() is the vectorized form used by the pandas backend;
+reconcile_rows() is the same computation in plain Python for the stdlib
+backend. Both work in integer cents, so their reports are identical.
+"""
+import logging
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from ntperf.money import to_dollars
+
+logger = logging.getLogger(__name__)
+
+# Largest gap in cents still counted as agreement; money is exact, so none
+TOLERANCE = 0
+
+
+def unavailable(rows: int) -> Dict[str, Any]:
+    """Report for an export without a 'Cum. net profit' column."""
+    return {"status": "unavailable", "rows": rows}
+
+
+def _report(rows: int, reported_pnl: int, removed_trades: int, removed_pnl: int,
+            pnl: int, max_gap: int, diverged: int,
+            first: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    discrepancy = pnl - (reported_pnl - removed_pnl)
+    report = {
+        "status": "diverged" if diverged or abs(discrepancy) > TOLERANCE else "ok",
+        "rows": rows,
+        "reported_pnl": to_dollars(reported_pnl),
+        "removed_trades": removed_trades,
+        "removed_pnl": to_dollars(removed_pnl),
+        "pnl": to_dollars(pnl),
+        "discrepancy": to_dollars(discrepancy),
+        "max_gap": to_dollars(max_gap),
+        "diverged_rows": diverged,
+        "first_divergence": first
+    }
+    if diverged:
+        logger.warning(f"Equity diverges from the export's Cum. net profit on {diverged} row(s), "
+                       f"first at row {first['row']} ({first['exit_time']}): gap {first['gap']:.2f}, "
+                       f"total discrepancy {report['discrepancy']:.2f}")
+    elif report["status"] == "diverged":
+        logger.warning(f"Final equity differs from the export's Cum. net profit by "
+                       f"{report['discrepancy']:.2f}")
+    return report
+
+
+def _divergence(row: int, exit_time: str, reported: int, expected: int,
+                equity: int) -> Dict[str, Any]:
+    return {
+        "row": row + 1,
+        "exit_time": exit_time,
+        "reported": to_dollars(reported),
+        "expected": to_dollars(expected),
+        "equity": to_dollars(equity),
+        "gap": to_dollars(equity - expected)
+    }
+
+
+def reconcile_arrays(reported: Any, profits: Any, kept: Any, pnl: int,
+                     exit_time: Callable[[int], str],
+                     tolerance: int = TOLERANCE) -> Dict[str, Any]:
+    """
+    Compare broker and pipeline equity at every row with NumPy.
+
+    Args:
+        reported: Broker 'Cum. net profit' per export row, in cents
+        profits: 'Profit' per export row, in cents
+        kept: Boolean mask of rows that survived corrections
+        pnl: Pipeline's final equity in cents
+        exit_time: Formatted exit time of an export row
+        tolerance: Largest gap in cents counted as agreement
+
+    Returns:
+        Reconciliation report, in dollars
+    """
+    import numpy as np
+
+    reported = np.asarray(reported, dtype=np.int64)
+    profits = np.asarray(profits, dtype=np.int64)
+    kept = np.asarray(kept, dtype=bool)
+
+    removed = np.cumsum(np.where(kept, 0, profits))
+    equity = np.cumsum(np.where(kept, profits, 0))
+    expected = reported - removed
+    gap = np.where(kept, np.abs(equity - expected), 0)
+    diverged = gap > tolerance
+    count = int(diverged.sum())
+    first = None
+    if count:
+        i = int(np.argmax(diverged))
+        first = _divergence(i, exit_time(i), int(reported[i]), int(expected[i]), int(equity[i]))
+
+    rows = int(kept.sum())
+    return _report(rows, int(reported[-1]) if len(reported) else 0, len(kept) - rows,
+                   int(removed[-1]) if len(removed) else 0, int(pnl),
+                   int(gap.max()) if len(gap) else 0, count, first)
+
+
+def reconcile_rows(reported: Sequence[int], profits: Sequence[int], kept: Sequence[bool],
+                   pnl: int, exit_time: Callable[[int], str],
+                   tolerance: int = TOLERANCE) -> Dict[str, Any]:
+    """
+    Compare broker and pipeline equity at every row in plain Python.
+
+    Same arguments and report as reconcile_arrays().
+    """
+    removed = 0
+    equity = 0
+    max_gap = 0
+    count = 0
+    first = None
+    for i, (total, profit, keep) in enumerate(zip(reported, profits, kept)):
+        if not keep:
+            removed += profit
+            continue
+        equity += profit
+        expected = total - removed
+        gap = abs(equity - expected)
+        max_gap = max(max_gap, gap)
+        if gap > tolerance:
+            count += 1
+            if first is None:
+                first = _divergence(i, exit_time(i), total, expected, equity)
+    rows = sum(1 for keep in kept if keep)
+    return _report(rows, reported[-1] if len(reported) else 0, len(kept) - rows, removed,
+                   pnl, max_gap, count, first)
@@ -0,0 +1,26 @@
+"""
+Column names and formats of NinjaTrader Grid exports and converter output.
+
+Kept free of third-party imports so the stdlib backend can share them.
+"""
+
+# Columns every export must have
+REQUIRED_COLUMNS = ['Entry time', 'Exit time', 'Instrument', 'Market pos.', 'Qty',
+                    'Entry price', 'Exit price', 'Profit']
+
+# Columns copied into each record of the output "trades" list
+TRADE_COLUMNS = REQUIRED_COLUMNS
+
+# Money columns in a NinjaTrader Grid export. All are formatted like "$162.50"
+# with losses shown as "($42.75)".
+MONEY_COLUMNS = ['Profit', 'Cum. net profit', 'Commission', 'MAE', 'MFE', 'ETD']
+
+# Exact int64 cents kept next to the money columns that are summed; the
+# float dollar columns are derived from them
+CENTS_COLUMNS = {'Profit': 'Profit cents', 'Cum. net profit': 'Cum. net profit cents'}
+
+# NinjaTrader Grid timestamp layout, e.g. "4/30/2025 9:45:30 AM"
+NT_TIMESTAMP_FORMAT = '%m/%d/%Y %I:%M:%S %p'
+
+# Timestamp layout used throughout the output document
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
@@ -0,0 +1,312 @@
+"""
+Local HTTP query service over the trade store.
+
+The service loads the newest export once into a TradeStore and answers
+JSON queries from its indexes, so /api/trading-data can proxy small,
+filtered responses instead of shipping the raw CSV to the browser:
+
+    GET  /trades?start=2025-05-01&end=2025-05-31&instrument=MNQ 06-25&side=long&offset=0&limit=100
+    GET  /aggregate?group_by=date|instrument|side[&start=&end=&instrument=&side=]
+    GET  /health
+    POST /ingest[?path=<export>]
+
+Encoded responses are kept in an LRU cache keyed by the store generation,
+so ingesting a new export (through POST /ingest, or automatically when a
+newer export appears in the watched directory) invalidates every cached
+response at once. Only the standard library is used.
+"""
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Hashable, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from ntperf.errors import ConversionError
+from ntperf.profiling import DEFAULT_TOP, profiled
+from ntperf.store import DEFAULT_PAGE_SIZE, TradeStore, parse_bound, parse_side
+from ntperf.watch import DEFAULT_INTERVAL, DEFAULT_SETTLE, EXPORT_PATTERN, latest_export, scan
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+# Encoded responses kept per store generation
+DEFAULT_CACHE_SIZE = 256
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache of encoded responses.
+
+    Args:
+        maxsize: Number of responses to keep
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Hashable, bytes]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key: Hashable, body: bytes) -> None:
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class TradeService:
+    """
+    Current trade store plus its response cache.
+
+    Args:
+        directory: Directory the exports are dropped into
+        corrections: Correction profile name
+        cache_size: Responses kept in the LRU cache
+        pattern: Glob matched against export file names
+        profile_dir: Directory to write a cProfile of each ingest to
+        profile_top: Functions listed in each profile report
+    """
+
+    def __init__(self, directory: str, corrections: str = 'default',
+                 cache_size: int = DEFAULT_CACHE_SIZE, pattern: str = EXPORT_PATTERN,
+                 profile_dir: Optional[str] = None, profile_top: int = DEFAULT_TOP):
+        self.directory = directory
+        self.profile_dir = profile_dir
+        self.profile_top = profile_top
+        self.corrections = corrections
+        self.pattern = pattern
+        self.cache = ResponseCache(cache_size)
+        self.store: Optional[TradeStore] = None
+        self.generation = 0
+        self._stat: Optional[Tuple[int, int]] = None
+        self._lock = threading.Lock()
+
+    def ingest(self, path: Optional[str] = None) -> TradeStore:
+        """
+        Load an export, make it current and drop every cached response.
+
+        Args:
+            path: Export to load (default: the newest one in the directory)
+
+        Returns:
+            The new store
+
+        Raises:
+            ConversionError: The export cannot be read
+            ValueError: There is no export to load
+        """
+        path = path or latest_export(scan(self.directory, self.pattern))
+        if path is None:
+            raise ValueError(f"No export matching '{self.pattern}' in {self.directory}")
+        stat = os.stat(path)
+        with profiled('trade_server-ingest', [path], self.profile_dir, self.profile_top):
+            store = TradeStore.load(path, self.corrections)
+        with self._lock:
+            self.store = store
+            self._stat = (stat.st_size, stat.st_mtime_ns)
+            self.generation += 1
+            self.cache.clear()
+        logger.info(f"Loaded {len(store)} trades from {os.path.basename(path)}")
+        return store
+
+    def refresh(self) -> bool:
+        """Ingest the newest export if it differs from the loaded one."""
+        exports = scan(self.directory, self.pattern)
+        latest = latest_export(exports)
+        if latest is None:
+            return False
+        store = self.store
+        if store is not None and store.source == latest and exports[latest] == self._stat:
+            return False
+        self.ingest(latest)
+        return True
+
+    def respond(self, route: str, params: Dict[str, str]) -> Tuple[bytes, bool]:
+        """
+        Encoded JSON answer to a query, from the cache when possible.
+
+        Args:
+            route: 'trades' or 'aggregate'
+            params: Query-string parameters
+
+        Returns:
+            Response body and whether it came from the cache
+
+        Raises:
+            ValueError: A parameter is invalid or nothing is loaded
+        """
+        with self._lock:
+            store, generation = self.store, self.generation
+        if store is None:
+            raise ValueError("No export has been loaded")
+        key = (generation, route, tuple(sorted(params.items())))
+        body = self.cache.get(key)
+        if body is not None:
+            return body, True
+
+        filters = {
+            "start": parse_bound(params.get('start')),
+            "end": parse_bound(params.get('end'), end=True),
+            "instrument": params.get('instrument') or None,
+            "side": parse_side(params.get('side'))
+        }
+        if route == 'trades':
+            result = store.query(offset=int(params.get('offset', 0)),
+                                 limit=int(params.get('limit', DEFAULT_PAGE_SIZE)), **filters)
+        else:
+            result = store.aggregate(params.get('group_by', 'date'), **filters)
+        body = json.dumps(result, separators=(',', ':')).encode('utf-8')
+        self.cache.put(key, body)
+        return body, False
+
+    def health(self) -> Dict[str, Any]:
+        store = self.store
+        return {
+            "source": os.path.basename(store.source) if store and store.source else None,
+            "trades": len(store) if store else 0,
+            "generation": self.generation,
+            "loaded_at": store.loaded_at if store else None,
+            "reconciliation": store.table.reconciliation if store else None,
+            "cache": {"size": len(self.cache), "hits": self.cache.hits, "misses": self.cache.misses}
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    service: TradeService
+
+    def _send(self, status: int, body: bytes, cache: Optional[str] = None) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if cache:
+            self.send_header('X-Cache', cache)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, data: Any) -> None:
+        self._send(status, json.dumps(data).encode('utf-8'))
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        route = url.path.strip('/')
+        if route == 'health':
+            self._send_json(HTTPStatus.OK, self.service.health())
+            return
+        if route not in ('trades', 'aggregate'):
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": f"Unknown endpoint: {url.path}"})
+            return
+        try:
+            body, hit = self.service.respond(route, dict(parse_qsl(url.query)))
+        except ValueError as e:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+            return
+        self._send(HTTPStatus.OK, body, cache='hit' if hit else 'miss')
+
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        if url.path.strip('/') != 'ingest':
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": f"Unknown endpoint: {url.path}"})
+            return
+        path = dict(parse_qsl(url.query)).get('path')
+        if path is not None:
+            # Only exports inside the served directory may be ingested
+            directory = os.path.realpath(self.service.directory)
+            path = os.path.realpath(os.path.join(directory, path))
+            if os.path.dirname(path) != directory:
+                self._send_json(HTTPStatus.BAD_REQUEST, {"error": "path must name an export in the served directory"})
+                return
+        try:
+            self.service.ingest(path)
+        except (ConversionError, OSError, ValueError) as e:
+            self._send_json(HTTPStatus.UNPROCESSABLE_ENTITY, {"error": str(e)})
+            return
+        self._send_json(HTTPStatus.OK, self.service.health())
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+def _refresh_loop(service: TradeService, interval: float, settle: float,
+                  stop: threading.Event) -> None:
+    """Ingest newer exports once they have stopped changing."""
+    seen: Optional[Tuple[str, Tuple[int, int]]] = None
+    while not stop.wait(interval):
+        try:
+            exports = scan(service.directory, service.pattern)
+            latest = latest_export(exports)
+            if latest is None:
+                continue
+            if seen != (latest, exports[latest]):
+                # Changed since the last look: wait for it to settle
+                seen = (latest, exports[latest])
+                stop.wait(max(0.0, settle - interval))
+                continue
+            service.refresh()
+        except (ConversionError, OSError) as e:
+            logger.error(f"Ingest failed: {e}")
+
+
+def serve(directory: str, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+          corrections: str = 'default', cache_size: int = DEFAULT_CACHE_SIZE,
+          interval: float = DEFAULT_INTERVAL, settle: float = DEFAULT_SETTLE,
+          watch: bool = True, profile_dir: Optional[str] = None,
+          profile_top: int = DEFAULT_TOP) -> None:
+    """
+    Load the newest export and serve queries until interrupted.
+
+    Args:
+        directory: Directory the exports are dropped into
+        host: Interface to bind
+        port: Port to bind
+        corrections: Correction profile name
+        cache_size: Responses kept in the LRU cache
+        interval: Seconds between checks for a newer export
+        settle: Quiet period in seconds before a changed export is ingested
+        watch: Ingest newer exports automatically
+        profile_dir: Directory to write a cProfile of each ingest to
+        profile_top: Functions listed in each profile report
+
+    Raises:
+        ConversionError: The initial export cannot be read
+        ValueError: There is no export to load
+    """
+    service = TradeService(directory, corrections=corrections, cache_size=cache_size,
+                           profile_dir=profile_dir, profile_top=profile_top)
+    service.ingest()
+
+    handler = type('TradeHandler', (_Handler,), {'service': service})
+    server = ThreadingHTTPServer((host, port), handler)
+    stop = threading.Event()
+    if watch:
+        threading.Thread(target=_refresh_loop, args=(service, interval, settle, stop),
+                         daemon=True).start()
+    logger.info(f"Serving trade queries on http://{host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    finally:
+        stop.set()
+        server.server_close()
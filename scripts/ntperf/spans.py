@@ -0,0 +1,198 @@
+"""
+Per-stage timing and memory instrumentation.
+
+Pipeline stages are wrapped in spans:
+
+    with span('read') as s:
+        df = pd.read_csv(path)
+        s.rows = len(df)
+
+Spans are off by default: span() then returns a shared no-op object, so an
+instrumented stage costs one global lookup. When enabled, with enable() or
+the NTPERF_SPANS environment variable ("table" or "jsonl"), each span
+records wall time, CPU time, an optional row count and the peak memory
+traced by tracemalloc while it ran (nested spans included). "jsonl" writes
+one JSON object per finished span; "table" prints a summary when
+report() is called or the process exits.
+"""
+import atexit
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, IO, List, Optional
+
+MODES = ('table', 'jsonl')
+ENV_VAR = 'NTPERF_SPANS'
+
+
+class _NullSpan:
+    """Span used while instrumentation is off; ignores everything."""
+    rows: Optional[int] = None
+
+    def __enter__(self) -> '_NullSpan':
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+
+_NULL = _NullSpan()
+
+
+class Span:
+    """
+    One timed stage.
+
+    Attributes:
+        name: Stage name
+        depth: Nesting level (0 for top-level spans)
+        rows: Rows processed, if the stage sets it
+        wall: Wall-clock seconds
+        cpu: CPU seconds of this process
+        peak_bytes: Peak traced memory above what was live at entry
+    """
+    __slots__ = ('name', 'depth', 'rows', 'wall', 'cpu', 'peak_bytes',
+                 '_start', '_cpu_start', '_mem_start', '_peak_seen')
+
+    def __init__(self, name: str, depth: int):
+        self.name = name
+        self.depth = depth
+        self.rows: Optional[int] = None
+        self.wall = self.cpu = 0.0
+        self.peak_bytes: Optional[int] = None
+
+    def __enter__(self) -> 'Span':
+        if _recorder.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if _recorder.stack:
+                # reset_peak() below would lose the enclosing span's peak so far
+                parent = _recorder.stack[-1]
+                parent._peak_seen = max(parent._peak_seen, peak)
+            tracemalloc.reset_peak()
+            self._mem_start = self._peak_seen = current
+        _recorder.stack.append(self)
+        self._cpu_start = time.process_time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.wall = time.perf_counter() - self._start
+        self.cpu = time.process_time() - self._cpu_start
+        _recorder.stack.pop()
+        if _recorder.memory:
+            peak = max(self._peak_seen, tracemalloc.get_traced_memory()[1])
+            self.peak_bytes = peak - self._mem_start
+            if _recorder.stack:
+                parent = _recorder.stack[-1]
+                parent._peak_seen = max(parent._peak_seen, peak)
+        _recorder.finish(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "span": self.name,
+            "depth": self.depth,
+            "wall_s": round(self.wall, 6),
+            "cpu_s": round(self.cpu, 6),
+            "rows": self.rows,
+            "peak_bytes": self.peak_bytes
+        }
+
+
+class _Recorder:
+    def __init__(self):
+        self.mode: Optional[str] = None
+        self.memory = False
+        self.stream: IO[str] = sys.stderr
+        self.stack: List[Span] = []
+        self.spans: List[Span] = []
+        self._started_tracing = False
+
+    def finish(self, span: Span) -> None:
+        if self.mode == 'jsonl':
+            self.stream.write(json.dumps(span.to_dict()) + '\n')
+        else:
+            self.spans.append(span)
+
+
+_recorder = _Recorder()
+
+
+def enabled() -> bool:
+    return _recorder.mode is not None
+
+
+def enable(mode: str = 'table', stream: Optional[IO[str]] = None, memory: bool = True) -> None:
+    """
+    Turn instrumentation on for the rest of the process.
+
+    Args:
+        mode: 'table' (summary at report() or exit) or 'jsonl' (one line per span)
+        stream: Where to write (default: stderr)
+        memory: Trace allocations to report each span's peak memory; this
+            slows allocation-heavy stages down noticeably
+
+    Raises:
+        ValueError: The mode is unknown
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown span mode: {mode!r}")
+    if _recorder.mode is None and mode == 'table':
+        atexit.register(report)
+    _recorder.mode = mode
+    _recorder.stream = stream or sys.stderr
+    _recorder.memory = memory
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _recorder._started_tracing = True
+
+
+def disable() -> None:
+    """Turn instrumentation off and drop unreported spans."""
+    _recorder.mode = None
+    _recorder.spans.clear()
+    if _recorder._started_tracing:
+        tracemalloc.stop()
+        _recorder._started_tracing = False
+    _recorder.memory = False
+
+
+def span(name: str) -> Any:
+    """
+    Context manager timing one stage.
+
+    Args:
+        name: Stage name
+
+    Returns:
+        A Span (or a no-op stand-in when instrumentation is off) whose
+        ``rows`` attribute the stage may set
+    """
+    if _recorder.mode is None:
+        return _NULL
+    return Span(name, len(_recorder.stack))
+
+
+def format_table(spans: List[Span]) -> str:
+    """Render finished spans, nested stages indented under their parent."""
+    lines = [f"{'Stage':<28} {'Wall s':>9} {'CPU s':>9} {'Rows':>9} {'Peak MB':>9}"]
+    for s in spans:
+        rows = f"{s.rows:,}" if s.rows is not None else ''
+        peak = f"{s.peak_bytes / 1e6:.1f}" if s.peak_bytes is not None else ''
+        lines.append(f"{'  ' * s.depth + s.name:<28} {s.wall:>9.4f} {s.cpu:>9.4f} {rows:>9} {peak:>9}")
+    return '\n'.join(lines)
+
+
+def report() -> None:
+    """Print the spans finished since the last report (table mode) and clear them."""
+    if _recorder.mode != 'table' or not _recorder.spans:
+        return
+    # Spans finish innermost first; show them in the order they started
+    spans = sorted(_recorder.spans, key=lambda s: s._start)
+    _recorder.stream.write(format_table(spans) + '\n')
+    _recorder.spans.clear()
+
+
+if os.environ.get(ENV_VAR) in MODES:
+    enable(os.environ[ENV_VAR])
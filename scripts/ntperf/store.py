@@ -0,0 +1,242 @@
+"""
+Indexed, in-memory trade store for the query service.
+
+A TradeStore holds one corrected export (a ntperf.lite TradeTable) and
+answers filtered and aggregate queries without rescanning it. For every
+combination of instrument filter and side filter (either may be "any") it
+keeps the matching rows sorted by exit time together with prefix sums of
+profit (in exact cents), wins and losses. A date-range query is then two binary searches,
+a page is a slice, and the totals of any range are a subtraction.
+
+Trades are bucketed by the date and time they exited, as in the equity
+curve and the daily returns behind the metrics.
+"""
+import bisect
+import time
+from array import array
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+from typing import Any, Dict, List, Optional, Tuple
+
+from ntperf import lite
+from ntperf.money import to_dollars, to_price
+from ntperf.tradefile import EPOCH
+
+SIDES = ('Long', 'Short')
+GROUP_BY = ('date', 'instrument', 'side')
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+_DAY = 86_400
+
+# (instrument or None, side or None); None matches every value
+IndexKey = Tuple[Optional[str], Optional[str]]
+
+
+class _Index:
+    """Rows matching one filter combination, in exit order, with prefix sums."""
+    __slots__ = ('rows', 'exit', 'pnl', 'wins', 'losses')
+
+    def __init__(self, table: lite.TradeTable, rows: List[int]):
+        self.rows = array('q', rows)
+        self.exit = array('q', (table.exit[i] for i in rows))
+        profits = [table.profit[i] for i in rows]
+        self.pnl = array('q', accumulate(profits, initial=0))
+        self.wins = array('q', accumulate((p > 0 for p in profits), initial=0))
+        self.losses = array('q', accumulate((p < 0 for p in profits), initial=0))
+
+    def span(self, start: Optional[int], end: Optional[int]) -> Tuple[int, int]:
+        """Positions of the rows exiting in [start, end)."""
+        lo = 0 if start is None else bisect.bisect_left(self.exit, start)
+        hi = len(self.exit) if end is None else bisect.bisect_left(self.exit, end)
+        return lo, max(lo, hi)
+
+    def totals(self, lo: int, hi: int) -> Dict[str, Any]:
+        trades = hi - lo
+        wins = self.wins[hi] - self.wins[lo]
+        return {
+            "trades": trades,
+            "pnl": to_dollars(self.pnl[hi] - self.pnl[lo]),
+            "wins": wins,
+            "losses": self.losses[hi] - self.losses[lo],
+            "win_rate": wins / trades if trades else 0.0
+        }
+
+
+def parse_bound(text: Optional[str], end: bool = False) -> Optional[int]:
+    """
+    Parse a date-range bound to epoch seconds.
+
+    Args:
+        text: "YYYY-MM-DD" or "YYYY-MM-DD HH:MM:SS"; None or blank for open
+        end: Treat the bound as an inclusive end, so a bare date covers
+            the whole day
+
+    Returns:
+        Exclusive end or inclusive start in epoch seconds, or None
+
+    Raises:
+        ValueError: The bound is not a date or timestamp
+    """
+    if not text:
+        return None
+    text = text.strip()
+    if len(text) == 10:
+        seconds = (date.fromisoformat(text) - EPOCH.date()).days * _DAY
+        return seconds + _DAY if end else seconds
+    seconds = int((datetime.fromisoformat(text) - EPOCH).total_seconds())
+    return seconds + 1 if end else seconds
+
+
+def parse_side(text: Optional[str]) -> Optional[str]:
+    """Normalize a side filter ("long", "SHORT", ...) to the export spelling."""
+    if not text:
+        return None
+    for side in SIDES:
+        if text.strip().lower() == side.lower():
+            return side
+    raise ValueError(f"Unknown side: {text!r}")
+
+
+class TradeStore:
+    """
+    Read-only, indexed view of one corrected export.
+
+    Args:
+        table: Corrected TradeTable
+        source: Export the table was loaded from
+    """
+
+    def __init__(self, table: lite.TradeTable, source: Optional[str] = None):
+        self.table = table
+        self.source = source
+        self.loaded_at = time.time()
+        order = sorted(range(len(table)), key=table.exit.__getitem__)
+        self.instruments = sorted({x for x in table.instrument if isinstance(x, str)})
+
+        groups: Dict[IndexKey, List[int]] = {}
+        for i in order:
+            instrument, side = table.instrument[i], table.position[i]
+            for key in ((None, None), (instrument, None), (None, side), (instrument, side)):
+                groups.setdefault(key, []).append(i)
+        groups.setdefault((None, None), [])
+        self._indexes = {key: _Index(table, rows) for key, rows in groups.items()}
+        self._empty = _Index(table, [])
+
+    @classmethod
+    def load(cls, path: str, corrections: str = 'default') -> 'TradeStore':
+        """
+        Read and correct an export with the stdlib backend.
+
+        Args:
+            path: Path to the CSV export
+            corrections: Correction profile name
+
+        Returns:
+            TradeStore over the corrected trades
+
+        Raises:
+            ExportReadError: The export cannot be read
+            MissingColumnError: A required column is absent
+        """
+        return cls(lite.load_export(path, corrections), source=path)
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def _index(self, instrument: Optional[str], side: Optional[str]) -> _Index:
+        return self._indexes.get((instrument or None, side or None), self._empty)
+
+    def _record(self, i: int) -> Dict[str, Any]:
+        table = self.table
+        return {
+            'Entry time': lite.format_timestamp(table.entry[i]),
+            'Exit time': lite.format_timestamp(table.exit[i]),
+            'Instrument': table.instrument[i],
+            'Market pos.': table.position[i],
+            'Qty': table.qty[i],
+            'Entry price': to_price(table.entry_price[i], table.scale[i]),
+            'Exit price': to_price(table.exit_price[i], table.scale[i]),
+            'Profit': to_dollars(table.profit[i])
+        }
+
+    def query(self, start: Optional[int] = None, end: Optional[int] = None,
+              instrument: Optional[str] = None, side: Optional[str] = None,
+              offset: int = 0, limit: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+        """
+        One page of the trades matching a filter, in exit order.
+
+        Args:
+            start: First exit time included, in epoch seconds
+            end: Exit time at which the range stops (exclusive)
+            instrument: Instrument to match exactly
+            side: "Long" or "Short"
+            offset: Matching trades to skip
+            limit: Page size, at most MAX_PAGE_SIZE
+
+        Returns:
+            Page with "total", "offset", "limit", "summary" and "trades"
+
+        Raises:
+            ValueError: offset or limit is out of range
+        """
+        if offset < 0 or not 0 < limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"offset must be >= 0 and limit between 1 and {MAX_PAGE_SIZE}")
+        index = self._index(instrument, side)
+        lo, hi = index.span(start, end)
+        page = index.rows[min(lo + offset, hi):min(lo + offset + limit, hi)]
+        return {
+            "total": hi - lo,
+            "offset": offset,
+            "limit": limit,
+            "summary": index.totals(lo, hi),
+            "trades": [self._record(i) for i in page]
+        }
+
+    def aggregate(self, group_by: str, start: Optional[int] = None, end: Optional[int] = None,
+                  instrument: Optional[str] = None, side: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Trade count, P&L, wins, losses and win rate per group.
+
+        Args:
+            group_by: 'date' (exit date), 'instrument' or 'side'
+            start: First exit time included, in epoch seconds
+            end: Exit time at which the range stops (exclusive)
+            instrument: Instrument to match exactly
+            side: "Long" or "Short"
+
+        Returns:
+            Document with "group_by", "total" and one entry per non-empty group
+
+        Raises:
+            ValueError: group_by is unknown
+        """
+        if group_by not in GROUP_BY:
+            raise ValueError(f"Unknown group_by: {group_by!r}")
+        index = self._index(instrument, side)
+        lo, hi = index.span(start, end)
+        groups = []
+        if group_by == 'date':
+            while lo < hi:
+                day = index.exit[lo] // _DAY
+                next_lo = min(hi, bisect.bisect_left(index.exit, (day + 1) * _DAY, lo, hi))
+                groups.append({"key": (EPOCH + timedelta(days=day)).strftime('%Y-%m-%d'),
+                               **index.totals(lo, next_lo)})
+                lo = next_lo
+        else:
+            keys = [(name, side) for name in self.instruments] if group_by == 'instrument' \
+                else [(instrument, name) for name in SIDES]
+            for key_instrument, key_side in keys:
+                if (group_by == 'instrument' and instrument and key_instrument != instrument) or \
+                        (group_by == 'side' and side and key_side != side):
+                    continue
+                group = self._index(key_instrument, key_side)
+                g_lo, g_hi = group.span(start, end)
+                if g_hi > g_lo:
+                    groups.append({"key": key_instrument if group_by == 'instrument' else key_side,
+                                   **group.totals(g_lo, g_hi)})
+        return {
+            "group_by": group_by,
+            "total": index.totals(*index.span(start, end)),
+            "groups": groups
+        }
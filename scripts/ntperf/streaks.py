@@ -0,0 +1,91 @@
+"""
+Win/loss streak analysis via run-length encoding.
+
+Trades are encoded by the sign of their profit in exit order and collapsed
+into runs with NumPy, so the whole analysis is a handful of array passes
+regardless of export size. Break-even trades form their own runs and
+therefore end any winning or losing streak.
+"""
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def run_lengths(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Run-length encode a 1-D array.
+
+    Args:
+        values: Array to encode
+
+    Returns:
+        Tuple of (run start indices, run lengths, run values)
+    """
+    n = len(values)
+    if n == 0:
+        empty = np.array([], dtype=np.int64)
+        return empty, empty, values[:0]
+    starts = np.concatenate(([0], np.flatnonzero(values[1:] != values[:-1]) + 1))
+    lengths = np.diff(np.append(starts, n))
+    return starts, lengths, values[starts]
+
+
+def compute_streaks(df: pd.DataFrame) -> Optional[Dict[str, Any]]:
+    """
+    Compute streak statistics over the trades in df.
+
+    Args:
+        df: Trades with a parsed 'Profit' column; sorted by 'Exit time'
+            when that column is present
+
+    Returns:
+        Dictionary with longest/current streaks, streak-length distributions
+        and next-trade P&L conditioned on the preceding losing streak, or
+        None if there are no trades
+    """
+    if df.empty:
+        return None
+
+    if 'Exit time' in df.columns:
+        df = df.sort_values('Exit time', kind='stable')
+    profit = df['Profit'].to_numpy(dtype='float64')
+    sign = np.sign(profit).astype(np.int8)
+    starts, lengths, values = run_lengths(sign)
+
+    win_runs = lengths[values > 0]
+    loss_runs = lengths[values < 0]
+    run_pnl = np.add.reduceat(profit, starts)
+
+    # Number of consecutive losses immediately before each trade
+    position_in_run = np.arange(len(sign)) - np.repeat(starts, lengths)
+    losses_before = np.zeros(len(sign), dtype=np.int64)
+    losses_before[1:] = np.where(sign[:-1] < 0, position_in_run[:-1] + 1, 0)
+    size = int(losses_before.max()) + 1
+    after_count = np.bincount(losses_before, minlength=size)
+    after_pnl = np.bincount(losses_before, weights=profit, minlength=size)
+    after_wins = np.bincount(losses_before, weights=(profit > 0), minlength=size)
+    after_avg = after_pnl / np.maximum(after_count, 1)
+
+    current_value = int(values[-1])
+
+    return {
+        "longest_win": int(win_runs.max()) if len(win_runs) else 0,
+        "longest_loss": int(loss_runs.max()) if len(loss_runs) else 0,
+        "current": {
+            "type": "win" if current_value > 0 else "loss" if current_value < 0 else "flat",
+            "length": int(lengths[-1])
+        },
+        # Index i holds the number of streaks of length i
+        "win_lengths": np.bincount(win_runs).tolist() if len(win_runs) else [0],
+        "loss_lengths": np.bincount(loss_runs).tolist() if len(loss_runs) else [0],
+        "best_winning_run_pnl": float(run_pnl[values > 0].max()) if len(win_runs) else 0.0,
+        "worst_losing_run_pnl": float(run_pnl[values < 0].min()) if len(loss_runs) else 0.0,
+        # Index n describes the trade taken right after exactly n losses in a row
+        "after_losses": {
+            "count": after_count.tolist(),
+            "pnl": after_pnl.round(2).tolist(),
+            "wins": after_wins.astype(np.int64).tolist(),
+            "avg_pnl": after_avg.round(2).tolist()
+        }
+    }
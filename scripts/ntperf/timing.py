@@ -0,0 +1,92 @@
+"""
+Holding-time and time-of-day/day-of-week performance profiles.
+
+All profiles are fixed-length arrays (24 hours, 48 half-hours, 7 weekdays,
+a 7x24 heatmap) built with ``np.bincount`` so the dashboard can index them
+directly without aggregating trades on the client.
+"""
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ntperf.parsing import parse_timestamps
+
+WEEKDAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+
+# Holding-time bin edges in seconds: [0, 1) then four log-spaced bins per
+# decade up to 1e5 s (~28 h). Longer holds land in the last bin.
+HOLDING_EDGES = np.concatenate(([0.0], np.logspace(0, 5, 21)))
+
+
+def _bucket_profile(bucket: np.ndarray, profit: np.ndarray, size: int) -> Dict[str, List]:
+    """
+    Sum P&L, trade count and winners per bucket.
+
+    Args:
+        bucket: Integer bucket index per trade, in [0, size)
+        profit: Profit per trade
+        size: Number of buckets
+
+    Returns:
+        Dictionary of equally sized pnl/count/wins lists
+    """
+    return {
+        "pnl": np.bincount(bucket, weights=profit, minlength=size).round(2).tolist(),
+        "count": np.bincount(bucket, minlength=size).tolist(),
+        "wins": np.bincount(bucket, weights=(profit > 0), minlength=size).astype(np.int64).tolist()
+    }
+
+
+def compute_timing(df: pd.DataFrame) -> Optional[Dict[str, Any]]:
+    """
+    Compute holding-time distribution and P&L by entry time and weekday.
+
+    Args:
+        df: Trades with 'Entry time', 'Exit time' and parsed 'Profit' columns
+
+    Returns:
+        Dictionary of histogram/heatmap arrays, or None if the export has
+        no entry/exit timestamps
+    """
+    if not {'Entry time', 'Exit time'}.issubset(df.columns) or df.empty:
+        return None
+
+    entry = parse_timestamps(df['Entry time'])
+    exit_ = parse_timestamps(df['Exit time'])
+    profit = df['Profit'].to_numpy(dtype='float64')
+
+    seconds = (exit_ - entry).dt.total_seconds().to_numpy(dtype='float64')
+    seconds = np.clip(np.nan_to_num(seconds, nan=0.0), 0.0, None)
+    hold_bucket = np.clip(np.searchsorted(HOLDING_EDGES, seconds, side='right') - 1,
+                          0, len(HOLDING_EDGES) - 2)
+    n_hold = len(HOLDING_EDGES) - 1
+    holding = _bucket_profile(hold_bucket, profit, n_hold)
+    holding["losses"] = np.bincount(hold_bucket, weights=(profit < 0),
+                                    minlength=n_hold).astype(np.int64).tolist()
+
+    hour = entry.dt.hour.to_numpy(dtype=np.int64)
+    half_hour = hour * 2 + (entry.dt.minute.to_numpy(dtype=np.int64) >= 30)
+    weekday = entry.dt.weekday.to_numpy(dtype=np.int64)
+
+    heatmap = np.bincount(weekday * 24 + hour, weights=profit, minlength=7 * 24)
+
+    return {
+        "holding_time": {
+            "edges": [round(float(x), 2) for x in HOLDING_EDGES],
+            **holding,
+            "mean_seconds": float(seconds.mean()),
+            "median_seconds": float(np.median(seconds))
+        },
+        "by_hour": _bucket_profile(hour, profit, 24),
+        "by_half_hour": _bucket_profile(half_hour, profit, 48),
+        "by_weekday": {
+            "labels": WEEKDAYS,
+            **_bucket_profile(weekday, profit, 7)
+        },
+        "heatmap": {
+            "rows": WEEKDAYS,
+            "columns": list(range(24)),
+            "pnl": heatmap.reshape(7, 24).round(2).tolist()
+        }
+    }
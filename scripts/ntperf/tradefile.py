@@ -0,0 +1,325 @@
+"""
+Compact, write-back capable trade table for the csv-based maintenance scripts.
+
+The data-generation scripts read an export, filter, copy and re-sort trades
+and write the export back out. Instead of keeping each trade as a list of
+strings and re-parsing its timestamps on every filter, group and sort, a
+TradeFile parses the cells it needs once into parallel ``array`` columns
+(int64 epoch seconds for timestamps, int64 cents for profit) and interns the
+raw cells, which repeat heavily (instrument, account, signal names). The raw
+cells are kept so untouched trades are written back byte for byte.
+
+Only the standard library is used, so the scripts start instantly.
+"""
+import csv
+import sys
+from array import array
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+
+from ntperf.money import dollars_to_cents, format_cents, parse_cents, to_dollars
+
+EPOCH = datetime(1970, 1, 1)
+# Sentinel stored in the timestamp columns for blank or unparseable cells
+MISSING = -(1 << 63)
+
+_DAY = 86_400
+_EPOCH_ORDINAL = EPOCH.toordinal()
+
+
+def parse_timestamp(text: str) -> int:
+    """
+    Parse a timestamp cell to naive epoch seconds.
+
+    Handles the NinjaTrader layout ("4/30/2025 9:45:30 AM") without
+    strptime, falling back to ISO 8601.
+
+    Args:
+        text: Timestamp cell
+
+    Returns:
+        Seconds since 1970-01-01 in local time
+
+    Raises:
+        ValueError: The cell is not a recognised timestamp
+    """
+    parts = text.split()
+    if len(parts) == 3 and '/' in parts[0]:
+        month, day, year = parts[0].split('/')
+        hour, minute, second = parts[1].split(':')
+        h = int(hour) % 12 + (12 if parts[2].upper() == 'PM' else 0)
+        moment = datetime(int(year), int(month), int(day), h, int(minute), int(second))
+    else:
+        moment = datetime.fromisoformat(text.strip())
+    return to_seconds(moment)
+
+
+def format_nt_timestamp(moment: datetime) -> str:
+    """Format a datetime in the NinjaTrader layout, e.g. "6/2/2025 9:45:30 AM"."""
+    hour = moment.hour % 12 or 12
+    suffix = 'PM' if moment.hour >= 12 else 'AM'
+    return (f"{moment.month}/{moment.day}/{moment.year} "
+            f"{hour}:{moment.minute:02d}:{moment.second:02d} {suffix}")
+
+
+def to_seconds(moment: datetime) -> int:
+    return (moment - EPOCH) // timedelta(seconds=1)
+
+
+def to_datetime(seconds: int) -> Optional[datetime]:
+    return None if seconds == MISSING else EPOCH + timedelta(seconds=seconds)
+
+
+def _timestamp_or_missing(text: str) -> int:
+    try:
+        return parse_timestamp(text)
+    except (ValueError, IndexError):
+        return MISSING
+
+
+class Trade:
+    """Lightweight view of one row of a TradeFile."""
+    __slots__ = ('table', 'index')
+
+    def __init__(self, table: 'TradeFile', index: int):
+        self.table = table
+        self.index = index
+
+    @property
+    def cells(self) -> List[str]:
+        return self.table.rows[self.index]
+
+    def cell(self, name: str) -> str:
+        """Raw cell of the named column ('' if the row is short)."""
+        return self.table._cell(self.cells, name)
+
+    @property
+    def number(self) -> int:
+        return self.table.number[self.index]
+
+    @property
+    def entry(self) -> Optional[datetime]:
+        return to_datetime(self.table.entry[self.index])
+
+    @property
+    def exit(self) -> Optional[datetime]:
+        return to_datetime(self.table.exit[self.index])
+
+    @property
+    def cents(self) -> int:
+        return self.table.cents[self.index]
+
+    @property
+    def profit(self) -> float:
+        return to_dollars(self.table.cents[self.index])
+
+
+class TradeFile:
+    """
+    A NinjaTrader Grid export held as raw cells plus parsed columns.
+
+    Attributes:
+        header: Header row
+        rows: Raw cells per trade (interned strings)
+        number: Trade number, -1 where the cell is not an integer
+        entry: Entry time as epoch seconds, MISSING where unparseable
+        exit: Exit time as epoch seconds, MISSING where unparseable
+        cents: Profit in cents
+    """
+    __slots__ = ('header', 'rows', 'number', 'entry', 'exit', 'cents', '_col')
+
+    def __init__(self, header: List[str]):
+        self.header = header
+        self._col: Dict[str, int] = {}
+        for i, name in enumerate(header):
+            self._col.setdefault(name, i)
+        self.rows: List[List[str]] = []
+        self.number = array('q')
+        self.entry = array('q')
+        self.exit = array('q')
+        self.cents = array('q')
+
+    @classmethod
+    def read(cls, path: str) -> 'TradeFile':
+        """
+        Read an export, parsing each row once.
+
+        Args:
+            path: Path to the CSV export
+
+        Returns:
+            TradeFile in export order
+        """
+        with open(path, 'r', newline='') as csvfile:
+            reader = csv.reader(csvfile)
+            table = cls(next(reader))
+            for row in reader:
+                table.append([sys.intern(cell) for cell in row])
+        return table
+
+    def write(self, path: str):
+        """Write the header and rows back out as CSV."""
+        with open(path, 'w', newline='') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(self.header)
+            writer.writerows(self.rows)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, index: int) -> Trade:
+        return Trade(self, index)
+
+    def __iter__(self) -> Iterator[Trade]:
+        return (Trade(self, i) for i in range(len(self.rows)))
+
+    def _cell(self, cells: List[str], name: str) -> str:
+        col = self._col.get(name)
+        return cells[col] if col is not None and col < len(cells) else ''
+
+    def _set(self, cells: List[str], name: str, value: str):
+        col = self._col.get(name)
+        if col is not None and col < len(cells):
+            cells[col] = value
+
+    def append(self, cells: List[str]) -> int:
+        """
+        Append a row, parsing its trade number, timestamps and profit.
+
+        Args:
+            cells: Raw cells in header order
+
+        Returns:
+            Index of the new row
+        """
+        number = self._cell(cells, 'Trade number')
+        self.rows.append(cells)
+        self.number.append(int(number) if number.isdigit() else -1)
+        self.entry.append(_timestamp_or_missing(self._cell(cells, 'Entry time')))
+        self.exit.append(_timestamp_or_missing(self._cell(cells, 'Exit time')))
+        self.cents.append(parse_cents(self._cell(cells, 'Profit')))
+        return len(self.rows) - 1
+
+    def copy_trade(self, index: int, entry: datetime, exit_: datetime, number: int) -> int:
+        """
+        Append a copy of a trade with new timestamps and trade number.
+
+        Args:
+            index: Row to copy
+            entry: New entry time
+            exit_: New exit time
+            number: New trade number
+
+        Returns:
+            Index of the copy
+        """
+        cells = list(self.rows[index])
+        self._set(cells, 'Trade number', str(number))
+        self._set(cells, 'Entry time', format_nt_timestamp(entry))
+        self._set(cells, 'Exit time', format_nt_timestamp(exit_))
+        self.rows.append(cells)
+        self.number.append(number)
+        self.entry.append(to_seconds(entry))
+        self.exit.append(to_seconds(exit_))
+        self.cents.append(self.cents[index])
+        return len(self.rows) - 1
+
+    def move_to_date(self, index: int, target: date, number: int) -> int:
+        """
+        Append a copy of a trade moved to another date, keeping its times of day.
+
+        Args:
+            index: Row to copy
+            target: Date for both the entry and the exit
+            number: New trade number
+
+        Returns:
+            Index of the copy
+        """
+        trade = self[index]
+        fields = {'year': target.year, 'month': target.month, 'day': target.day}
+        return self.copy_trade(index, trade.entry.replace(**fields), trade.exit.replace(**fields), number)
+
+    def set_cents(self, index: int, cents: int):
+        """Overwrite a trade's profit in cents, reformatting its cell."""
+        self.cents[index] = cents
+        self._set(self.rows[index], 'Profit', format_cents(cents))
+
+    def set_profit(self, index: int, value: float):
+        """Overwrite a trade's profit in dollars, rounded to the cent."""
+        self.set_cents(index, dollars_to_cents(value))
+
+    def take(self, indices: List[int]) -> 'TradeFile':
+        """Return a new table containing the given rows in the given order."""
+        out = TradeFile(self.header)
+        out.rows = [self.rows[i] for i in indices]
+        for name in ('number', 'entry', 'exit', 'cents'):
+            column = getattr(self, name)
+            setattr(out, name, array(column.typecode, [column[i] for i in indices]))
+        return out
+
+    def drop(self, indices) -> 'TradeFile':
+        """Return a new table without the given rows."""
+        removed = set(indices)
+        return self.take([i for i in range(len(self)) if i not in removed])
+
+    def dates(self, column: str = 'exit') -> List[Optional[date]]:
+        """
+        Calendar date of each row's 'entry' or 'exit' time.
+
+        Rows on the same day share one date object; unparseable times give
+        None.
+        """
+        cache: Dict[int, date] = {}
+        out: List[Optional[date]] = []
+        for seconds in getattr(self, column):
+            if seconds == MISSING:
+                out.append(None)
+                continue
+            day = seconds // _DAY
+            if day not in cache:
+                cache[day] = date.fromordinal(_EPOCH_ORDINAL + day)
+            out.append(cache[day])
+        return out
+
+    def group_by_date(self, column: str = 'exit') -> Dict[date, List[int]]:
+        """
+        Group row indices by the date of their 'entry' or 'exit' time.
+
+        Groups appear in order of first occurrence and keep export order;
+        rows with unparseable times are left out.
+        """
+        groups: Dict[date, List[int]] = {}
+        for i, day in enumerate(self.dates(column)):
+            if day is not None:
+                groups.setdefault(day, []).append(i)
+        return groups
+
+    def max_trade_number(self) -> int:
+        return max(0, max(self.number, default=0))
+
+    def sorted_by(self, column: str = 'exit') -> 'TradeFile':
+        """
+        Return the table stably sorted by 'entry' or 'exit' time.
+
+        Rows with unparseable times sort first.
+        """
+        return self.take(sorted(range(len(self)), key=getattr(self, column).__getitem__))
+
+    def renumber(self) -> float:
+        """
+        Renumber trades from 1 and rebuild 'Cum. net profit' in row order.
+
+        The running total is summed in exact cents, so it never drifts from
+        the profit cells.
+
+        Returns:
+            Final cumulative profit in dollars
+        """
+        cumulative_cents = 0
+        for i, cells in enumerate(self.rows):
+            self.number[i] = i + 1
+            self._set(cells, 'Trade number', str(i + 1))
+            cumulative_cents += self.cents[i]
+            self._set(cells, 'Cum. net profit', format_cents(cumulative_cents))
+        return to_dollars(cumulative_cents)
@@ -0,0 +1,225 @@
+"""
+Schema and consistency checks for converter output documents.
+
+validate() loads the columns of a document into NumPy arrays once and
+checks them with vectorized reductions:
+
+- the required sections and fields are present with the right types
+- ``equity_curve.dates`` are the trade exit times, in non-decreasing order
+- ``equity_curve.values`` is the running sum of trade profits, compared in
+  whole cents
+- ``metrics`` recompute from the trades and equity to the stored values
+
+It is cheap enough to run on every conversion; publish() runs it as a gate
+so an inconsistent document never becomes current.
+"""
+from operator import itemgetter
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from ntperf.errors import ValidationError
+from ntperf.metrics import NOTIONAL, sharpe_ratio
+from ntperf.money import CENTS_PER_DOLLAR
+from ntperf.schema import TIME_FORMAT, TRADE_COLUMNS
+
+# Allowed gap between equity values and the running sum of profits, in dollars
+MONEY_TOLERANCE = 0.005
+# Relative tolerance for recomputed metrics (mean and deviation are float reductions)
+METRIC_TOLERANCE = 1e-9
+
+METRIC_FIELDS = ('pnl', 'sharpe', 'max_dd', 'win_rate')
+RECONCILIATION_STATUSES = ('ok', 'diverged', 'unavailable')
+# Length of a timestamp formatted with TIME_FORMAT
+_TIME_LENGTH = 19
+# Problems listed in a ValidationError message
+_MAX_REPORTED = 5
+
+# Expected NumPy dtype kinds of each trade column
+_KINDS = {
+    'Entry time': 'U',
+    'Exit time': 'U',
+    'Instrument': 'U',
+    'Market pos.': 'U',
+    'Qty': 'iu',
+    'Entry price': 'iuf',
+    'Exit price': 'iuf',
+    'Profit': 'iuf',
+}
+
+
+def _timestamps(values: np.ndarray) -> Optional[np.ndarray]:
+    """Parse TIME_FORMAT strings to datetime64[s], or None if any is malformed."""
+    if values.dtype.kind != 'U' or not np.all(np.char.str_len(values) == _TIME_LENGTH):
+        return None
+    try:
+        return values.astype('datetime64[s]')
+    except ValueError:
+        return None
+
+
+def _first(mask: np.ndarray) -> int:
+    return int(np.argmax(mask))
+
+
+def _trade_columns(trades: List[Dict[str, Any]], problems: List[str]) -> Optional[Dict[str, np.ndarray]]:
+    """Transpose the trade records into one array per column."""
+    if not trades:
+        return {col: np.array([], dtype=float) for col in TRADE_COLUMNS}
+    try:
+        rows = list(map(itemgetter(*TRADE_COLUMNS), trades))
+    except (KeyError, TypeError):
+        for i, trade in enumerate(trades):
+            if not isinstance(trade, dict):
+                problems.append(f"trades[{i}] is not an object")
+                return None
+            missing = [col for col in TRADE_COLUMNS if col not in trade]
+            if missing:
+                problems.append(f"trades[{i}] is missing {', '.join(missing)}")
+                return None
+        raise
+    columns = {col: np.array(values) for col, values in zip(TRADE_COLUMNS, zip(*rows))}
+    for col, values in columns.items():
+        if values.dtype.kind not in _KINDS[col]:
+            problems.append(f"trades column '{col}' has dtype {values.dtype}, expected "
+                            f"{'strings' if _KINDS[col] == 'U' else 'numbers'}")
+    return columns
+
+
+def _max_drawdown(values: np.ndarray) -> float:
+    """Vectorized ntperf.metrics.calculate_max_drawdown."""
+    if len(values) < 2:
+        return 0.0
+    peak = np.maximum.accumulate(values)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        drawdown = np.where(peak > 0, (peak - values) / peak * 100, 0.0)
+    return float(max(drawdown.max(), 0.0))
+
+
+def _cents(dollars: np.ndarray) -> np.ndarray:
+    return np.rint(dollars * CENTS_PER_DOLLAR).astype(np.int64)
+
+
+def recompute_metrics(exit_times: np.ndarray, profits: np.ndarray,
+                      values: np.ndarray) -> Dict[str, float]:
+    """
+    Recompute the headline metrics from trade columns.
+
+    Args:
+        exit_times: Exit times as datetime64
+        profits: Per-trade profits in dollars
+        values: Equity curve values
+
+    Returns:
+        Metrics as compute_metrics defines them
+    """
+    days, day_index = np.unique(exit_times.astype('datetime64[D]'), return_inverse=True)
+    # Whole cents are exact in float64, so the daily sums are too
+    daily = np.bincount(day_index, weights=_cents(profits), minlength=len(days))
+    returns = daily / (NOTIONAL * CENTS_PER_DOLLAR)
+    mean = float(returns.mean()) if len(returns) else float('nan')
+    std = float(returns.std(ddof=1)) if len(returns) > 1 else float('nan')
+    return {
+        "pnl": float(values[-1]) if len(values) else 0.0,
+        "sharpe": float(sharpe_ratio(mean, std)),
+        "max_dd": _max_drawdown(values),
+        "win_rate": float((profits > 0).mean() * 100) if len(profits) else 0.0
+    }
+
+
+def validate(data: Any, tolerance: float = MONEY_TOLERANCE) -> List[str]:
+    """
+    Check an output document's schema and internal consistency.
+
+    Args:
+        data: Output document
+        tolerance: Allowed gap in dollars between each equity value and the
+            running sum of profits
+
+    Returns:
+        Problems found, empty when the document is valid
+    """
+    problems: List[str] = []
+    if not isinstance(data, dict):
+        return ["document is not an object"]
+    missing = [key for key in ('equity_curve', 'metrics', 'trades') if key not in data]
+    if missing:
+        return [f"missing section(s): {', '.join(missing)}"]
+    curve, metrics, trades = data['equity_curve'], data['metrics'], data['trades']
+    if not isinstance(curve, dict) or not all(isinstance(curve.get(k), list) for k in ('dates', 'values')):
+        problems.append("equity_curve must have 'dates' and 'values' lists")
+    if not isinstance(metrics, dict):
+        problems.append("metrics is not an object")
+    else:
+        missing = [key for key in METRIC_FIELDS if key not in metrics]
+        if missing:
+            problems.append(f"metrics is missing {', '.join(missing)}")
+        wrong = [key for key in METRIC_FIELDS if key in metrics
+                 and (isinstance(metrics[key], bool) or not isinstance(metrics[key], (int, float)))]
+        if wrong:
+            problems.append(f"metrics {', '.join(wrong)} must be numbers")
+    if not isinstance(trades, list):
+        problems.append("trades is not a list")
+    reconciliation = data.get('reconciliation')
+    if reconciliation is not None and (not isinstance(reconciliation, dict)
+                                       or reconciliation.get('status') not in RECONCILIATION_STATUSES):
+        problems.append(f"reconciliation.status must be one of {', '.join(RECONCILIATION_STATUSES)}")
+    if problems:
+        return problems
+
+    columns = _trade_columns(trades, problems)
+    dates = np.array(curve['dates'])
+    values = np.array(curve['values'])
+    if values.dtype.kind not in 'iuf' and len(values):
+        problems.append(f"equity_curve.values has dtype {values.dtype}, expected numbers")
+    if not (len(dates) == len(values) == len(trades)):
+        problems.append(f"lengths differ: {len(dates)} dates, {len(values)} values, {len(trades)} trades")
+    if columns is None or problems:
+        return problems
+
+    exit_times = _timestamps(columns['Exit time']) if len(trades) else np.array([], dtype='datetime64[s]')
+    if exit_times is None:
+        problems.append(f"trades 'Exit time' must be formatted as {TIME_FORMAT}")
+    elif len(trades) and _timestamps(columns['Entry time']) is None:
+        problems.append(f"trades 'Entry time' must be formatted as {TIME_FORMAT}")
+    if len(trades) and not np.array_equal(dates, columns['Exit time']):
+        i = _first(dates != columns['Exit time'])
+        problems.append(f"equity_curve.dates[{i}] is {dates[i]}, trade exit time is {columns['Exit time'][i]}")
+    if exit_times is not None and len(exit_times) > 1:
+        backwards = exit_times[1:] < exit_times[:-1]
+        if backwards.any():
+            i = _first(backwards) + 1
+            problems.append(f"equity_curve.dates are not in order: {dates[i - 1]} then {dates[i]} at {i}")
+
+    profits = columns['Profit'].astype(float)
+    values = values.astype(float)
+    running = np.cumsum(_cents(profits))
+    gap = np.abs(running - _cents(values))
+    if len(gap) and gap.max() > tolerance * CENTS_PER_DOLLAR:
+        i = _first(gap > tolerance * CENTS_PER_DOLLAR)
+        problems.append(f"equity_curve.values[{i}] is {values[i]}, running sum of profits is "
+                        f"{running[i] / CENTS_PER_DOLLAR} (max gap {gap.max() / CENTS_PER_DOLLAR:.2f})")
+
+    if exit_times is not None:
+        expected = recompute_metrics(exit_times, profits, values)
+        for key in METRIC_FIELDS:
+            if not np.isclose(metrics[key], expected[key], rtol=METRIC_TOLERANCE, atol=METRIC_TOLERANCE):
+                problems.append(f"metrics.{key} is {metrics[key]}, recomputed {expected[key]}")
+    return problems
+
+
+def check(data: Any, tolerance: float = MONEY_TOLERANCE) -> None:
+    """
+    Raise if an output document fails validate().
+
+    Args:
+        data: Output document
+        tolerance: Allowed equity gap in dollars
+
+    Raises:
+        ValidationError: The document is malformed or inconsistent
+    """
+    problems = validate(data, tolerance)
+    if problems:
+        more = f" (and {len(problems) - _MAX_REPORTED} more)" if len(problems) > _MAX_REPORTED else ""
+        raise ValidationError("Invalid output document: " + "; ".join(problems[:_MAX_REPORTED]) + more)
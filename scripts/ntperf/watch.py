@@ -0,0 +1,309 @@
+"""
+Watch-mode daemon that reconverts when a new NinjaTrader export appears.
+
+The scheduled export drops ``NinjaTrader Grid YYYY-MM-DD HH-MM AM.csv``
+files into a directory. The watcher notices new or modified exports, waits
+until a file has stopped changing (so a half-written export is never read),
+converts the newest export in a worker process and publishes the result
+with write_output(), which writes to a temporary file and renames it into
+place.
+
+Change notification uses ``watchfiles`` (inotify on Linux) when it is
+installed and falls back to polling the directory with ``os.scandir``. The
+worker process is started once and kept warm, so after the first
+conversion a refresh costs the conversion itself rather than a pandas
+import.
+"""
+import asyncio
+import fnmatch
+import logging
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from ntperf.errors import ConversionError
+from ntperf.profiling import DEFAULT_TOP, profiled
+from ntperf.publish import CURRENT_NAME, DEFAULT_RETAIN
+
+try:
+    import watchfiles
+except ImportError:  # optional: poll instead
+    watchfiles = None
+
+logger = logging.getLogger(__name__)
+
+EXPORT_PATTERN = 'NinjaTrader Grid *.csv'
+# Seconds an export must stay unchanged before it is converted
+DEFAULT_SETTLE = 2.0
+# Seconds between directory scans when polling
+DEFAULT_INTERVAL = 1.0
+
+_EXPORT_STAMP = re.compile(r'(\d{4}-\d{2}-\d{2}) (\d{2})-(\d{2}) ([AP]M)')
+
+Stat = Tuple[int, int]
+
+
+def export_time(path: str) -> Optional[datetime]:
+    """
+    Export time encoded in a NinjaTrader Grid file name.
+
+    Args:
+        path: Path such as ".../NinjaTrader Grid 2025-06-06 12-52 AM.csv"
+
+    Returns:
+        The timestamp, or None if the name does not carry one
+    """
+    match = _EXPORT_STAMP.search(os.path.basename(path))
+    if not match:
+        return None
+    try:
+        return datetime.strptime(' '.join(match.groups()), '%Y-%m-%d %I %M %p')
+    except ValueError:
+        return None
+
+
+def _stat(path: str) -> Optional[Stat]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def scan(directory: str, pattern: str = EXPORT_PATTERN) -> Dict[str, Stat]:
+    """
+    Size and mtime of every export in a directory.
+
+    Args:
+        directory: Directory to scan
+        pattern: Glob matched against file names
+
+    Returns:
+        Mapping of path to (size, mtime_ns)
+    """
+    found = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file() and fnmatch.fnmatch(entry.name, pattern):
+                st = entry.stat()
+                found[entry.path] = (st.st_size, st.st_mtime_ns)
+    return found
+
+
+def latest_export(paths: Iterable[str]) -> Optional[str]:
+    """
+    Pick the newest export, by the time in its name and then by mtime.
+
+    Args:
+        paths: Candidate export paths
+
+    Returns:
+        Path of the newest export, or None if there are none
+    """
+    def key(path: str):
+        stat = _stat(path)
+        return export_time(path) or datetime.min, stat[1] if stat else 0
+    return max(paths, key=key, default=None)
+
+
+async def _poll_changes(directory: str, pattern: str, interval: float) -> AsyncIterator[Set[str]]:
+    """Yield the exports added or modified since the previous scan."""
+    previous = scan(directory, pattern)
+    while True:
+        await asyncio.sleep(interval)
+        current = scan(directory, pattern)
+        changed = {path for path, stat in current.items() if previous.get(path) != stat}
+        previous = current
+        if changed:
+            yield changed
+
+
+async def _notify_changes(directory: str, pattern: str) -> AsyncIterator[Set[str]]:
+    """Yield exports reported by the OS file-change notifications."""
+    async for changes in watchfiles.awatch(directory, recursive=False):
+        changed = {path for change, path in changes
+                   if change != watchfiles.Change.deleted
+                   and fnmatch.fnmatch(os.path.basename(path), pattern)}
+        if changed:
+            yield changed
+
+
+def changes(directory: str, pattern: str = EXPORT_PATTERN, interval: float = DEFAULT_INTERVAL,
+            poll: bool = False) -> AsyncIterator[Set[str]]:
+    """
+    Stream sets of changed export paths.
+
+    Args:
+        directory: Directory to watch
+        pattern: Glob matched against file names
+        interval: Polling interval in seconds
+        poll: Force polling even when watchfiles is available
+
+    Returns:
+        Async iterator of changed paths
+    """
+    if watchfiles is not None and not poll:
+        return _notify_changes(directory, pattern)
+    return _poll_changes(directory, pattern, interval)
+
+
+def convert_export(source: str, outputs: Sequence[str], corrections: str = 'default',
+                   analytics: Optional[List[str]] = None, publish_dir: Optional[str] = None,
+                   retain: int = DEFAULT_RETAIN, profile_dir: Optional[str] = None,
+                   profile_top: int = DEFAULT_TOP) -> Tuple[int, float]:
+    """
+    Convert one export and publish it to every output path.
+
+    Runs in the worker process.
+
+    Args:
+        source: Export to convert
+        outputs: JSON paths to replace atomically
+        corrections: Correction profile name
+        analytics: Analytics sections to include (default: all)
+        publish_dir: Directory to publish a new version to, if any
+        retain: Number of published versions to keep
+        profile_dir: Directory to write a cProfile of the conversion to
+        profile_top: Functions listed in the profile report
+
+    Returns:
+        Number of trades and conversion time in seconds
+    """
+    from ntperf.output import write_output
+    from ntperf.pipeline import convert
+    from ntperf.publish import publish
+
+    with profiled('watch_exports', [source], profile_dir, profile_top):
+        start = time.perf_counter()
+        data = convert(source, corrections=corrections, analytics=analytics)
+        for output in outputs:
+            write_output(data, output)
+        if publish_dir:
+            publish(data, publish_dir, retain=retain, source=source)
+    return len(data["trades"]), time.perf_counter() - start
+
+
+def _warm_up(analytics: Optional[List[str]]) -> None:
+    """Import the conversion backend in the worker ahead of the first export."""
+    if analytics is None or analytics:
+        import ntperf.api  # noqa: F401
+
+
+def _start_worker(analytics: Optional[List[str]]) -> ProcessPoolExecutor:
+    """Start the single conversion worker and warm it up."""
+    pool = ProcessPoolExecutor(max_workers=1)
+    pool.submit(_warm_up, analytics)
+    return pool
+
+
+def _outdated(source: str, outputs: Sequence[str]) -> bool:
+    """True if any output is missing or older than the export."""
+    source_stat = _stat(source)
+    for output in outputs:
+        stat = _stat(output)
+        if stat is None or (source_stat and stat[1] < source_stat[1]):
+            return True
+    return False
+
+
+async def watch(directory: str, outputs: Sequence[str], corrections: str = 'default',
+                analytics: Optional[List[str]] = None, settle: float = DEFAULT_SETTLE,
+                interval: float = DEFAULT_INTERVAL, poll: bool = False,
+                pattern: str = EXPORT_PATTERN, publish_dir: Optional[str] = None,
+                retain: int = DEFAULT_RETAIN, profile_dir: Optional[str] = None,
+                profile_top: int = DEFAULT_TOP) -> None:
+    """
+    Reconvert the newest export whenever exports are added or modified.
+
+    An export counts as settled once its size and mtime have not changed
+    for ``settle`` seconds. Conversions run one at a time in a single
+    long-lived worker process; changes that arrive during a conversion are
+    picked up when it finishes. If the worker dies, the failure is logged
+    and a new worker is started for the next export.
+
+    Args:
+        directory: Directory the exports are dropped into
+        outputs: JSON paths to publish to
+        corrections: Correction profile name
+        analytics: Analytics sections to include (default: all)
+        settle: Quiet period in seconds before an export is converted
+        interval: Polling interval in seconds (also the settle check period)
+        poll: Force polling even when watchfiles is available
+        pattern: Glob matched against export file names
+        publish_dir: Directory to publish each conversion to as a new version
+        retain: Number of published versions to keep
+        profile_dir: Directory to write a cProfile of each conversion to
+        profile_top: Functions listed in each profile report
+    """
+    loop = asyncio.get_running_loop()
+    # Path -> (stat when last seen changing, loop time of that change)
+    pending: Dict[str, Tuple[Optional[Stat], float]] = {}
+
+    def mark(paths: Iterable[str]) -> None:
+        now = loop.time()
+        for path in paths:
+            pending[path] = (_stat(path), now)
+
+    latest = latest_export(scan(directory, pattern))
+    targets = list(outputs) + ([os.path.join(publish_dir, CURRENT_NAME)] if publish_dir else [])
+    if latest and _outdated(latest, targets):
+        mark([latest])
+
+    async def listen() -> None:
+        async for changed in changes(directory, pattern, interval, poll):
+            logger.debug(f"Changed: {sorted(changed)}")
+            mark(changed)
+
+    mode = 'inotify' if watchfiles is not None and not poll else f'polling every {interval:g}s'
+    logger.info(f"Watching {directory} for '{pattern}' ({mode}); publishing to {', '.join(targets)}")
+
+    pool = _start_worker(analytics)
+    listener = asyncio.ensure_future(listen())
+    try:
+        while True:
+            await asyncio.sleep(min(interval, settle))
+            if listener.done():
+                listener.result()
+
+            now = loop.time()
+            settled = []
+            for path, (stat, changed_at) in list(pending.items()):
+                current = _stat(path)
+                if current is None:
+                    del pending[path]
+                elif current != stat:
+                    # Still being written
+                    pending[path] = (current, now)
+                elif now - changed_at >= settle:
+                    settled.append(path)
+            if not settled:
+                continue
+            for path in settled:
+                del pending[path]
+
+            source = latest_export(scan(directory, pattern))
+            if source is None or source in pending:
+                # The newest export is still being written
+                continue
+            logger.info(f"Converting {source}")
+            try:
+                trades, elapsed = await loop.run_in_executor(
+                    pool, convert_export, source, list(outputs), corrections, analytics, publish_dir,
+                    retain, profile_dir, profile_top)
+            except (ConversionError, ValueError) as e:
+                logger.error(f"Conversion of {source} failed: {e}")
+                continue
+            except BrokenProcessPool as e:
+                # The worker died (killed, out of memory); the next export gets a fresh one
+                logger.error(f"Worker process died converting {source}: {e}; restarting it")
+                pool.shutdown(wait=False)
+                pool = _start_worker(analytics)
+                continue
+            logger.info(f"Published {trades} trades from {os.path.basename(source)} in {elapsed:.2f}s")
+    finally:
+        listener.cancel()
+        pool.shutdown()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Published Version Manager
+
+Lists the performance documents published with --publish and moves the
+``current`` pointer back to an earlier version.
+
+Usage: python perf_versions.py src/data/perf list
+       python perf_versions.py src/data/perf rollback <version>
+"""
+import argparse
+import sys
+
+from ntperf import ConversionError
+from ntperf.publish import current_version, read_index, rollback
+
+
+def main():
+    """Main function to list or roll back versions"""
+    parser = argparse.ArgumentParser(description="List or roll back published performance versions")
+    parser.add_argument("directory", help="publish directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="show retained versions, newest last")
+    undo = commands.add_parser("rollback", help="make an earlier version current")
+    undo.add_argument("version", help="version id from 'list'")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        current = current_version(args.directory)
+        for entry in read_index(args.directory)["versions"]:
+            marker = "*" if entry["version"] == current else " "
+            print(f"{marker} {entry['version']}  {entry['published_at']}  "
+                  f"{entry['trades']:>6} trades  {entry.get('source') or ''}")
+        return
+
+    try:
+        rollback(args.directory, args.version)
+    except (ConversionError, ValueError) as e:
+        print(e)
+        sys.exit(1)
+    print(f"Current version is now {args.version}")
+
+
+if __name__ == "__main__":
+    main()
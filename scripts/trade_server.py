@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Trade Query Service - serves filtered trades and aggregates over HTTP
+
+Loads the newest "NinjaTrader Grid *.csv" in a directory into an indexed,
+in-memory trade store and answers the JSON queries /api/trading-data proxies
+to. A newer export is ingested automatically once it has finished writing.
+
+Usage: python trade_server.py [public/data] [--host 127.0.0.1] [--port 8765]
+                              [--cache-size 256] [--no-watch]
+                              [--corrections extended] [--profile [profiles/]]
+"""
+import argparse
+import logging
+import sys
+
+from ntperf.corrections import CORRECTIONS
+from ntperf.errors import ConversionError
+from ntperf.profiling import add_profile_arguments
+from ntperf.server import DEFAULT_CACHE_SIZE, DEFAULT_HOST, DEFAULT_PORT, serve
+from ntperf.watch import DEFAULT_INTERVAL, DEFAULT_SETTLE
+
+
+def main():
+    """Main function to run the query service"""
+    parser = argparse.ArgumentParser(description="Serve trade queries over a NinjaTrader export")
+    parser.add_argument("directory", nargs="?", default="public/data",
+                        help="directory the exports are written to")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="interface to bind")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="port to bind")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE,
+                        help="number of responses kept in the LRU cache")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL,
+                        help="seconds between checks for a newer export")
+    parser.add_argument("--settle", type=float, default=DEFAULT_SETTLE,
+                        help="seconds an export must stay unchanged before ingesting")
+    parser.add_argument("--no-watch", action="store_true",
+                        help="only ingest on POST /ingest")
+    parser.add_argument("--corrections", choices=sorted(CORRECTIONS) + ['none'], default="default",
+                        help="misreported-trade corrections to apply")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s', stream=sys.stdout)
+
+    try:
+        serve(args.directory, host=args.host, port=args.port, corrections=args.corrections,
+              cache_size=args.cache_size, interval=args.interval, settle=args.settle,
+              watch=not args.no_watch, profile_dir=args.profile, profile_top=args.profile_top)
+    except KeyboardInterrupt:
+        pass
+    except (ConversionError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    except OSError as e:
+        print(f"Error serving {args.directory}: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,39 +1,60 @@
 #!/usr/bin/env python3
+"""
+Output Validator - checks converter output documents for consistency
+
+Checks that each document has the required sections and field types, that
+the equity curve is the running sum of trade profits over in-order exit
+times, and that the stored metrics recompute from the trades. Publish
+directories are resolved to their current version.
+
+Usage: python verify_json.py [public/data/perf.json ...] [--tolerance 0.005]
+"""
+import argparse
 import json
-import datetime
-
-# Load JSON file
-with open('../public/data/perf.json') as f:
-    data = json.load(f)
-
-# Check trades
-trades = data['trades']
-may_trades = [t for t in trades if (t['Exit time'].startswith('2025-05-2') and int(t['Exit time'][8:10]) >= 24) or t['Exit time'].startswith('2025-05-3')]
-print(f"Trades between May 24-31: {len(may_trades)}")
-for t in may_trades:
-    print(f"Date: {t['Exit time']}, Profit: {t['Profit']}")
-
-# Check equity curve
-dates = data['equity_curve']['dates']
-values = data['equity_curve']['values']
-print(f"\nDates in equity curve: {len(dates)}")
-print(f"Values in equity curve: {len(values)}")
-
-# Check last 10 entries
-print("\nLast 10 entries in equity curve:")
-for i in range(1, 11):
-    idx = -i
-    print(f"{dates[idx]}: {values[idx]}")
-
-# Verify matching between dates and trades
-date_set = set(date.split()[0] for date in dates)  # Get just the date part
-trade_dates = set(t['Exit time'].split()[0] for t in trades)
-
-print(f"\nUnique dates in equity curve: {len(date_set)}")
-print(f"Unique dates in trades: {len(trade_dates)}")
-
-missing_dates = trade_dates - date_set
-if missing_dates:
-    print(f"\nDates in trades but missing from equity curve: {missing_dates}")
-else:
-    print("\nAll trade dates are included in the equity curve")
\ No newline at end of file
+import os
+import sys
+import time
+
+from ntperf.publish import load_version
+from ntperf.validate import MONEY_TOLERANCE, validate
+
+
+def main():
+    """Main function to validate output documents"""
+    parser = argparse.ArgumentParser(description="Validate converter output documents")
+    parser.add_argument("paths", nargs="*", default=["public/data/perf.json"],
+                        help="output JSON files or publish directories")
+    parser.add_argument("--tolerance", type=float, default=MONEY_TOLERANCE,
+                        help="allowed gap in dollars between equity and the running sum of profits")
+    args = parser.parse_args()
+
+    failed = False
+    for path in args.paths:
+        try:
+            if os.path.isdir(path):
+                data = load_version(path)
+            else:
+                with open(path) as f:
+                    data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"FAIL {path}: {e}")
+            failed = True
+            continue
+
+        start = time.perf_counter()
+        problems = validate(data, tolerance=args.tolerance)
+        elapsed = (time.perf_counter() - start) * 1000
+        if problems:
+            failed = True
+            print(f"FAIL {path}")
+            for problem in problems:
+                print(f"  {problem}")
+        else:
+            print(f"OK   {path} ({len(data['trades'])} trades, {elapsed:.1f} ms)")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
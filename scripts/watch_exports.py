@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Export Watcher - reconverts performance data when a new export lands
+
+Watches the directory the scheduled NinjaTrader export writes to and, once a
+new or modified "NinjaTrader Grid *.csv" has finished writing, converts the
+newest export and atomically replaces the JSON read by /api/perf.
+
+Usage: python watch_exports.py [public/data] [--output src/data/perf.json]
+                               [--publish src/data/perf --retain 30]
+                               [--settle 2] [--interval 1] [--poll]
+                               [--no-analytics] [--corrections extended]
+                               [--profile [profiles/]]
+"""
+import argparse
+import asyncio
+import logging
+import sys
+
+from ntperf.corrections import CORRECTIONS
+from ntperf.profiling import add_profile_arguments
+from ntperf.publish import DEFAULT_RETAIN
+from ntperf.watch import DEFAULT_INTERVAL, DEFAULT_SETTLE, watch
+
+
+def main():
+    """Main function to run the watcher"""
+    parser = argparse.ArgumentParser(description="Reconvert NinjaTrader exports as they arrive")
+    parser.add_argument("directory", nargs="?", default="public/data",
+                        help="directory the exports are written to")
+    parser.add_argument("--output", action="append",
+                        help="JSON file to replace (repeatable; default src/data/perf.json unless --publish is given)")
+    parser.add_argument("--publish", metavar="DIR",
+                        help="publish each conversion as a new version to DIR")
+    parser.add_argument("--retain", type=int, default=DEFAULT_RETAIN,
+                        help="number of published versions to keep")
+    parser.add_argument("--settle", type=float, default=DEFAULT_SETTLE,
+                        help="seconds an export must stay unchanged before converting")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL,
+                        help="polling interval in seconds")
+    parser.add_argument("--poll", action="store_true",
+                        help="poll the directory even if watchfiles is installed")
+    parser.add_argument("--no-analytics", action="store_true",
+                        help="only write equity curve, metrics and trades")
+    parser.add_argument("--corrections", choices=sorted(CORRECTIONS) + ['none'], default="default",
+                        help="misreported-trade corrections to apply")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s', stream=sys.stdout)
+
+    try:
+        outputs = args.output or ([] if args.publish else ["src/data/perf.json"])
+        asyncio.run(watch(args.directory, outputs,
+                          corrections=args.corrections,
+                          analytics=[] if args.no_analytics else None,
+                          settle=args.settle, interval=args.interval, poll=args.poll,
+                          publish_dir=args.publish, retain=args.retain,
+                          profile_dir=args.profile, profile_top=args.profile_top))
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"Error watching {args.directory}: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,210 @@
 import { readFileSync } from 'fs';
-import { NextResponse } from 'next/server';
+import { NextRequest, NextResponse } from 'next/server';
 import path from 'path';
 
-export async function GET() {
+// Written by `nt2json.py --publish src/data/perf` (see scripts/ntperf/publish.py)
+const PUBLISH_DIR = path.join(process.cwd(), 'src/data/perf');
+// Single-file output used when nothing has been published yet
+const LEGACY_FILE = path.join(process.cwd(), 'src/data/perf.json');
+const VERSION_PATTERN = /^[0-9a-f]{16}$/;
+// Keep in sync with MAX_DELTA_CHAIN in scripts/ntperf/publish.py
+const MAX_DELTA_CHAIN = 10;
+// Sections a client needs to render the performance page (keep in sync with
+// CORE_SECTIONS in scripts/ntperf/publish.py)
+const CORE_SECTIONS = ['equity_curve', 'metrics', 'trades'];
+// Equity bar resolutions published next to each version instead of inside it
+// (keep in sync with FINE_RESOLUTIONS in scripts/ntperf/bars.py)
+const BAR_RESOLUTIONS = ['1m', '5m'];
+// Published versions and deltas never change, so parsed files are kept in memory
+const MAX_CACHED_FILES = 32;
+const fileCache = new Map<string, any>();
+
+type IndexEntry = {
+  version: string;
+  bytes: number;
+  core_bytes?: number;
+  delta_from: string | null;
+  delta: string | null;
+  delta_bytes: number | null;
+  delta_core_bytes?: number | null;
+};
+let indexCache: { current: string; entries: Map<string, IndexEntry> } | null = null;
+
+function currentVersion(): string | null {
   try {
-    // Read the performance data from the file system
-    const filePath = path.join(process.cwd(), 'src/data/perf.json');
-    const fileContents = readFileSync(filePath, 'utf8');
-    const data = JSON.parse(fileContents);
-    
-    // Return the data as JSON
-    return NextResponse.json(data, {
+    return readFileSync(path.join(PUBLISH_DIR, 'current'), 'utf8').trim() || null;
+  } catch {
+    return null;
+  }
+}
+
+function loadPublished(name: string): any {
+  let data = fileCache.get(name);
+  if (data === undefined) {
+    data = JSON.parse(readFileSync(path.join(PUBLISH_DIR, name), 'utf8'));
+    fileCache.set(name, data);
+    if (fileCache.size > MAX_CACHED_FILES) {
+      // Maps iterate in insertion order: drop the oldest entry
+      fileCache.delete(fileCache.keys().next().value as string);
+    }
+  }
+  return data;
+}
+
+function loadVersion(version: string): any {
+  return loadPublished(`perf.${version}.json`);
+}
+
+function indexEntries(current: string): Map<string, IndexEntry> {
+  // The index only changes when the current pointer moves
+  if (indexCache?.current !== current) {
+    const index = JSON.parse(readFileSync(path.join(PUBLISH_DIR, 'index.json'), 'utf8'));
+    const entries = new Map<string, IndexEntry>(
+      index.versions.map((entry: IndexEntry) => [entry.version, entry])
+    );
+    indexCache = { current, entries };
+  }
+  return indexCache.entries;
+}
+
+// Delta files leading from `since` to `current`, or null when the snapshot is
+// the better answer (mirrors delta_chain() in scripts/ntperf/publish.py).
+// Core-only clients never receive analytics, so sizes exclude them.
+function deltaChain(current: string, since: string, coreOnly: boolean): string[] | null {
+  const entries = indexEntries(current);
+  const head = entries.get(current);
+  if (!head) {
+    return null;
+  }
+  const snapshotBytes = (coreOnly ? head.core_bytes : undefined) ?? head.bytes;
+  const chain: string[] = [];
+  let total = 0;
+  let version: string | null = current;
+  while (version !== since) {
+    const entry = version ? entries.get(version) : undefined;
+    if (!entry || !entry.delta || chain.length >= MAX_DELTA_CHAIN) {
+      return null;
+    }
+    total += (coreOnly ? entry.delta_core_bytes : undefined) ?? entry.delta_bytes ?? 0;
+    if (total >= snapshotBytes) {
+      return null;
+    }
+    chain.push(entry.delta);
+    version = entry.delta_from;
+  }
+  return chain.reverse();
+}
+
+// Fine-resolution equity bars of a version, fetched when a chart zooms in
+function barsResponse(version: string, resolution: string, pinned: boolean) {
+  if (!BAR_RESOLUTIONS.includes(resolution)) {
+    return NextResponse.json({ error: `Unknown resolution: ${resolution}` }, { status: 400 });
+  }
+  let data: unknown;
+  try {
+    data = loadPublished(`bars.${version}.${resolution}.json`);
+  } catch {
+    return NextResponse.json({ error: `No ${resolution} bars for version ${version}` }, { status: 404 });
+  }
+  return NextResponse.json(data, {
+    headers: {
+      // The file for a version never changes
+      'Cache-Control': pinned ? 'public, max-age=31536000, immutable' : 'no-cache',
+      'X-Perf-Version': version,
+    },
+  });
+}
+
+function coreSections(data: Record<string, unknown>): Record<string, unknown> {
+  return Object.fromEntries(CORE_SECTIONS.map((key) => [key, data[key]]));
+}
+
+// Catch a client up from the version it holds: a chain of deltas, or the
+// full snapshot when the chain is broken or too long
+function sinceResponse(current: string, since: string, coreOnly: boolean) {
+  const chain = VERSION_PATTERN.test(since) ? deltaChain(current, since, coreOnly) : null;
+  const body = chain === null
+    ? {
+        kind: 'snapshot',
+        version: current,
+        data: coreOnly ? coreSections(loadVersion(current)) : loadVersion(current),
+      }
+    : {
+        kind: 'delta',
+        from: since,
+        to: current,
+        deltas: chain.map((name) => {
+          const delta = loadPublished(name);
+          // Core-only clients skip the analytics patch (and the whole-section
+          // replacements of deltas written before patches)
+          return coreOnly ? { ...delta, patch: [], replace: {} } : delta;
+        }),
+      };
+  return NextResponse.json(body, {
+    headers: {
+      'Cache-Control': 'no-cache',
+      'X-Perf-Version': current,
+    },
+  });
+}
+
+export async function GET(request: NextRequest) {
+  try {
+    const requested = request.nextUrl.searchParams.get('version');
+    if (requested !== null && !VERSION_PATTERN.test(requested)) {
+      return NextResponse.json({ error: 'Invalid version' }, { status: 400 });
+    }
+    const resolution = request.nextUrl.searchParams.get('bars');
+    if (resolution !== null) {
+      const version = requested ?? currentVersion();
+      if (version === null) {
+        return NextResponse.json({ error: 'Nothing is published' }, { status: 404 });
+      }
+      return barsResponse(version, resolution, requested !== null);
+    }
+    if (requested !== null) {
+      let data: unknown;
+      try {
+        data = loadVersion(requested);
+      } catch {
+        return NextResponse.json({ error: 'Unknown version' }, { status: 404 });
+      }
+      return NextResponse.json(data, {
+        headers: {
+          'Cache-Control': 'public, max-age=31536000, immutable',
+          'ETag': `"${requested}"`,
+          'X-Perf-Version': requested,
+        },
+      });
+    }
+
+    const version = currentVersion();
+    if (version === null) {
+      // Read the performance data from the file system
+      const data = JSON.parse(readFileSync(LEGACY_FILE, 'utf8'));
+      return NextResponse.json(data, {
+        headers: {
+          'Cache-Control': 'no-store, max-age=0',
+        },
+      });
+    }
+
+    const since = request.nextUrl.searchParams.get('since');
+    if (since !== null) {
+      const coreOnly = request.nextUrl.searchParams.get('sections') === 'core';
+      return sinceResponse(version, since, coreOnly);
+    }
+
+    // The current version can change at any time; let clients revalidate by ETag
+    const etag = `"${version}"`;
+    if (request.headers.get('if-none-match') === etag) {
+      return new NextResponse(null, { status: 304, headers: { 'ETag': etag } });
+    }
+    return NextResponse.json(loadVersion(version), {
       headers: {
-        'Cache-Control': 'no-store, max-age=0',
+        'Cache-Control': 'no-cache',
+        'ETag': etag,
+        'X-Perf-Version': version,
       },
     });
   } catch (error) {
@@ -22,4 +214,4 @@ export async function GET() {
       { status: 500 }
     );
   }
-}
\ No newline at end of file
+}
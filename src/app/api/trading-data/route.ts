@@ -1,69 +1,138 @@
-import { NextResponse } from 'next/server';
+import { readFileSync } from 'fs';
+import { NextRequest, NextResponse } from 'next/server';
+import path from 'path';
+import { gunzipSync } from 'zlib';
 
 // Use dynamic to ensure this API route is always fresh, not statically generated
 export const dynamic = 'force-dynamic';
 
-export async function GET() {
-  console.log('API Route Handler Triggered');
-  
+// Started with `python scripts/trade_server.py public/data` (see scripts/ntperf/server.py)
+const TRADE_SERVICE_URL = process.env.TRADE_SERVICE_URL || 'http://127.0.0.1:8765';
+// Query parameters understood by the service
+const FORWARDED_PARAMS = ['start', 'end', 'instrument', 'side', 'offset', 'limit', 'group_by'];
+// Written by `python scripts/build_artifacts.py` (see scripts/ntperf/artifacts.py)
+const ARTIFACT_DIR = path.join(process.cwd(), 'src/data/trades');
+// Converted document deployed with the site, served when the service is unreachable
+const BUNDLED_FILE = path.join(process.cwd(), 'src/data/perf.json');
+// Keep in sync with DEFAULT_PAGE_SIZE in scripts/ntperf/store.py
+const DEFAULT_PAGE_SIZE = 100;
+
+type ManifestEntry = {
+  source: string;
+  file: string;
+  version: string;
+  trades: number;
+  bytes: number;
+};
+
+function readManifest(): ManifestEntry[] {
   try {
-    // When deployed on Vercel, use the full URL from the server environment
-    // For local development, fall back to a relative path
-    const baseUrl = process.env.VERCEL_URL 
-      ? `https://${process.env.VERCEL_URL}` 
-      : 'http://localhost:3000';
-    
-    console.log('Base URL for fetching:', baseUrl);
-    
-    // Try to fetch the sample CSV file first
-    const sampleUrl = `${baseUrl}/data/NinjaTrader-sample.csv`;
-    console.log('Attempting to fetch CSV from:', sampleUrl);
-    let response = await fetch(sampleUrl, { cache: 'no-store' });
-    
-    // If that fails, try the most recent CSV file
-    if (!response.ok) {
-      const fullUrl = `${baseUrl}/data/NinjaTrader Grid 2025-05-13 08-18 PM.csv`;
-      console.log('First fetch failed, trying:', fullUrl);
-      response = await fetch(fullUrl, { cache: 'no-store' });
+    return JSON.parse(readFileSync(path.join(ARTIFACT_DIR, 'manifest.json'), 'utf8')).artifacts;
+  } catch {
+    return [];
+  }
+}
+
+// The pre-parsed, gzipped artifact of one CSV in public/data
+function artifactResponse(request: NextRequest, source: string) {
+  const entry = readManifest().find((item) => item.source === source);
+  if (!entry) {
+    return NextResponse.json({ success: false, error: `No parsed data for ${source}` }, { status: 404 });
+  }
+  const etag = `"${entry.version}"`;
+  if (request.headers.get('if-none-match') === etag) {
+    return new NextResponse(null, { status: 304, headers: { 'ETag': etag } });
+  }
+  const compressed = readFileSync(path.join(ARTIFACT_DIR, entry.file));
+  const gzip = (request.headers.get('accept-encoding') ?? '').includes('gzip');
+  return new NextResponse(gzip ? compressed : gunzipSync(compressed), {
+    headers: {
+      'Content-Type': 'application/json',
+      ...(gzip ? { 'Content-Encoding': 'gzip' } : {}),
+      'Cache-Control': 'no-cache',
+      'ETag': etag,
+      'Vary': 'Accept-Encoding',
+    },
+  });
+}
+
+type BundledTrade = { Profit: number };
+
+// First page of the bundled trades, shaped like the service's unfiltered /trades
+// response (deployments such as Vercel run no query service)
+function bundledResponse() {
+  const trades: BundledTrade[] = JSON.parse(readFileSync(BUNDLED_FILE, 'utf8')).trades;
+  // Sum in cents, as the service does
+  const cents = trades.map((trade) => Math.round(trade.Profit * 100));
+  const wins = cents.filter((c) => c > 0).length;
+  return NextResponse.json({
+    total: trades.length,
+    offset: 0,
+    limit: DEFAULT_PAGE_SIZE,
+    summary: {
+      trades: trades.length,
+      pnl: cents.reduce((sum, c) => sum + c, 0) / 100,
+      wins,
+      losses: cents.filter((c) => c < 0).length,
+      win_rate: trades.length ? wins / trades.length : 0,
+    },
+    trades: trades.slice(0, DEFAULT_PAGE_SIZE),
+  }, {
+    headers: { 'Cache-Control': 'no-store, max-age=0', 'X-Data-Source': 'bundled' },
+  });
+}
+
+// `?files` lists the parsed CSVs, `?file=<name>.csv` serves one as typed columns.
+// Otherwise filtered trade pages (`?start=&end=&instrument=&side=&offset=&limit=`)
+// or, with `?group_by=date|instrument|side`, aggregates are answered by the trade
+// query service. Without parameters, the bundled trades are served if it is unreachable
+export async function GET(request: NextRequest) {
+  const searchParams = request.nextUrl.searchParams;
+  try {
+    if (searchParams.has('files')) {
+      return NextResponse.json({ success: true, files: readManifest() });
     }
-    
-    // If both attempts fail, try a direct fetch as a last resort
-    if (!response.ok) {
-      console.log('Second fetch failed, trying direct fetch to /data/perf.json');
-      response = await fetch(`${baseUrl}/data/perf.json`, { cache: 'no-store' });
+    const file = searchParams.get('file');
+    if (file !== null) {
+      return artifactResponse(request, file);
     }
-    
-    // If all attempts fail
-    if (!response.ok) {
-      console.error('All fetch attempts failed, last status:', response.status);
-      return NextResponse.json({ 
-        success: false, 
-        error: 'No NinjaTrader CSV file found in public/data directory',
-        attempted_urls: [
-          `${baseUrl}/data/NinjaTrader-sample.csv`,
-          `${baseUrl}/data/NinjaTrader Grid 2025-05-13 08-18 PM.csv`,
-          `${baseUrl}/data/perf.json`
-        ]
-      }, { status: 404 });
+  } catch (error) {
+    console.error('Error reading parsed trade data:', error);
+    return NextResponse.json({ success: false, error: 'Failed to read parsed trade data' }, { status: 500 });
+  }
+
+  const params = new URLSearchParams();
+  for (const name of FORWARDED_PARAMS) {
+    const value = searchParams.get(name);
+    if (value !== null) {
+      params.set(name, value);
     }
-    
-    // Get the CSV data as text
-    console.log('Fetch successful, getting text content');
-    const csvData = await response.text();
-    console.log('CSV data retrieved, content length:', csvData.length);
-    
-    // Return the CSV data
-    return NextResponse.json({ 
-      success: true, 
-      csvData,
-      fileName: response.url.split('/').pop() || 'NinjaTrader-sample.csv'
+  }
+  const endpoint = params.has('group_by') ? 'aggregate' : 'trades';
+
+  try {
+    const response = await fetch(`${TRADE_SERVICE_URL}/${endpoint}?${params}`, { cache: 'no-store' });
+    return new NextResponse(await response.text(), {
+      status: response.status,
+      headers: {
+        'Content-Type': 'application/json',
+        'Cache-Control': 'no-store, max-age=0',
+      },
     });
   } catch (error) {
-    console.error('Error reading CSV file:', error);
-    return NextResponse.json({ 
-      success: false, 
-      error: 'Failed to read CSV file',
+    console.error('Error querying trade service:', error);
+    if (params.toString() === '') {
+      // Unfiltered requests can be answered from the deployed data
+      try {
+        return bundledResponse();
+      } catch (bundledError) {
+        console.error('Error reading bundled trade data:', bundledError);
+      }
+    }
+    return NextResponse.json({
+      success: false,
+      error: 'Trade query service unavailable',
       details: error instanceof Error ? error.message : String(error)
-    }, { status: 500 });
+    }, { status: 503 });
   }
-}
\ No newline at end of file
+}
@@ -30,6 +30,70 @@ type PerformanceData = {
   }>;
 };
 
+type PerfDelta = {
+  trades: PerformanceData['trades'];
+  equity_curve: PerformanceData['equity_curve'];
+  metrics: PerformanceData['metrics'];
+};
+
+// The last version seen is kept in localStorage so a returning visitor only
+// downloads the trades added since (see /api/perf?since=)
+const PERF_CACHE_KEY = 'perf-cache';
+
+async function loadPerformanceData(): Promise<PerformanceData> {
+  let cached: { version: string; data: PerformanceData } | null = null;
+  try {
+    cached = JSON.parse(localStorage.getItem(PERF_CACHE_KEY) || 'null');
+  } catch {
+    cached = null;
+  }
+
+  let data: PerformanceData;
+  let version: string | null;
+  if (cached) {
+    const res = await fetch(`/api/perf?since=${cached.version}&sections=core`);
+    if (!res.ok) {
+      throw new Error('Failed to fetch performance data');
+    }
+    const body = await res.json();
+    version = res.headers.get('X-Perf-Version');
+    if (body.kind === 'delta') {
+      data = body.deltas.reduce((doc: PerformanceData, delta: PerfDelta) => ({
+        equity_curve: {
+          dates: doc.equity_curve.dates.concat(delta.equity_curve.dates),
+          values: doc.equity_curve.values.concat(delta.equity_curve.values),
+        },
+        metrics: delta.metrics,
+        trades: doc.trades.concat(delta.trades),
+      }), cached.data);
+    } else if (body.kind === 'snapshot') {
+      data = body.data;
+    } else {
+      // Nothing is published; the response is the full document
+      data = body;
+    }
+  } else {
+    const res = await fetch('/api/perf');
+    if (!res.ok) {
+      throw new Error('Failed to fetch performance data');
+    }
+    data = await res.json();
+    version = res.headers.get('X-Perf-Version');
+  }
+
+  try {
+    if (version) {
+      const { equity_curve, metrics, trades } = data;
+      localStorage.setItem(PERF_CACHE_KEY, JSON.stringify({ version, data: { equity_curve, metrics, trades } }));
+    } else {
+      localStorage.removeItem(PERF_CACHE_KEY);
+    }
+  } catch {
+    // Storage full or disabled: the next visit fetches the full document
+  }
+  return data;
+}
+
 export default function PerformancePage() {
   const [data, setData] = useState<PerformanceData | null>(null);
   const [loading, setLoading] = useState(true);
@@ -38,13 +102,7 @@ export default function PerformancePage() {
 
   useEffect(() => {
     // Use our API route instead of static file
-    fetch('/api/perf')
-      .then((res) => {
-        if (!res.ok) {
-          throw new Error('Failed to fetch performance data');
-        }
-        return res.json();
-      })
+    loadPerformanceData()
       .then((json) => {
         console.log('Loaded performance data:');
         console.log('Last 5 dates:', json.equity_curve.dates.slice(-5));
@@ -39,15 +39,15 @@ export default function TestPage() {
           className="bg-blue-500 hover:bg-blue-700 text-white font-bold py-2 px-4 rounded mr-2"
           onClick={async () => {
             try {
-              const response = await fetch('/data/NinjaTrader-sample.csv');
-              const text = await response.text();
-              alert(`CSV File Response: Status ${response.status}\nContent (first 100 chars): ${text.substring(0, 100)}...`);
+              const response = await fetch('/api/trading-data?file=NinjaTrader-sample.csv');
+              const data = await response.json();
+              alert(`Parsed CSV Response: Status ${response.status}\nTrades: ${data.trades}\nColumns: ${Object.keys(data.columns ?? {}).join(', ')}`);
             } catch (error) {
-              alert(`CSV Test Error: ${error instanceof Error ? error.message : String(error)}`);
+              alert(`Parsed CSV Test Error: ${error instanceof Error ? error.message : String(error)}`);
             }
           }}
         >
-          Test CSV File
+          Test Parsed CSV
         </button>
         
         <button 